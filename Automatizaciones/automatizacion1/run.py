@@ -4,6 +4,7 @@ Automatización 1: Procesador de CSV
 Procesa archivos CSV y genera reportes
 """
 
+import io
 import os
 import sys
 import csv
@@ -95,13 +96,23 @@ def main(input_csv, output_folder, config_file=None):
 
 if __name__ == "__main__":
     # Esta parte se ejecuta cuando el script se llama directamente
-    if len(sys.argv) < 3:
-        print("Uso: python run.py <input_csv> <output_folder> [config_file]")
-        sys.exit(1)
-    
-    input_csv = sys.argv[1]
-    output_folder = sys.argv[2]
-    config_file = sys.argv[3] if len(sys.argv) > 3 else None
+    if len(sys.argv) > 1:
+        # Inputs posicionales ("arguments": "argv", por defecto)
+        input_csv = sys.argv[1]
+        output_folder = sys.argv[2] if len(sys.argv) > 2 else ""
+        config_file = sys.argv[3] if len(sys.argv) > 3 else None
+    else:
+        # Inputs con nombre en un JSON por stdin ("arguments": "json" en ui_config.json)
+        document = "" if sys.stdin is None or sys.stdin.isatty() else sys.stdin.read()
+        if not document.strip():
+            print("Uso: python run.py <input_csv> <output_folder> [config_file]")
+            print("  o, con los inputs con nombre en JSON: python run.py < inputs.json")
+            sys.exit(1)
+        from automation_inputs import read_inputs
+        inputs = read_inputs(io.StringIO(document))
+        input_csv = inputs.get("input_csv", "")
+        output_folder = inputs.get("output_folder", "")
+        config_file = inputs.get("config_file")
     
     success = main(input_csv, output_folder, config_file)
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(0 if success else 1)
@@ -6,11 +6,38 @@ Realiza copias de seguridad con compresión
 
 import os
 import sys
+import json
+import time
 import shutil
 import zipfile
 import datetime
 from pathlib import Path
 
+# Segundos mínimos entre dos avisos de progreso: uno por archivo costaría una
+# escritura aquí y una señal más un JSON que interpretar en la aplicación
+PROGRESS_INTERVAL = 0.2
+
+_last_progress = {"time": 0.0, "stage": None}
+
+def report_progress(progress, total=None, stage=None, message=None, force=False):
+    """
+    Informa del progreso a la aplicación (una línea "@@progress" con JSON en stdout)
+    
+    La aplicación no muestra estas líneas en la consola: alimentan la barra de
+    progreso, con velocidad y tiempo restante. Se envía como mucho un aviso
+    cada PROGRESS_INTERVAL, salvo al cambiar de etapa, al llegar al total o
+    con force.
+    """
+    now = time.monotonic()
+    finished = total is not None and progress >= total
+    if not (force or finished or stage != _last_progress["stage"]
+            or now - _last_progress["time"] >= PROGRESS_INTERVAL):
+        return
+    _last_progress["time"] = now
+    _last_progress["stage"] = stage
+    data = {"progress": progress, "total": total, "stage": stage, "message": message}
+    print("@@progress " + json.dumps({k: v for k, v in data.items() if v is not None}, ensure_ascii=False), flush=True)
+
 def main(source_folder, backup_folder, exclude_file=None):
     """
     Función principal de la automatización
@@ -45,6 +72,7 @@ def main(source_folder, backup_folder, exclude_file=None):
         backup_zip = os.path.join(backup_folder, f"{backup_name}.zip")
         
         # Contar archivos a procesar
+        report_progress(0, stage="Contando archivos")
         total_files = 0
         for root, dirs, files in os.walk(source_folder):
             total_files += len(files)
@@ -67,10 +95,13 @@ def main(source_folder, backup_folder, exclude_file=None):
                     try:
                         zipf.write(file_path, arc_name)
                         processed += 1
-                        if processed % 100 == 0:
-                            print(f"📦 Procesados: {processed}/{total_files} archivos")
+                        report_progress(processed, total_files, "Comprimiendo", arc_name)
                     except Exception as e:
                         print(f"⚠️  Error procesando {file_path}: {str(e)}")
+            
+            # Con exclusiones o errores no se llega al total: el último aviso se fuerza
+            if processed < total_files:
+                report_progress(processed, total_files, "Comprimiendo", force=True)
         
         # Generar información del backup
         backup_info = {
@@ -84,7 +115,6 @@ def main(source_folder, backup_folder, exclude_file=None):
         
         # Guardar información del backup
         info_file = os.path.join(backup_folder, f"{backup_name}_info.json")
-        import json
         with open(info_file, 'w', encoding='utf-8') as f:
             json.dump(backup_info, f, indent=2, ensure_ascii=False)
         
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark de lanzamiento
+Compara subprocess.run (ruta clásica de execute_automation) con el zygote por fork
+
+Uso:
+    python benchmarks/bench_launch.py [repeticiones]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import statistics
+import subprocess
+
+MODULES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "modules")
+sys.path.insert(0, MODULES_DIR)
+
+import automation_zygote  # noqa: E402
+
+# Trabajo pequeño típico: importa lo mismo que las automatizaciones de ejemplo
+SCRIPT = """
+import os, sys, csv, json
+from pathlib import Path
+print("ok", len(sys.argv))
+"""
+
+
+def bench_subprocess(run_file, cwd, repetitions):
+    """Tiempo total por ejecución con un intérprete nuevo"""
+    totals = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, run_file, "arg"], capture_output=True, text=True, cwd=cwd)
+        totals.append(time.perf_counter() - start)
+    return totals, totals
+
+
+def bench_zygote(run_file, cwd, repetitions):
+    """Tiempo hasta el fork (lanzamiento) y hasta leer toda la salida (total)"""
+    process, sock = automation_zygote.spawn_zygote()
+    launches, totals = [], []
+    try:
+        for i in range(repetitions):
+            stdout_r, stdout_w = os.pipe()
+            stderr_r, stderr_w = os.pipe()
+
+            start = time.perf_counter()
+            automation_zygote.request_fork(sock, str(i), run_file, ["arg"], cwd, stdout_w, stderr_w)
+            os.close(stdout_w)
+            os.close(stderr_w)
+
+            message = automation_zygote.read_message(sock)
+            assert message["event"] == "started"
+            launches.append(time.perf_counter() - start)
+
+            while os.read(stdout_r, 65536):
+                pass
+            while os.read(stderr_r, 65536):
+                pass
+            message = automation_zygote.read_message(sock)
+            assert message["event"] == "exit" and message["code"] == 0
+            totals.append(time.perf_counter() - start)
+
+            os.close(stdout_r)
+            os.close(stderr_r)
+    finally:
+        sock.close()
+        process.wait()
+    return launches, totals
+
+
+def report(name, launches, totals):
+    ms = lambda values: statistics.median(values) * 1000
+    p95 = lambda values: sorted(values)[int(len(values) * 0.95) - 1] * 1000
+    print(f"{name:<12} lanzamiento p50 {ms(launches):7.2f} ms   total p50 {ms(totals):7.2f} ms   total p95 {p95(totals):7.2f} ms")
+
+
+def main():
+    if not automation_zygote.is_supported():
+        print("⚠️  Esta plataforma no soporta el zygote (requiere fork y AF_UNIX)")
+        return
+
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    with tempfile.TemporaryDirectory() as folder:
+        run_file = os.path.join(folder, "run.py")
+        with open(run_file, "w", encoding="utf-8") as f:
+            f.write(SCRIPT)
+
+        print(f"📊 {repetitions} ejecuciones de un run.py mínimo ({sys.executable})")
+        report("subprocess", *bench_subprocess(run_file, folder, repetitions))
+        report("zygote", *bench_zygote(run_file, folder, repetitions))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark de arranque
+Compara "python run.py" a secas y la ruta de lanzamiento anterior (launcher como
+script y run.py compilado en cada ejecución) con la de build_command (stub sobre
+bytecode precompilado), con distintas opciones del intérprete
+
+Cada ejecución lanza el run.py de una automatización de ejemplo sin argumentos y
+con stdin vacío: arranca, importa sus módulos y termina mostrando su uso (los
+tres ejemplos lo hacen; si un run.py hace otra cosa sin inputs, el tiempo medido
+incluye ese trabajo). Los porcentajes son la diferencia de la mediana respecto a
+"python run.py" (negativos = más rápido).
+
+Uso:
+    python benchmarks/bench_startup.py [repeticiones]
+"""
+
+import os
+import sys
+import json
+import glob
+import time
+import tempfile
+import statistics
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES_DIR = os.path.join(ROOT_DIR, "modules")
+sys.path.insert(0, MODULES_DIR)
+
+from automation_launcher import LAUNCHER_SCRIPT, SCRIPT_HELPERS_DIR, build_command, interpreter_flags  # noqa: E402
+
+# (nombre, opciones de interpreter_flags) de las variantes del stub
+VARIANTS = [
+    ("stub", {"frozen_modules": "on"}),
+    ("stub -I", {"frozen_modules": "on", "isolated": True}),
+    ("stub -I -S", {"frozen_modules": "on", "isolated": True, "no_site": True}),
+    ("stub -I -S -O", {"frozen_modules": "on", "isolated": True, "no_site": True, "optimize": 1}),
+]
+
+
+def previous_command(run_file):
+    """Línea de comandos anterior: mismas opciones del launcher, lanzado como script"""
+    command = build_command(run_file, [], {})
+    options = json.loads(command[command.index("-c") + 3])
+    options.pop("bytecode")
+    return [sys.executable, LAUNCHER_SCRIPT, json.dumps(options), run_file]
+
+
+def precompile(folders, prefix, optimize):
+    """Lo que hace BytecodeCompiler al cargar las automatizaciones"""
+    subprocess.run(
+        [sys.executable, "-X", f"pycache_prefix={prefix}", "-m", "compileall", "-q", "-o", str(optimize)] + folders,
+        check=True
+    )
+
+
+def bench(commands, environment, repetitions):
+    """Tiempo total por ejecución, tras una de calentamiento por comando"""
+    totals = []
+    for command, cwd in commands:
+        subprocess.run(command, capture_output=True, stdin=subprocess.DEVNULL, cwd=cwd, env=environment)
+    for _ in range(repetitions):
+        for command, cwd in commands:
+            start = time.perf_counter()
+            subprocess.run(command, capture_output=True, stdin=subprocess.DEVNULL, cwd=cwd, env=environment)
+            totals.append(time.perf_counter() - start)
+    return totals
+
+
+def report(name, totals, baseline=None):
+    ms = lambda values: statistics.median(values) * 1000
+    p95 = lambda values: sorted(values)[int(len(values) * 0.95) - 1] * 1000
+    gain = f"   {(ms(totals) / ms(baseline) - 1) * 100:+6.1f} %" if baseline else ""
+    print(f"{name:<14} total p50 {ms(totals):7.2f} ms   total p95 {p95(totals):7.2f} ms{gain}")
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    run_files = sorted(glob.glob(os.path.join(ROOT_DIR, "Automatizaciones", "*", "run.py")))
+    folders = [os.path.dirname(run_file) for run_file in run_files]
+
+    print(f"📊 {repetitions} ejecuciones de {len(run_files)} automatizaciones de ejemplo ({sys.executable})")
+    environment = dict(os.environ, PYTHONUNBUFFERED="1")
+    environment.pop("PYTHONPYCACHEPREFIX", None)
+    baseline = bench([([sys.executable, run_file], os.path.dirname(run_file)) for run_file in run_files],
+                     environment, repetitions)
+    report("python run.py", baseline)
+    previous = bench([(previous_command(run_file), os.path.dirname(run_file)) for run_file in run_files],
+                     environment, repetitions)
+    report("anterior", previous, baseline)
+
+    with tempfile.TemporaryDirectory() as prefix:
+        for name, options in VARIANTS:
+            precompile(folders + [LAUNCHER_SCRIPT, SCRIPT_HELPERS_DIR], prefix, options.get("optimize", 0))
+            flags = interpreter_flags(pycache_prefix=prefix, unbuffered=True, **options)
+            commands = [(build_command(run_file, [], {}, flags=flags), os.path.dirname(run_file))
+                        for run_file in run_files]
+            # Como AutomationManager.job_environment: los hijos siempre pueden escribir en su caché
+            stub_environment = dict(environment, PYTHONPYCACHEPREFIX=prefix, PYTHONDONTWRITEBYTECODE="")
+            report(name, bench(commands, stub_environment, repetitions), baseline)
+
+
+if __name__ == "__main__":
+    main()
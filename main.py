@@ -34,6 +34,13 @@ class MainWindow(QMainWindow):
         # ///////////////////////////////////////////////////////////////
         self.automation_manager = AutomationManager()
         self.current_inputs = {}  # Store current automation inputs
+        self.displayed_job_id = None  # Job whose output is shown in the console
+        self.displayed_batch_id = None  # Batch whose progress is shown
+        self.eta_timer = QTimer(self)  # Refreshes the estimated time left
+        self.eta_timer.setInterval(1000)
+        self.eta_timer.timeout.connect(self.update_eta)
+        self.jobs_drained = False  # Set once running jobs have been drained or killed on close
+        self.automation_manager.scheduler.drained.connect(self.on_jobs_drained)
         
         # SETUP AUTOMATION WIDGETS
         # ///////////////////////////////////////////////////////////////
@@ -118,6 +125,18 @@ class MainWindow(QMainWindow):
             # Crear el widget de detalles de automatización
             self.automation_details_widget = AutomationDetailsWidget()
             self.automation_details_widget.executeRequested.connect(self.on_automation_execute_requested)
+            self.automation_details_widget.stopRequested.connect(self.on_automation_stop_requested)
+            self.automation_details_widget.batchRequested.connect(self.on_automation_batch_requested)
+            
+            # Salida asíncrona de las automatizaciones en ejecución
+            scheduler = self.automation_manager.scheduler
+            scheduler.jobStarted.connect(self.on_job_started)
+            scheduler.jobSuspended.connect(self.on_job_suspended)
+            scheduler.jobResumed.connect(self.on_job_resumed)
+            scheduler.stdoutReceived.connect(self.on_job_output)
+            scheduler.stderrReceived.connect(self.on_job_output)
+            scheduler.jobProgress.connect(self.on_job_progress)
+            scheduler.jobFinished.connect(self.on_job_finished)
             
             # Reemplazar el contenido de la página de widgets
             # Limpiar el layout existente de la página de widgets
@@ -194,6 +213,23 @@ class MainWindow(QMainWindow):
         # Actualizar el widget de automatización
         self.automation_details_widget.set_automation(automation)
         
+        # Seguir el trabajo más reciente de la automatización, si hay alguno activo
+        active_jobs = self.automation_manager.get_active_jobs(automation_id)
+        batch = self.automation_manager.get_active_batch(automation_id)
+        self.displayed_batch_id = batch['id'] if batch else None
+        self.displayed_job_id = active_jobs[-1]['id'] if active_jobs and not batch else None
+        self.automation_details_widget.set_active_jobs(len(active_jobs))
+        if batch:
+            self.automation_details_widget.set_output(f"⏳ Lote de {batch['total']} archivos en ejecución...\n")
+            self.update_batch_progress(batch)
+        elif active_jobs:
+            self.automation_details_widget.set_output("⏳ Automatización en ejecución...\n")
+            self.automation_details_widget.write_output(
+                self.automation_manager.get_output_tail(self.displayed_job_id)
+            )
+            self.on_job_progress(self.displayed_job_id)
+        self.update_eta()
+        
         # Cambiar a la página de widgets
         widgets.stackedWidget.setCurrentWidget(widgets.widgets)
 
@@ -211,16 +247,198 @@ class MainWindow(QMainWindow):
         print(f"🚀 Ejecutando automatización: {current['name']}")
         print(f"📊 Inputs: {inputs}")
         
-        # Ejecutar la automatización
-        success, output = self.automation_manager.execute_automation(current['id'], inputs)
+        # Encolar la automatización sin bloquear la interfaz
+        success, result = self.automation_manager.start_automation(current['id'], inputs)
+        
+        if not success:
+            self.automation_details_widget.set_output(f"❌ Error ejecutando automatización\n\n{result}")
+            return
+        
+        self.displayed_job_id = result
+        self.displayed_batch_id = None
+        job = self.automation_manager.get_job(result)
+        if job['requests'] > 1:
+            self.automation_details_widget.write_output("🔗 Ya había una ejecución idéntica en curso: se comparte su resultado\n")
+            self.automation_details_widget.write_output(self.automation_manager.get_output_tail(result))
+        elif job.get('held'):
+            # Si los inputs no cambiaron, el resultado en caché llega como salida del trabajo
+            if CACHE_HOLD in job['holds']:
+                self.automation_details_widget.write_output("🔍 Comprobando si los inputs cambiaron desde la última ejecución...\n")
+            if ENVIRONMENT_HOLD in job['holds']:
+                self.automation_details_widget.write_output("📦 Preparando el entorno de la automatización (solo la primera vez)...\n")
+        elif job['status'] == 'queued':
+            position = self.automation_manager.scheduler.queue_position(result)
+            self.automation_details_widget.write_output(f"⏳ En cola ({position} trabajos por delante)...\n")
+        if job.get('predicted_seconds') is not None:
+            self.automation_details_widget.write_output(
+                f"⏱️  Duración estimada: ~{format_duration(job['predicted_seconds'])}\n"
+            )
+        self.update_active_jobs(current['id'])
+        self.update_eta()
+
+    def on_automation_batch_requested(self, inputs, input_id, paths):
+        """
+        Lanza un lote: una ejecución por archivo, repartidas entre los workers
+        """
+        current = self.automation_manager.get_current_automation()
+        if not current:
+            print("⚠️  No hay automatización seleccionada")
+            return
+        
+        success, result = self.automation_manager.start_batch(current['id'], inputs, input_id, paths)
+        if not success:
+            self.automation_details_widget.set_output(f"❌ Error ejecutando lote\n\n{result}")
+            return
+        
+        self.displayed_job_id = None
+        self.displayed_batch_id = result
+        batch = self.automation_manager.get_batch(result)
+        for error in batch['errors']:
+            self.automation_details_widget.write_output(f"❌ {error}\n")
+        self.update_batch_progress(batch)
+        self.update_active_jobs(current['id'])
+        self.update_eta()
+
+    def update_batch_progress(self, batch):
+        """
+        Actualiza la barra de progreso agregada del lote visible
+        """
+        done = batch['succeeded'] + batch['failed'] + batch['cancelled']
+        text = f"{done}/{batch['total']} · ✅ {batch['succeeded']} · ❌ {batch['failed']}"
+        eta = self.automation_manager.batch_eta(batch) if batch['finished_at'] is None else None
+        if eta:
+            text += f" · ⏱️ ~{format_duration(eta)}"
+        self.automation_details_widget.set_progress(done, batch['total'], text)
+
+    def update_eta(self):
+        """
+        Refresca el tiempo restante estimado del trabajo o lote visible
+        """
+        if self.displayed_batch_id:
+            batch = self.automation_manager.get_batch(self.displayed_batch_id)
+            if batch and batch['finished_at'] is None:
+                self.update_batch_progress(batch)
+                self.eta_timer.start()
+                return
+        elif self.displayed_job_id:
+            job = self.automation_manager.get_job(self.displayed_job_id)
+            # El progreso que informa el propio trabajo tiene preferencia sobre la estimación
+            if job and job['status'] == 'running' and not job.get('progress') and job.get('predicted_seconds') is not None:
+                self.automation_details_widget.set_eta(
+                    self.automation_manager.job_duration(job), job['predicted_seconds']
+                )
+            if job and job['status'] in ('queued', 'running', 'suspended'):
+                self.eta_timer.start()
+                return
+        self.eta_timer.stop()
+
+    def on_automation_stop_requested(self):
+        """
+        Detiene el trabajo (o el lote) mostrado en la consola
+        """
+        if self.displayed_batch_id:
+            count = self.automation_manager.cancel_batch(self.displayed_batch_id)
+            self.automation_details_widget.write_output(f"⏹️  Deteniendo {count} trabajos del lote...\n")
+            return
+        
+        if not self.displayed_job_id:
+            return
+        
+        if self.automation_manager.cancel(self.displayed_job_id):
+            self.automation_details_widget.write_output("⏹️  Deteniendo...\n")
+
+    def update_active_jobs(self, automation_id):
+        """
+        Actualiza el contador de trabajos en curso si la automatización está visible
+        """
+        current = self.automation_manager.get_current_automation()
+        if current and current['id'] == automation_id:
+            count = len(self.automation_manager.get_active_jobs(automation_id))
+            self.automation_details_widget.set_active_jobs(count)
+
+    def on_job_started(self, job_id):
+        """
+        Notifica que un trabajo en cola obtuvo un worker
+        """
+        if job_id == self.displayed_job_id:
+            self.automation_details_widget.write_output("▶️  Iniciado\n")
+
+    def on_job_suspended(self, job_id):
+        """
+        Notifica que el trabajo visible cedió su worker a otro más prioritario
+        """
+        if job_id == self.displayed_job_id:
+            self.automation_details_widget.write_output("⏸️  En pausa: cediendo el worker a un trabajo más prioritario\n")
+
+    def on_job_resumed(self, job_id):
+        """
+        Notifica que el trabajo visible se reanudó
+        """
+        if job_id == self.displayed_job_id:
+            self.automation_details_widget.write_output("▶️  Reanudado\n")
+
+    def on_job_output(self, job_id, text):
+        """
+        Muestra la salida en streaming del trabajo visible
+        """
+        if job_id == self.displayed_job_id:
+            self.automation_details_widget.write_output(text)
+
+    def on_job_progress(self, job_id):
+        """
+        Actualiza la barra con el progreso que informa el trabajo visible
+        """
+        if job_id != self.displayed_job_id:
+            return
+        job = self.automation_manager.get_job(job_id)
+        if job and job.get('progress') and job['status'] in ('running', 'suspended'):
+            self.automation_details_widget.set_job_progress(job['progress'])
+
+    def on_job_finished(self, job_id, exit_code):
+        """
+        Muestra el resultado final de un trabajo
+        """
+        job = self.automation_manager.get_job(job_id)
+        if job:
+            self.update_active_jobs(job['automation_id'])
+        
+        if job and self.displayed_batch_id and self.displayed_batch_id in job.get('batch_ids', []):
+            self.on_batch_job_finished(job, exit_code)
+            return
+        
+        if job_id != self.displayed_job_id:
+            return
         
-        # Actualizar la salida en el widget
-        if success:
-            result_text = f"✅ Automatización ejecutada exitosamente\n\n{output}"
+        self.eta_timer.stop()
+        self.automation_details_widget.hide_progress()
+        self.automation_details_widget.finish_output()
+        if job and job.get('log_file'):
+            self.automation_details_widget.write_output(f"📄 Registro completo: {job['log_file']}\n")
+        
+        if job and job['status'] == 'cancelled':
+            self.automation_details_widget.append_output("⏹️  Automatización cancelada")
+        elif job and job.get('timed_out'):
+            self.automation_details_widget.append_output(f"⏱️  Automatización detenida: superó {job['timeout_seconds']} s")
+        elif job and job.get('aborted') == 'hang':
+            self.automation_details_widget.append_output(f"🧊 Automatización detenida: {job['hang_seconds']} s sin actividad")
+        elif exit_code == 0:
+            self.automation_details_widget.append_output("✅ Automatización ejecutada exitosamente")
         else:
-            result_text = f"❌ Error ejecutando automatización\n\n{output}"
+            self.automation_details_widget.append_output(f"❌ Error ejecutando automatización (código {exit_code})")
+
+    def on_batch_job_finished(self, job, exit_code):
+        """
+        Actualiza el progreso del lote visible y muestra su resumen al terminar
+        """
+        batch = self.automation_manager.get_batch(self.displayed_batch_id)
+        self.update_batch_progress(batch)
         
-        self.automation_details_widget.set_output(result_text)
+        if job['status'] == 'failed':
+            path = job['inputs'].get(batch['input_id'], '')
+            self.automation_details_widget.write_output(f"❌ {os.path.basename(path)} (código {exit_code})\n")
+        
+        if batch['finished_at'] is not None:
+            self.automation_details_widget.append_output(self.automation_manager.batch_summary(batch))
 
     def open_file_dialog(self, input_config):
         """
@@ -279,6 +497,37 @@ class MainWindow(QMainWindow):
         print(f'Button "{btnName}" pressed!')
 
 
+    # CLOSE EVENT
+    # ///////////////////////////////////////////////////////////////
+    def closeEvent(self, event):
+        # Los trabajos activos se terminan según Settings.SHUTDOWN_POLICY antes de cerrar
+        if self.jobs_drained:
+            event.accept()
+            return
+        if self.automation_manager.scheduler.shutting_down:
+            # Segundo intento de cierre: detener ya lo que quede
+            self.automation_manager.scheduler.shutdown("kill")
+            event.ignore()
+            return
+        if not self.automation_manager.shutdown():
+            event.accept()
+            return
+        
+        event.ignore()
+        if Settings.SHUTDOWN_POLICY == "drain":
+            message = "⏳ Cerrando: esperando a que terminen los trabajos en ejecución (cierra otra vez para detenerlos)\n"
+        else:
+            message = "⏹️  Cerrando: deteniendo los trabajos en ejecución...\n"
+        self.automation_details_widget.write_output(message)
+        print(message, end="")
+
+    def on_jobs_drained(self):
+        """
+        Cierra la ventana cuando ya no queda ningún trabajo vivo
+        """
+        self.jobs_drained = True
+        self.close()
+
     # RESIZE EVENTS
     # ///////////////////////////////////////////////////////////////
     def resizeEvent(self, event):
@@ -20,7 +20,7 @@ from . ui_functions import *
 from . app_functions import *
 
 # AUTOMATION MANAGER
-from . automation_manager import AutomationManager
+from . automation_manager import AutomationManager, CACHE_HOLD, ENVIRONMENT_HOLD
 
 # AUTOMATION WIDGETS
-from . automation_widgets import AutomationDetailsWidget, AutomationInputWidget
+from . automation_widgets import AutomationDetailsWidget, AutomationInputWidget, format_duration
@@ -16,3 +16,75 @@ class Settings():
     border-left: 22px solid qlineargradient(spread:pad, x1:0.034, y1:0, x2:0.216, y2:0, stop:0.499 rgba(255, 121, 198, 255), stop:0.5 rgba(85, 170, 255, 0));
     background-color: rgb(40, 44, 52);
     """
+
+    # AUTOMATION RUNNER
+    # ///////////////////////////////////////////////////////////////
+    MAX_WORKERS = 0  # 0 = número de CPUs
+    JOB_HISTORY_SIZE = 200
+    DEFAULT_EXECUTOR = "subprocess"  # subprocess | pool | zygote | inprocess | subinterpreter | pty
+    CANCEL_GRACE_SECONDS = 5  # espera entre SIGTERM y SIGKILL al detener un trabajo
+    SHUTDOWN_POLICY = "drain"  # al cerrar: drain (esperar a los trabajos en ejecución) | kill (detenerlos)
+    SHUTDOWN_DRAIN_SECONDS = 60  # espera máxima de drain antes de detener lo que quede (0 = sin límite)
+    DEFAULT_TIMEOUT_SECONDS = 0  # 0 = sin límite; cada automatización puede fijar timeout_seconds
+    DEFAULT_HANG_SECONDS = 120  # sin CPU, E/S ni salida durante este tiempo = colgado (0 = no vigilar)
+    HANG_ACTION = "warn"  # warn | kill (vuelca la pila y detiene el trabajo)
+    WATCHDOG_INTERVAL_SECONDS = 5
+    STACK_DUMP_WAIT_SECONDS = 2
+    PREEMPT_LOW_PRIORITY = True  # pausar trabajos batch/scheduled para dar paso a los interactivos
+    SHORTEST_JOB_FIRST = False  # dentro de cada prioridad, lanzar antes los trabajos más cortos previstos
+    COALESCE_DUPLICATE_JOBS = True  # unir peticiones idénticas a un trabajo en cola o en ejecución
+    DATA_FOLDER = ".aurore"  # registros y datos de ejecución de las automatizaciones
+    INPUT_SCAN_THREADS = 2  # hilos que recorren los inputs (huellas de la caché, tamaños) sin bloquear la interfaz
+
+    # CONTROL DE ADMISIÓN (MEMORIA Y CARGA)
+    ADMISSION_CONTROL = True  # esperar en la cola en vez de agotar la memoria
+    MEMORY_HEADROOM_MB = 512  # memoria que se deja siempre libre
+    MAX_LOAD_PER_CPU = 2.0  # carga media por CPU a partir de la cual no se arrancan trabajos (0 = sin límite)
+    ADMISSION_RETRY_SECONDS = 2
+
+    # REINTENTOS (automatizaciones con "retry" en ui_config.json)
+    RETRY_MAX_ATTEMPTS = 3  # intentos en total, contando el primero
+    RETRY_BACKOFF_SECONDS = 2  # espera tras el primer fallo; se duplica en cada intento
+    RETRY_MAX_BACKOFF_SECONDS = 300
+    RETRY_JITTER = 0.5  # fracción de la espera que se resta al azar (0 = sin jitter, 1 = jitter completo)
+
+    # SALIDA DE LOS TRABAJOS
+    OUTPUT_TAIL_BYTES = 64 * 1024  # cola en memoria por trabajo activo
+    OUTPUT_LOGS_PER_AUTOMATION = 50  # registros en disco que se conservan (0 = todos)
+    UNBUFFERED_OUTPUT = True  # PYTHONUNBUFFERED=1: con stdout por pipe, la salida llega línea a línea y no en bloques
+    PROGRESS_INTERVAL_MS = 200  # refresco máximo de la barra de progreso de un trabajo (líneas "@@progress")
+
+    # CACHÉ DE RESULTADOS (automatizaciones con "cache" en ui_config.json)
+    RESULT_CACHE_MAX_ENTRIES = 500
+    RESULT_CACHE_MAX_MB = 200
+    RESULT_CACHE_CONTENT_HASHES = 10000  # hashes de archivos de input memorizados (con "content_hash")
+
+    # PROGRAMACIONES (CRON)
+    SCHEDULES_ENABLED = True  # ejecutar las programaciones de DATA_FOLDER/schedules.json
+    SCHEDULE_MISFIRE_POLICY = "catch_up"  # ejecución perdida (app cerrada, equipo suspendido): catch_up (una vez) | skip
+    SCHEDULE_MISFIRE_GRACE_SECONDS = 300  # retraso a partir del cual una ejecución se considera perdida
+    SCHEDULE_JITTER_SECONDS = 30  # retraso aleatorio máximo, para que las programaciones no arranquen todas a la vez
+
+    # ENTORNOS POR AUTOMATIZACIÓN ("python" / "requirements" en ui_config.json)
+    WHEELHOUSE_FOLDER = "wheelhouse"  # wheels para crear los entornos sin conexión (además de <automatización>/wheelhouse)
+
+    # ARRANQUE DE LOS PROCESOS (EJECUTORES SUBPROCESS Y PTY)
+    PRECOMPILE_BYTECODE = True  # compilar run.py y sus módulos al cargar las automatizaciones, en DATA_FOLDER/pycache
+    CHILD_FROZEN_MODULES = "on"  # -X frozen_modules: on | off | "" (valor por defecto del intérprete)
+    CHILD_ISOLATED = False  # -I: sin variables PYTHON*, site del usuario ni directorio actual en sys.path
+    CHILD_NO_SITE = False  # -S: sin site-packages (no se aplica a automatizaciones con requirements)
+    CHILD_OPTIMIZE = 0  # 1 = -O (sin assert), 2 = -OO (además sin docstrings)
+
+    # PRE-WARMED WORKER POOL
+    WORKER_POOL_SIZE = 2
+    WORKER_MAX_JOBS = 50
+    WORKER_MAX_MEMORY_MB = 512
+
+    # FORK SERVER (ZYGOTE, LINUX)
+    ZYGOTE_PRELOAD = []  # módulos extra a importar antes de hacer fork
+
+    # IN-PROCESS EXECUTOR (AUTOMATIZACIONES DE CONFIANZA)
+    INPROCESS_THREADS = 4
+
+    # SUBINTERPRETER EXECUTOR (PYTHON 3.12+)
+    SUBINTERPRETER_SPARES = 2
@@ -0,0 +1,189 @@
+"""
+Automation ANSI
+Interpreta las secuencias de escape ANSI de la salida de los scripts para colorearla en la consola
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+# Estilo de un tramo de texto: (color de texto, color de fondo, negrita, cursiva, subrayado)
+# Los colores son tuplas (r, g, b) o None para el color por defecto de la consola
+Style = Tuple[Optional[Tuple[int, int, int]], Optional[Tuple[int, int, int]], bool, bool, bool]
+
+DEFAULT_STYLE: Style = (None, None, False, False, False)
+
+# Los 16 colores básicos, ajustados para leerse sobre el fondo oscuro de la consola
+PALETTE = (
+    (40, 42, 46), (224, 82, 82), (98, 190, 98), (214, 180, 70),
+    (80, 140, 230), (190, 100, 210), (70, 185, 195), (200, 204, 210),
+    (110, 116, 126), (255, 110, 110), (130, 225, 130), (245, 215, 100),
+    (120, 175, 255), (225, 140, 240), (110, 220, 230), (255, 255, 255),
+)
+
+# CSI (colores, cursor, borrado), OSC (título, enlaces) y escapes cortos (ESC 7, ESC ( B...).
+# Solo SGR (CSI ... m) cambia el estilo; el resto se descarta
+ESCAPE = re.compile(
+    r"\x1b(?:\[(?P<params>[0-?]*)[ -/]*(?P<final>[@-~])"
+    r"|\][^\x07\x1b]*(?:\x07|\x1b\\)"
+    r"|[ -/]*[0-Z\\^-~])"
+)
+
+# Principio de una secuencia que aún puede completarse en el siguiente fragmento
+PARTIAL_ESCAPE = re.compile(r"\x1b(?:\[[0-?]*[ -/]*|\][^\x07\x1b]*\x1b?|[ -/]+)?")
+
+# Longitud máxima de una secuencia incompleta retenida entre fragmentos
+MAX_PENDING = 256
+
+# Tramo que indica un retorno de carro: el texto siguiente reemplaza la línea actual
+CARRIAGE_RETURN = "\r"
+
+
+def color_256(index: int) -> Optional[Tuple[int, int, int]]:
+    """
+    Color de la paleta de 256 colores de xterm
+
+    Args:
+        index: Índice 0-255
+
+    Returns:
+        (r, g, b) o None si el índice no es válido
+    """
+    if 0 <= index < 16:
+        return PALETTE[index]
+    if 16 <= index < 232:
+        index -= 16
+        levels = [0 if level == 0 else 55 + level * 40 for level in (index // 36, index // 6 % 6, index % 6)]
+        return tuple(levels)
+    if 232 <= index < 256:
+        gray = 8 + (index - 232) * 10
+        return (gray, gray, gray)
+    return None
+
+
+class AnsiParser:
+    """
+    Convierte incrementalmente texto con secuencias ANSI en tramos con estilo
+
+    El estilo se conserva entre fragmentos, y una secuencia cortada al final de
+    un fragmento se retiene hasta el siguiente (o hasta flush()). Los escapes
+    que no forman una secuencia válida se descartan sin retener el texto que
+    los sigue. Cada "\r" suelto se devuelve como un tramo CARRIAGE_RETURN
+    aparte; "\r\n" cuenta como un salto de línea normal.
+    """
+
+    def __init__(self):
+        self.style = DEFAULT_STYLE
+        self.pending = ""
+
+    def feed(self, text: str) -> List[Tuple[str, Style]]:
+        """
+        Procesa un fragmento de salida
+
+        Args:
+            text: Fragmento tal como lo escribió el script
+
+        Returns:
+            Lista de (texto sin secuencias de escape, estilo)
+        """
+        text = self.pending + text
+        self.pending = ""
+
+        # Camino rápido: la salida sin escapes es un único tramo con el estilo actual
+        if "\x1b" not in text and "\r" not in text:
+            return [(text, self.style)] if text else []
+
+        segments = []
+        position = 0
+        for match in ESCAPE.finditer(text):
+            self._add_text(segments, text[position:match.start()])
+            if match.group("final") == "m":
+                self._apply_sgr(match.group("params"))
+            position = match.end()
+
+        rest = text[position:]
+        escape = rest.rfind("\x1b")
+        if escape != -1 and len(rest) - escape <= MAX_PENDING and PARTIAL_ESCAPE.fullmatch(rest, escape):
+            self.pending = rest[escape:]
+            rest = rest[:escape]
+        elif rest.endswith("\r"):
+            # Puede ser la mitad de un "\r\n"
+            self.pending = "\r"
+            rest = rest[:-1]
+        self._add_text(segments, rest)
+        return segments
+
+    def flush(self) -> List[Tuple[str, Style]]:
+        """
+        Entrega lo que quedó retenido al terminar la salida (secuencia incompleta o "\r" final)
+
+        Returns:
+            Lista de (texto, estilo); una secuencia incompleta se entrega como texto, sin el escape
+        """
+        pending, self.pending = self.pending, ""
+        segments = []
+        self._add_text(segments, pending)
+        return segments
+
+    def _add_text(self, segments: List[Tuple[str, Style]], text: str):
+        """Añade un tramo de texto sin escapes, separando los retornos de carro"""
+        # Un escape que no forma ninguna secuencia válida no se pinta
+        text = text.replace("\r\n", "\n").replace("\x1b", "")
+        if "\r" not in text:
+            if text:
+                segments.append((text, self.style))
+            return
+        for index, part in enumerate(text.split("\r")):
+            if index:
+                segments.append((CARRIAGE_RETURN, self.style))
+            if part:
+                segments.append((part, self.style))
+
+    def _apply_sgr(self, params: str):
+        foreground, background, bold, italic, underline = self.style
+        codes = [int(code) if code.isdigit() else 0 for code in params.replace(":", ";").split(";")]
+        index = 0
+        while index < len(codes):
+            code = codes[index]
+            index += 1
+            if code == 0:
+                foreground, background, bold, italic, underline = DEFAULT_STYLE
+            elif code == 1:
+                bold = True
+            elif code == 22:
+                bold = False
+            elif code == 3:
+                italic = True
+            elif code == 23:
+                italic = False
+            elif code == 4:
+                underline = True
+            elif code == 24:
+                underline = False
+            elif 30 <= code <= 37:
+                foreground = PALETTE[code - 30]
+            elif 90 <= code <= 97:
+                foreground = PALETTE[code - 90 + 8]
+            elif code == 39:
+                foreground = None
+            elif 40 <= code <= 47:
+                background = PALETTE[code - 40]
+            elif 100 <= code <= 107:
+                background = PALETTE[code - 100 + 8]
+            elif code == 49:
+                background = None
+            elif code in (38, 48) and index < len(codes):
+                # 38;5;n (256 colores) o 38;2;r;g;b (color real); 48 igual para el fondo
+                color = None
+                if codes[index] == 5 and index + 1 < len(codes):
+                    color = color_256(codes[index + 1])
+                    index += 2
+                elif codes[index] == 2 and index + 3 < len(codes):
+                    color = tuple(min(255, value) for value in codes[index + 1:index + 4])
+                    index += 4
+                else:
+                    index = len(codes)
+                if code == 38:
+                    foreground = color
+                else:
+                    background = color
+        self.style = (foreground, background, bold, italic, underline)
@@ -0,0 +1,80 @@
+"""
+Automation Bytecode
+Precompila las automatizaciones en la caché de bytecode de sus procesos (PYTHONPYCACHEPREFIX)
+
+Así ni run.py (que el launcher ejecuta desde su .pyc, ver load_code) ni sus
+módulos se compilan en la primera ejecución, y las carpetas de las
+automatizaciones no se llenan de __pycache__.
+"""
+
+import sys
+from typing import List, Optional
+
+import shiboken6
+from PySide6.QtCore import QCoreApplication, QObject, QProcess
+
+# Profundidad de subcarpetas que se compilan dentro de cada automatización
+MAX_DEPTH = 3
+
+
+class BytecodeCompiler(QObject):
+    """Lanza compileall en segundo plano con el mismo prefijo y nivel de optimización que usarán los hijos"""
+
+    def __init__(self, cache_dir: str, optimize: int = 0, parent=None):
+        """
+        Inicializa el compilador
+
+        Args:
+            cache_dir: Carpeta de la caché (sys.pycache_prefix de los hijos)
+            optimize: Nivel de optimización de los hijos (-O = 1, -OO = 2)
+        """
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.optimize = optimize
+        self.processes = set()
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def compile(self, folders: List[str], python: Optional[str] = None):
+        """
+        Compila los .py de las carpetas sin esperar al resultado
+
+        Los .pyc llevan la etiqueta del intérprete, así que se compila con el
+        mismo que ejecutará las automatizaciones. Los errores de sintaxis se
+        avisan por consola.
+
+        Args:
+            folders: Carpetas de las automatizaciones (o archivos sueltos)
+            python: Intérprete de esas automatizaciones (por defecto, el de la aplicación)
+        """
+        if not folders:
+            return
+        process = QProcess(self)
+        process.setProcessChannelMode(QProcess.MergedChannels)
+        process.finished.connect(lambda exit_code, exit_status: self._on_finished(process, exit_code))
+        self.processes.add(process)
+        process.start(python or sys.executable, [
+            "-X", f"pycache_prefix={self.cache_dir}", "-m", "compileall",
+            "-q", "-r", str(MAX_DEPTH), "-o", str(self.optimize)
+        ] + list(folders))
+
+    def shutdown(self, timeout_ms: int = 1000):
+        """Detiene las compilaciones en curso sin avisar de su resultado (al cerrar la aplicación)"""
+        for process in list(self.processes):
+            process.finished.disconnect()
+            process.kill()
+        for process in list(self.processes):
+            process.waitForFinished(timeout_ms)
+        self.processes.clear()
+
+    def _on_finished(self, process: QProcess, exit_code: int):
+        self.processes.discard(process)
+        # Al destruirse el compilador con la compilación en marcha, Qt avisa con el QProcess ya borrado
+        if not shiboken6.isValid(process):
+            return
+        if exit_code != 0:
+            output = process.readAll().data().decode("utf-8", errors="replace").strip()
+            print(f"⚠️  Errores al precompilar automatizaciones:\n{output}")
+        process.deleteLater()
@@ -0,0 +1,260 @@
+"""
+Automation Cache
+Caché de resultados por huella de los inputs: evita repetir ejecuciones idénticas
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class InputFingerprinter:
+    """
+    Calcula la huella de una ejecución
+
+    La huella combina el contenido de run.py y ui_config.json con una firma de
+    cada input: por defecto (tamaño, mtime, inodo) de cada archivo, o su hash
+    de contenido si se pide. Los hashes de contenido se memorizan por firma de
+    stat para no volver a leer archivos que no cambiaron (como mucho
+    max_content_hashes, expulsando los menos usados).
+    """
+
+    def __init__(self, max_content_hashes: int = 10000):
+        """
+        Inicializa el calculador
+
+        Args:
+            max_content_hashes: Hashes de contenido memorizados como máximo
+        """
+        self.max_content_hashes = max_content_hashes
+        self.content_hashes = OrderedDict()
+        self.lock = threading.Lock()  # se usa desde los hilos del InputInspector
+
+    def fingerprint(self, automation: Dict, inputs: Dict[str, str], content_hash: bool = False,
+                    totals: Optional[List[int]] = None) -> str:
+        """
+        Huella de una ejecución de la automatización con esos inputs
+
+        Los inputs con "role": "output" solo aportan su ruta: su contenido es
+        el resultado de la ejecución, no parte de la entrada.
+
+        Args:
+            automation: Información de la automatización (run_file, config_file, inputs)
+            inputs: Diccionario {input_id: path}
+            content_hash: Firmar los archivos por contenido en vez de por stat
+            totals: Si se pasa [bytes, archivos], se le suma el tamaño de los inputs
+                    firmados (el mismo recorrido sirve para medirlos)
+        """
+        digest = hashlib.sha256()
+        digest.update(automation["id"].encode("utf-8"))
+        for path in (automation["run_file"], automation["config_file"]):
+            digest.update(self._content_hash(path).encode("ascii"))
+
+        for input_config in automation["inputs"]:
+            input_id = input_config["id"]
+            value = inputs.get(input_id, "").strip()
+            path = os.path.abspath(value) if value else ""
+            digest.update(f"\0{input_id}={path}\0".encode("utf-8"))
+            if path and input_config.get("role") != "output":
+                digest.update(self.path_signature(path, content_hash, totals).encode("ascii"))
+
+        return digest.hexdigest()
+
+    def path_signature(self, path: str, content_hash: bool = False, totals: Optional[List[int]] = None) -> str:
+        """
+        Firma de un archivo o de una carpeta completa (recursiva)
+
+        Args:
+            path: Archivo o carpeta
+            content_hash: Firmar por contenido en vez de por (tamaño, mtime, inodo)
+            totals: Acumulador [bytes, archivos] opcional
+        """
+        digest = hashlib.sha256()
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    full_path = os.path.join(root, name)
+                    relative = os.path.relpath(full_path, path)
+                    digest.update(f"{relative}:{self._file_signature(full_path, content_hash, totals)}\n".encode("utf-8"))
+        elif os.path.exists(path):
+            digest.update(self._file_signature(path, content_hash, totals).encode("utf-8"))
+        else:
+            digest.update(b"missing")
+        return digest.hexdigest()
+
+    def _file_signature(self, path: str, content_hash: bool, totals: Optional[List[int]] = None) -> str:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return "missing"
+        if totals is not None:
+            totals[0] += st.st_size
+            totals[1] += 1
+        stat_signature = f"{st.st_size}-{st.st_mtime_ns}-{st.st_ino}"
+        if not content_hash:
+            return stat_signature
+        return self._content_hash(path, stat_signature)
+
+    def _content_hash(self, path: str, stat_signature: Optional[str] = None) -> str:
+        if stat_signature is None:
+            st = os.stat(path)
+            stat_signature = f"{st.st_size}-{st.st_mtime_ns}-{st.st_ino}"
+        key = (path, stat_signature)
+        with self.lock:
+            cached = self.content_hashes.get(key)
+            if cached is not None:
+                self.content_hashes.move_to_end(key)
+                return cached
+
+        try:
+            cached = _hash_file(path)
+        except OSError:
+            cached = "unreadable"
+        with self.lock:
+            self.content_hashes[key] = cached
+            while len(self.content_hashes) > self.max_content_hashes:
+                self.content_hashes.popitem(last=False)
+        return cached
+
+
+class AutomationResultCache:
+    """
+    Resultados de ejecuciones exitosas indexados por huella, con expulsión LRU
+
+    El índice se guarda en index.json y la salida de cada resultado en
+    <huella>.log dentro de la carpeta de la caché.
+    """
+
+    def __init__(self, folder: str, max_entries: int = 500, max_bytes: int = 200 * 1024 * 1024):
+        """
+        Inicializa la caché y carga su índice
+
+        Args:
+            folder: Carpeta de la caché
+            max_entries: Resultados que se conservan como máximo
+            max_bytes: Tamaño máximo de las salidas guardadas
+        """
+        self.folder = os.path.abspath(folder)
+        self.index_file = os.path.join(self.folder, "index.json")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self._load()
+
+    def lookup(self, fingerprint: str, output_signatures: Dict[str, str]) -> Optional[Dict]:
+        """
+        Busca un resultado cuyas salidas sigan intactas
+
+        Args:
+            fingerprint: Huella de la ejecución
+            output_signatures: Firma actual de cada input de salida {input_id: firma}
+
+        Returns:
+            Entrada de la caché (exit_code, log_file, ...) o None
+        """
+        entry = self.entries.get(fingerprint)
+        if entry is None:
+            return None
+
+        if entry["outputs"] != output_signatures or not os.path.exists(entry["log_file"]):
+            # Las salidas se borraron o modificaron: el resultado ya no vale
+            self._discard(fingerprint)
+            self._save()
+            return None
+
+        entry["last_used"] = time.time()
+        self.entries.move_to_end(fingerprint)
+        self._save()
+        return entry
+
+    def store(self, fingerprint: str, automation_id: str, exit_code: int, log_file: Optional[str],
+              output_signatures: Dict[str, str]):
+        """
+        Guarda el resultado de una ejecución
+
+        Args:
+            fingerprint: Huella de la ejecución
+            automation_id: ID de la automatización
+            exit_code: Código de salida
+            log_file: Registro con la salida de la ejecución
+            output_signatures: Firma de cada input de salida tras la ejecución
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        cached_log = os.path.join(self.folder, f"{fingerprint}.log")
+        try:
+            if log_file and os.path.exists(log_file):
+                shutil.copyfile(log_file, cached_log)
+            else:
+                open(cached_log, "w").close()
+        except OSError as e:
+            print(f"⚠️  No se pudo guardar el resultado en caché: {e}")
+            return
+
+        self.entries.pop(fingerprint, None)
+        self.entries[fingerprint] = {
+            "automation_id": automation_id,
+            "exit_code": exit_code,
+            "log_file": cached_log,
+            "size": os.path.getsize(cached_log),
+            "outputs": output_signatures,
+            "created": time.time(),
+            "last_used": time.time()
+        }
+        self._evict()
+        self._save()
+
+    def invalidate(self, automation_id: Optional[str] = None):
+        """Borra los resultados de una automatización (o todos)"""
+        for fingerprint, entry in list(self.entries.items()):
+            if automation_id is None or entry["automation_id"] == automation_id:
+                self._discard(fingerprint)
+        self._save()
+
+    def _evict(self):
+        """Expulsa los resultados menos usados hasta cumplir los límites"""
+        total = sum(entry["size"] for entry in self.entries.values())
+        while self.entries and (len(self.entries) > self.max_entries or total > self.max_bytes):
+            fingerprint = next(iter(self.entries))
+            total -= self.entries[fingerprint]["size"]
+            self._discard(fingerprint)
+
+    def _discard(self, fingerprint: str):
+        entry = self.entries.pop(fingerprint, None)
+        if entry is not None:
+            try:
+                os.remove(entry["log_file"])
+            except OSError:
+                pass
+
+    def _load(self):
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        for fingerprint, entry in sorted(entries.items(), key=lambda item: item[1].get("last_used", 0)):
+            self.entries[fingerprint] = entry
+
+    def _save(self):
+        os.makedirs(self.folder, exist_ok=True)
+        temp_file = self.index_file + ".tmp"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f)
+            os.replace(temp_file, self.index_file)
+        except OSError as e:
+            print(f"⚠️  No se pudo guardar el índice de la caché: {e}")
@@ -0,0 +1,382 @@
+"""
+Automation Cron
+Programaciones recurrentes de automatizaciones con expresiones cron, guardadas en disco
+
+Las próximas ejecuciones se guardan en un montículo (heapq) y un único
+temporizador se arma para la más cercana: no se recorre la lista de
+programaciones periódicamente.
+"""
+
+import os
+import json
+import time
+import heapq
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+# Qué hacer con una ejecución perdida (equipo apagado o suspendido a su hora)
+MISFIRE_POLICIES = ("catch_up", "skip")
+
+# Espera máxima del temporizador: el reloj monotónico no avanza durante la
+# suspensión y el de pared puede saltar (cambio de hora, NTP), así que se
+# revisa la cima del montículo al menos con esta frecuencia
+MAX_TIMER_MS = 60 * 1000
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+MONTH_NAMES = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+DAY_NAMES = ["sun", "mon", "tue", "wed", "thu", "fri", "sat"]
+
+# (mínimo, máximo, nombres) de cada campo: minuto, hora, día del mes, mes, día de la semana
+FIELDS = [
+    (0, 59, None),
+    (0, 23, None),
+    (1, 31, None),
+    (1, 12, MONTH_NAMES),
+    (0, 7, DAY_NAMES),
+]
+
+# Años que se buscan hacia delante antes de dar una expresión por imposible (30 de febrero)
+SEARCH_YEARS = 8
+
+
+def _parse_value(text: str, low: int, names: Optional[List[str]]) -> int:
+    if names and text.lower() in names:
+        return names.index(text.lower()) + (1 if low == 1 else 0)
+    return int(text)
+
+
+def _parse_field(text: str, low: int, high: int, names: Optional[List[str]]) -> set:
+    """Valores de un campo: *, a, a-b, con /paso, separados por comas"""
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"paso inválido en '{text}'")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            start, end = _parse_value(start_text, low, names), _parse_value(end_text, low, names)
+        else:
+            start = _parse_value(part, low, names)
+            end = high if step > 1 else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"valor fuera de rango en '{text}' ({low}-{high})")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronExpression:
+    """
+    Expresión cron de cinco campos: minuto hora día-del-mes mes día-de-la-semana
+
+    Admite *, listas, rangos, pasos, nombres (jan, mon...) y las macros
+    @hourly, @daily, @weekly, @monthly y @yearly. Como en cron, si se
+    restringen el día del mes y el de la semana basta con que coincida uno.
+    """
+
+    def __init__(self, expression: str):
+        """
+        Interpreta la expresión
+
+        Raises:
+            ValueError: Si la expresión no es válida
+        """
+        self.expression = expression.strip()
+        fields = MACROS.get(self.expression.lower(), self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"se esperaban 5 campos en '{expression}'")
+        try:
+            parsed = [_parse_field(text, *FIELDS[index]) for index, text in enumerate(fields)]
+        except ValueError as e:
+            raise ValueError(f"expresión cron inválida '{expression}': {e}")
+        self.minutes, self.hours, self.days, self.months, weekdays = [sorted(values) for values in parsed]
+        # 0 y 7 son domingo; datetime.weekday() empieza en lunes
+        self.weekdays = {(day - 1) % 7 for day in weekdays}
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+        # Fechas imposibles (30 de febrero) se detectan ya al crearla
+        self.next_after(datetime.now())
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_match = moment.day in self.days
+        weekday_match = moment.weekday() in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_match and weekday_match
+        return day_match or weekday_match
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        Primer instante que cumple la expresión estrictamente después de moment
+
+        Salta meses, días y horas completos que no coinciden en vez de
+        avanzar minuto a minuto.
+
+        Raises:
+            ValueError: Si la expresión no se cumple en los próximos SEARCH_YEARS años
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        last_year = candidate.year + SEARCH_YEARS
+        while candidate.year <= last_year:
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.month, 12)
+                candidate = candidate.replace(year=candidate.year + year, month=month + 1, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                continue
+            minute = next((value for value in self.minutes if value >= candidate.minute), None)
+            if minute is None:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                continue
+            return candidate.replace(minute=minute)
+        raise ValueError(f"la expresión '{self.expression}' no se cumple nunca")
+
+
+class AutomationCronScheduler(QObject):
+    """
+    Programaciones de automatizaciones: expresión cron, inputs fijos y política de ejecuciones perdidas
+
+    Cada programación es un diccionario que se guarda en un archivo JSON:
+        id, automation_id, cron, inputs, enabled, misfire ("catch_up" o "skip"),
+        jitter_seconds y last_fire (hora nominal de la última ejecución)
+    Si la aplicación estaba cerrada o el equipo suspendido cuando tocaba una
+    ejecución, "catch_up" la lanza una sola vez al volver (aunque se
+    perdieran varias) y "skip" la descarta y espera a la siguiente.
+    """
+
+    scheduleDue = Signal(str, bool)  # schedule_id, es una ejecución perdida que se recupera
+
+    def __init__(self, schedules_file: str, misfire: str = "catch_up", jitter_seconds: float = 0,
+                 misfire_grace_seconds: float = 300, parent=None):
+        """
+        Carga las programaciones y arma el temporizador
+
+        Args:
+            schedules_file: Archivo JSON de las programaciones
+            misfire: Política por defecto de las ejecuciones perdidas
+            jitter_seconds: Retraso aleatorio máximo por defecto de cada ejecución
+            misfire_grace_seconds: Retraso a partir del cual una ejecución se considera perdida
+        """
+        super().__init__(parent)
+        self.schedules_file = os.path.abspath(schedules_file)
+        self.default_misfire = misfire if misfire in MISFIRE_POLICIES else "catch_up"
+        self.default_jitter = jitter_seconds
+        self.misfire_grace = misfire_grace_seconds
+        self.schedules = {}
+        self.expressions = {}
+        self.next_fires = {}
+        self.heap = []
+        self.generations = {}
+        # Entradas del archivo que no se pudieron interpretar: se conservan al guardar
+        self.invalid = []
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._on_timer)
+
+        self._load()
+        for schedule_id in self.schedules:
+            self._plan(schedule_id, startup=True)
+        self._arm()
+
+    def add_schedule(self, automation_id: str, cron: str, inputs: Optional[Dict[str, str]] = None,
+                     misfire: Optional[str] = None, jitter_seconds: Optional[float] = None) -> str:
+        """
+        Crea una programación
+
+        Args:
+            automation_id: Automatización que se lanza
+            cron: Expresión cron (ver CronExpression)
+            inputs: Inputs fijos de cada ejecución {input_id: path}
+            misfire: "catch_up" o "skip" (por defecto, el del programador)
+            jitter_seconds: Retraso aleatorio máximo de cada ejecución (por defecto, el del programador)
+
+        Returns:
+            ID de la programación
+
+        Raises:
+            ValueError: Si la expresión o la política no son válidas
+        """
+        expression = CronExpression(cron)
+        if misfire is not None and misfire not in MISFIRE_POLICIES:
+            raise ValueError(f"política desconocida '{misfire}' (catch_up o skip)")
+        schedule = {
+            "id": uuid.uuid4().hex[:12],
+            "automation_id": automation_id,
+            "cron": expression.expression,
+            "inputs": dict(inputs or {}),
+            "enabled": True,
+            "misfire": misfire,
+            "jitter_seconds": jitter_seconds,
+            "last_fire": None
+        }
+        self.schedules[schedule["id"]] = schedule
+        self.expressions[schedule["id"]] = expression
+        self._plan(schedule["id"])
+        self._arm()
+        self._save()
+        return schedule["id"]
+
+    def remove_schedule(self, schedule_id: str) -> bool:
+        """Elimina una programación; retorna False si no existía"""
+        if self.schedules.pop(schedule_id, None) is None:
+            return False
+        self.expressions.pop(schedule_id, None)
+        self._unplan(schedule_id)
+        self._arm()
+        self._save()
+        return True
+
+    def set_enabled(self, schedule_id: str, enabled: bool) -> bool:
+        """
+        Activa o pausa una programación
+
+        Al reactivarla se planifica desde ahora: lo que tocó mientras estaba
+        pausada no cuenta como ejecución perdida.
+        """
+        schedule = self.schedules.get(schedule_id)
+        if schedule is None:
+            return False
+        schedule["enabled"] = bool(enabled)
+        if enabled:
+            schedule["last_fire"] = time.time()
+            self._plan(schedule_id)
+        else:
+            self._unplan(schedule_id)
+        self._arm()
+        self._save()
+        return True
+
+    def get_schedule(self, schedule_id: str) -> Optional[Dict]:
+        """Obtiene una programación"""
+        return self.schedules.get(schedule_id)
+
+    def get_schedules(self, automation_id: Optional[str] = None) -> List[Dict]:
+        """Lista las programaciones, opcionalmente de una automatización, por próxima ejecución"""
+        schedules = [schedule for schedule in self.schedules.values()
+                     if automation_id is None or schedule["automation_id"] == automation_id]
+        return sorted(schedules, key=lambda schedule: self.next_fires.get(schedule["id"], float("inf")))
+
+    def next_fire(self, schedule_id: str) -> Optional[float]:
+        """Hora (timestamp) de la próxima ejecución, con su jitter, o None si está pausada"""
+        return self.next_fires.get(schedule_id)
+
+    def _plan(self, schedule_id: str, startup: bool = False):
+        """
+        Calcula la próxima ejecución y la mete en el montículo
+
+        Al arrancar, la siguiente ejecución tras last_fire puede haber quedado
+        en el pasado: se mete igualmente y _on_timer aplica la política.
+        """
+        schedule = self.schedules[schedule_id]
+        self._unplan(schedule_id)
+        if not schedule["enabled"]:
+            return
+
+        now = time.time()
+        reference = schedule["last_fire"] if startup and schedule["last_fire"] else now
+        nominal = self.expressions[schedule_id].next_after(datetime.fromtimestamp(reference)).timestamp()
+        if nominal < now:
+            # Ejecución perdida: sin jitter, se resuelve en cuanto se arme el temporizador
+            fire_at = nominal
+        else:
+            jitter = schedule["jitter_seconds"] if schedule["jitter_seconds"] is not None else self.default_jitter
+            fire_at = nominal + random.uniform(0, jitter or 0)
+
+        generation = self.generations.get(schedule_id, 0) + 1
+        self.generations[schedule_id] = generation
+        self.next_fires[schedule_id] = fire_at
+        heapq.heappush(self.heap, (fire_at, generation, schedule_id, nominal))
+
+    def _unplan(self, schedule_id: str):
+        """Invalida la entrada del montículo (se descarta al llegar a la cima)"""
+        self.generations[schedule_id] = self.generations.get(schedule_id, 0) + 1
+        self.next_fires.pop(schedule_id, None)
+
+    def _arm(self):
+        # Las entradas invalidadas se descartan al llegar a la cima
+        while self.heap and self.generations.get(self.heap[0][2]) != self.heap[0][1]:
+            heapq.heappop(self.heap)
+        if not self.heap:
+            self.timer.stop()
+            return
+        delay_ms = int((self.heap[0][0] - time.time()) * 1000)
+        self.timer.start(max(0, min(delay_ms, MAX_TIMER_MS)))
+
+    def _on_timer(self):
+        now = time.time()
+        fired = False
+        while self.heap and self.heap[0][0] <= now:
+            fire_at, generation, schedule_id, nominal = heapq.heappop(self.heap)
+            if self.generations.get(schedule_id) != generation:
+                continue
+            schedule = self.schedules[schedule_id]
+            misfire = schedule["misfire"] or self.default_misfire
+            late = now - fire_at > self.misfire_grace
+            if late:
+                when = datetime.fromtimestamp(nominal).strftime("%Y-%m-%d %H:%M")
+                if misfire == "skip":
+                    print(f"⏭️  Programación {schedule_id} ({schedule['automation_id']}): ejecución de {when} perdida, se omite")
+                else:
+                    print(f"⏰ Programación {schedule_id} ({schedule['automation_id']}): recuperando la ejecución de {when}")
+
+            # Varias ejecuciones perdidas cuentan como una: se planifica desde ahora
+            schedule["last_fire"] = now if late else nominal
+            self._plan(schedule_id)
+            fired = True
+            if not (late and misfire == "skip"):
+                self.scheduleDue.emit(schedule_id, late)
+        if fired:
+            self._save()
+        self._arm()
+
+    def _load(self):
+        try:
+            with open(self.schedules_file, "r", encoding="utf-8") as f:
+                schedules = json.load(f)
+        except (OSError, ValueError):
+            schedules = []
+        for schedule in schedules:
+            try:
+                expression = CronExpression(schedule["cron"])
+            except (KeyError, ValueError) as e:
+                print(f"⚠️  Programación {schedule.get('id')} ignorada: {e}")
+                self.invalid.append(schedule)
+                continue
+            schedule.setdefault("inputs", {})
+            schedule.setdefault("enabled", True)
+            schedule.setdefault("misfire", None)
+            schedule.setdefault("jitter_seconds", None)
+            schedule.setdefault("last_fire", None)
+            self.schedules[schedule["id"]] = schedule
+            self.expressions[schedule["id"]] = expression
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.schedules_file) or ".", exist_ok=True)
+        temp_file = self.schedules_file + ".tmp"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(list(self.schedules.values()) + self.invalid, f, indent=2, ensure_ascii=False)
+            os.replace(temp_file, self.schedules_file)
+        except OSError as e:
+            print(f"⚠️  No se pudieron guardar las programaciones: {e}")
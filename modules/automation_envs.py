@@ -0,0 +1,280 @@
+"""
+Automation Environments
+Intérprete propio por automatización: un ejecutable indicado en ui_config.json
+o un entorno virtual creado desde su requirements.txt
+
+Los entornos se instalan sin conexión desde wheelhouses locales y se guardan
+por hash de (intérprete base, requirements): se crean una sola vez y los
+comparten todas las automatizaciones con los mismos requisitos.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import subprocess
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QCoreApplication, QIODevice, QObject, QProcess, QProcessEnvironment, Signal
+
+# Un entorno sin este archivo es una creación interrumpida: se vuelve a crear
+MARKER_FILE = "environment.json"
+
+
+def resolve_interpreter(value: str, folder: str) -> Optional[str]:
+    """
+    Localiza el intérprete indicado en ui_config.json
+
+    Args:
+        value: Ruta (absoluta o relativa a la carpeta de la automatización) o nombre en el PATH
+        folder: Carpeta de la automatización
+
+    Returns:
+        Ruta absoluta del ejecutable o None si no existe
+    """
+    if os.sep in value or (os.altsep and os.altsep in value):
+        path = value if os.path.isabs(value) else os.path.join(folder, value)
+    else:
+        path = shutil.which(value)
+    if path and os.path.isfile(path) and os.access(path, os.X_OK):
+        return os.path.abspath(path)
+    return None
+
+
+def venv_python(directory: str) -> str:
+    """Ruta del intérprete de un entorno virtual"""
+    if sys.platform == "win32":
+        return os.path.join(directory, "Scripts", "python.exe")
+    return os.path.join(directory, "bin", "python")
+
+
+def environment_key(base_python: str, requirements_file: str) -> str:
+    """
+    Hash que identifica un entorno: intérprete base y requisitos normalizados
+
+    Los comentarios, las líneas vacías y los espacios no cambian el entorno.
+    """
+    real_base = os.path.realpath(base_python)
+    stat = os.stat(real_base)
+    with open(requirements_file, "r", encoding="utf-8") as f:
+        requirements = [line.split("#", 1)[0].strip() for line in f]
+    digest = hashlib.sha256()
+    digest.update(f"{real_base}:{stat.st_size}:{stat.st_mtime_ns}\n".encode("utf-8"))
+    digest.update("\n".join(line for line in requirements if line).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class AutomationEnvironments(QObject):
+    """
+    Resuelve el intérprete de cada automatización y crea sus entornos virtuales
+
+    La creación corre en procesos aparte (venv y pip) sin bloquear la
+    interfaz; el intérprete resuelto se memoriza y se reutiliza en cada
+    ejecución.
+    """
+
+    environmentReady = Signal(str, str)  # clave, intérprete
+    environmentFailed = Signal(str, str)  # clave, error
+
+    def __init__(self, root: str, wheelhouse: Optional[str] = None, parent=None):
+        """
+        Inicializa la caché de entornos
+
+        Args:
+            root: Carpeta donde se crean los entornos (uno por clave)
+            wheelhouse: Carpeta de wheels común a todas las automatizaciones
+        """
+        super().__init__(parent)
+        self.root = os.path.abspath(root)
+        self.wheelhouse = os.path.abspath(wheelhouse) if wheelhouse else None
+        self.interpreters = {}
+        self.builds = {}
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def spec(self, automation: Dict, config: Dict) -> Optional[Dict]:
+        """
+        Entorno que pide una automatización con "python" y/o "requirements"
+
+        Args:
+            automation: Información de la automatización (folder)
+            config: Contenido de ui_config.json
+
+        Returns:
+            {"python", "requirements", "find_links", "key"} o None si usa el intérprete de la aplicación
+
+        Raises:
+            ValueError: Si el intérprete o el archivo de requisitos no existen
+        """
+        if not config.get("python") and not config.get("requirements"):
+            return None
+
+        base = sys.executable
+        if config.get("python"):
+            base = resolve_interpreter(config["python"], automation["folder"])
+            if base is None:
+                raise ValueError(f"intérprete no encontrado: {config['python']}")
+
+        spec = {"python": base, "requirements": None, "find_links": [], "key": None}
+        if config.get("requirements"):
+            requirements = os.path.join(automation["folder"], config["requirements"])
+            if not os.path.isfile(requirements):
+                raise ValueError(f"requirements no encontrado: {config['requirements']}")
+            spec["requirements"] = os.path.abspath(requirements)
+            spec["key"] = environment_key(base, requirements)
+            for folder in (os.path.join(automation["folder"], "wheelhouse"), self.wheelhouse):
+                if folder and os.path.isdir(folder):
+                    spec["find_links"].append(os.path.abspath(folder))
+        return spec
+
+    def interpreter(self, spec: Dict) -> Optional[str]:
+        """
+        Intérprete listo para el entorno, sin crear nada
+
+        Returns:
+            Ruta del intérprete o None si el entorno aún no existe
+        """
+        if spec["key"] is None:
+            return spec["python"]
+        python = self.interpreters.get(spec["key"])
+        if python is None:
+            directory = os.path.join(self.root, spec["key"])
+            if os.path.exists(os.path.join(directory, MARKER_FILE)) and os.path.exists(venv_python(directory)):
+                python = self.interpreters[spec["key"]] = venv_python(directory)
+        return python
+
+    def prepare(self, spec: Dict) -> Optional[str]:
+        """
+        Intérprete del entorno, lanzando su creación si aún no existe
+
+        Returns:
+            Ruta del intérprete, o None si el entorno se está creando (se
+            notificará con environmentReady o environmentFailed)
+        """
+        python = self.interpreter(spec)
+        if python is None and spec["key"] not in self.builds:
+            self._start_build(spec)
+        return python
+
+    def is_building(self, key: str) -> bool:
+        """Indica si el entorno con esa clave se está creando"""
+        return key in self.builds
+
+    def prepare_blocking(self, spec: Dict) -> tuple:
+        """
+        Como prepare, pero espera a que el entorno esté creado
+
+        Returns:
+            Tupla (success: bool, intérprete o mensaje de error: str)
+        """
+        python = self.interpreter(spec)
+        if python is not None:
+            return True, python
+        directory, log_file = self._build_paths(spec)
+        with open(log_file, "wb") as log:
+            for command in self._build_steps(spec, directory):
+                if subprocess.run(command, stdout=log, stderr=subprocess.STDOUT, env=self._build_environment()).returncode:
+                    return False, f"falló {' '.join(command[1:3])} (ver {log_file})"
+        self._finish(spec, directory)
+        return True, self.interpreters[spec["key"]]
+
+    def shutdown(self):
+        """Detiene las creaciones en curso; al no tener marca, se repetirán la próxima vez"""
+        for build in list(self.builds.values()):
+            build["process"].kill()
+            build["process"].waitForFinished(1000)
+        self.builds.clear()
+
+    def _build_paths(self, spec: Dict) -> tuple:
+        os.makedirs(self.root, exist_ok=True)
+        return os.path.join(self.root, spec["key"]), os.path.join(self.root, f"{spec['key']}.log")
+
+    def _build_steps(self, spec: Dict, directory: str) -> List[List[str]]:
+        """venv (vaciando lo que dejara una creación interrumpida) y pip sin índice"""
+        install = [venv_python(directory), "-m", "pip", "install", "--no-index", "--no-input",
+                   "--disable-pip-version-check"]
+        for folder in spec["find_links"]:
+            install += ["--find-links", folder]
+        return [
+            [spec["python"], "-m", "venv", "--clear", directory],
+            install + ["-r", spec["requirements"]]
+        ]
+
+    @staticmethod
+    def _build_environment(environment=None):
+        """Entorno de venv y pip: sin configuración del usuario que pueda pedir red"""
+        values = {"PIP_NO_INDEX": "1", "PIP_CONFIG_FILE": os.devnull, "PYTHONNOUSERSITE": "1"}
+        if environment is None:
+            return dict(os.environ, **values)
+        for name, value in values.items():
+            environment.insert(name, value)
+        return environment
+
+    def _start_build(self, spec: Dict):
+        directory, log_file = self._build_paths(spec)
+        print(f"📦 Creando entorno {spec['key']} desde {spec['requirements']}")
+        if os.path.exists(log_file):
+            os.remove(log_file)
+        self.builds[spec["key"]] = {
+            "spec": spec,
+            "directory": directory,
+            "log_file": log_file,
+            "steps": self._build_steps(spec, directory),
+            "process": None,
+            "started_at": time.time()
+        }
+        self._next_step(spec["key"])
+
+    def _next_step(self, key: str):
+        build = self.builds[key]
+        command = build["steps"].pop(0)
+        process = QProcess(self)
+        process.setProcessChannelMode(QProcess.MergedChannels)
+        process.setStandardOutputFile(build["log_file"], QIODevice.Append)
+        process.setProcessEnvironment(self._build_environment(QProcessEnvironment.systemEnvironment()))
+        process.finished.connect(lambda exit_code, exit_status: self._on_step_finished(key, process, exit_code))
+        process.errorOccurred.connect(lambda error: self._on_step_error(key, process, error))
+        build["process"] = process
+        process.start(command[0], command[1:])
+
+    def _on_step_error(self, key: str, process: QProcess, error):
+        # Si el proceso llegó a arrancar, el fallo se notifica en finished
+        if error == QProcess.FailedToStart and self.builds.get(key, {}).get("process") is process:
+            process.deleteLater()
+            self._fail(key, process.errorString())
+
+    def _on_step_finished(self, key: str, process: QProcess, exit_code: int):
+        process.deleteLater()
+        build = self.builds.get(key)
+        if build is None or build["process"] is not process:
+            return
+        if exit_code != 0:
+            self._fail(key, f"código {exit_code} (ver {build['log_file']})")
+        elif build["steps"]:
+            self._next_step(key)
+        else:
+            del self.builds[key]
+            self._finish(build["spec"], build["directory"])
+            print(f"✅ Entorno {key} listo en {time.time() - build['started_at']:.1f} s")
+            self.environmentReady.emit(key, self.interpreters[key])
+
+    def _fail(self, key: str, error: str):
+        self.builds.pop(key, None)
+        print(f"❌ No se pudo crear el entorno {key}: {error}")
+        self.environmentFailed.emit(key, error)
+
+    def _finish(self, spec: Dict, directory: str):
+        """Marca el entorno como completo y memoriza su intérprete"""
+        marker = {
+            "base_python": spec["python"],
+            "requirements": spec["requirements"],
+            "find_links": spec["find_links"],
+            "created_at": time.time()
+        }
+        with open(os.path.join(directory, MARKER_FILE), "w", encoding="utf-8") as f:
+            json.dump(marker, f, indent=2, ensure_ascii=False)
+        self.interpreters[spec["key"]] = venv_python(directory)
@@ -0,0 +1,174 @@
+"""
+Automation Fork Server
+Ejecutor Qt que lanza trabajos mediante el zygote (automation_zygote.py)
+"""
+
+import os
+import tempfile
+import subprocess
+from typing import Dict, Optional
+
+from PySide6.QtCore import QCoreApplication, QSocketNotifier
+
+from . import automation_zygote
+from .automation_pipes import PipeExecutorBase
+from .automation_runner import resume_process_group, suspend_process_group, terminate_process_group
+
+
+class AutomationForkServerExecutor(PipeExecutorBase):
+    """Ejecutor de baja latencia: cada trabajo es un fork() del zygote precargado"""
+
+    def __init__(self, preload=None, parent=None):
+        """
+        Inicializa el ejecutor (el zygote se arranca con prewarm o en el primer trabajo)
+
+        Args:
+            preload: Módulos adicionales que el zygote importa antes de hacer fork
+        """
+        super().__init__(parent)
+        self.preload = list(preload or [])
+        self.zygote = None
+        self.sock = None
+        self.control_notifier = None
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def prewarm(self):
+        """Arranca el zygote si no está en marcha"""
+        if self.zygote is None or self.zygote.poll() is not None:
+            self.zygote, self.sock = automation_zygote.spawn_zygote(self.preload)
+            self.control_notifier = QSocketNotifier(self.sock.fileno(), QSocketNotifier.Read, self)
+            self.control_notifier.activated.connect(self._read_control)
+
+    def start(self, job: Dict):
+        """
+        Pide al zygote un fork para el trabajo
+
+        Args:
+            job: Diccionario del trabajo (id, run_file, argv, cwd)
+        """
+        self.prewarm()
+        job_id = job["id"]
+
+        stdout_r, stdout_w = os.pipe()
+        stderr_r, stderr_w = os.pipe()
+        stdin_file = None
+        try:
+            if job.get("stdin_data") is not None:
+                # Archivo anónimo: no tiene el límite de tamaño de un mensaje del zygote
+                # y escribirlo no bloquea aunque el hijo tarde en leer
+                stdin_file = tempfile.TemporaryFile()
+                stdin_file.write(job["stdin_data"].encode("utf-8"))
+                stdin_file.seek(0)
+            automation_zygote.request_fork(
+                self.sock, job_id, job["run_file"], job["argv"], job["cwd"], stdout_w, stderr_w,
+                limits=job.get("limits"), stack_dump=bool(job.get("stack_dump")),
+                stdin_fd=stdin_file.fileno() if stdin_file else None, env=job.get("env")
+            )
+        except OSError as e:
+            os.close(stdout_r)
+            os.close(stderr_r)
+            self.stderrReceived.emit(job_id, f"❌ No se pudo contactar con el zygote: {e}\n")
+            self.jobFinished.emit(job_id, -1)
+            return
+        finally:
+            # El zygote ya tiene sus copias de los extremos de escritura
+            os.close(stdout_w)
+            os.close(stderr_w)
+            if stdin_file is not None:
+                stdin_file.close()
+
+        self._track_job(job_id, stdout_r, stderr_r)
+
+    def cancel(self, job_id: str, grace_ms: int) -> bool:
+        """
+        Termina el grupo de procesos del trabajo (el hijo hace setsid tras el fork)
+
+        Args:
+            job_id: ID del trabajo
+            grace_ms: Milisegundos entre SIGTERM y SIGKILL
+
+        Returns:
+            True si el trabajo seguía activo
+        """
+        state = self.jobs.get(job_id)
+        if state is None:
+            return False
+
+        state["cancel_grace_ms"] = grace_ms
+        if state["pid"] is not None:
+            terminate_process_group(state["pid"], grace_ms)
+        # Si aún no llegó "started", se termina en cuanto se conozca el pid
+        return True
+
+    def suspend(self, job_id: str) -> bool:
+        """Detiene (SIGSTOP) el grupo de procesos del trabajo"""
+        state = self.jobs.get(job_id)
+        return state is not None and state["pid"] is not None and suspend_process_group(state["pid"])
+
+    def resume(self, job_id: str) -> bool:
+        """Reanuda (SIGCONT) el grupo de procesos del trabajo"""
+        state = self.jobs.get(job_id)
+        return state is not None and state["pid"] is not None and resume_process_group(state["pid"])
+
+    def process_id(self, job_id: str) -> Optional[int]:
+        """pid del proceso del trabajo (líder de su grupo), una vez arrancado"""
+        state = self.jobs.get(job_id)
+        return state["pid"] if state is not None else None
+
+    def shutdown(self):
+        """Cierra el canal de control; el zygote termina al ver EOF"""
+        if self.control_notifier is not None:
+            self.control_notifier.setEnabled(False)
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+        if self.zygote is not None:
+            try:
+                self.zygote.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self.zygote.kill()
+            self.zygote = None
+
+    def _read_control(self):
+        try:
+            message = automation_zygote.read_message(self.sock)
+        except (OSError, ValueError):
+            message = None
+
+        if message is None:
+            self._on_zygote_lost()
+            return
+
+        state = self.jobs.get(message.get("job"))
+        if state is None:
+            return
+
+        if message["event"] == "started":
+            state["pid"] = message["pid"]
+            self.jobStarted.emit(message["job"])
+            if "cancel_grace_ms" in state:
+                terminate_process_group(state["pid"], state["cancel_grace_ms"])
+        elif message["event"] == "exit":
+            self._set_exit_code(message["job"], message["code"])
+
+    def _on_zygote_lost(self):
+        """El zygote murió: se dan por fallidos los trabajos pendientes"""
+        if self.control_notifier is not None:
+            self.control_notifier.setEnabled(False)
+            self.control_notifier.deleteLater()
+            self.control_notifier = None
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+        if self.zygote is not None:
+            self.zygote.poll()
+            self.zygote = None
+
+        for job_id, state in list(self.jobs.items()):
+            if state["exit_code"] is None:
+                state["exit_code"] = -1
+                self.stderrReceived.emit(job_id, "❌ El zygote terminó inesperadamente\n")
+            self._finish_if_done(job_id)
@@ -0,0 +1,193 @@
+"""
+Automation In-Process Executor
+Ejecuta automatizaciones de confianza llamando a main(**inputs) en hilos del propio proceso
+"""
+
+import os
+import sys
+import inspect
+import threading
+import traceback
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from PySide6.QtCore import QCoreApplication, QObject, Signal
+
+from .automation_launcher import SCRIPT_HELPERS_DIR
+
+
+class ThreadLocalStream:
+    """
+    Sustituto de sys.stdout/sys.stderr que reparte la salida por hilo
+
+    Los hilos con un destino registrado (set_sink) envían ahí su salida;
+    el resto sigue escribiendo en el stream original.
+    """
+
+    def __init__(self, original):
+        self.original = original
+        self.local = threading.local()
+
+    def set_sink(self, sink):
+        self.local.sink = sink
+        self.local.buffer = []
+
+    def clear_sink(self):
+        self.flush()
+        self.local.sink = None
+
+    def write(self, text):
+        sink = getattr(self.local, "sink", None)
+        if sink is None:
+            return self.original.write(text)
+
+        # Agrupar por líneas: print() hace una escritura para el texto y otra para el salto
+        self.local.buffer.append(text)
+        if "\n" in text:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        sink = getattr(self.local, "sink", None)
+        if sink is None:
+            self.original.flush()
+            return
+        if self.local.buffer:
+            data = "".join(self.local.buffer)
+            self.local.buffer.clear()
+            sink(data)
+
+    def __getattr__(self, name):
+        return getattr(self.original, name)
+
+
+class AutomationInProcessExecutor(QObject):
+    """
+    Ejecutor sin procesos: importa run.py una vez y llama a main() en un pool de hilos
+
+    No aplica job["cwd"] ni job["env"]: el directorio de trabajo y las
+    variables de entorno son los de la aplicación, compartidos por todos los
+    hilos. Las automatizaciones con intérprete propio ("python" o
+    "requirements") nunca llegan aquí: load_automations las pasa a subprocess.
+    """
+
+    jobStarted = Signal(str)           # job_id
+    stdoutReceived = Signal(str, str)  # job_id, texto
+    stderrReceived = Signal(str, str)  # job_id, texto
+    jobFinished = Signal(str, int)     # job_id, exit_code
+
+    def __init__(self, max_threads: int = 4, parent=None):
+        """
+        Inicializa el ejecutor
+
+        Args:
+            max_threads: Hilos del pool
+        """
+        super().__init__(parent)
+        self.pool = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="automation")
+        self.modules = {}
+        self.modules_lock = threading.Lock()
+        self.active = set()
+        self.stdout = None
+        self.stderr = None
+
+        # Los run.py importados pueden usar los ayudantes (automation_inputs)
+        if SCRIPT_HELPERS_DIR not in sys.path:
+            sys.path.append(SCRIPT_HELPERS_DIR)
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def start(self, job: Dict):
+        """
+        Encola la llamada a main(**inputs) del trabajo en el pool de hilos
+
+        Args:
+            job: Diccionario del trabajo (id, run_file, inputs)
+        """
+        self._install_streams()
+        self.active.add(job["id"])
+        self.pool.submit(self._run, job)
+
+    def is_running(self, job_id: str) -> bool:
+        """Indica si el trabajo sigue activo"""
+        return job_id in self.active
+
+    def running_jobs(self) -> List[str]:
+        """Retorna los IDs de los trabajos en ejecución"""
+        return list(self.active)
+
+    def shutdown(self):
+        """Deja de aceptar trabajos; los hilos en curso no se pueden interrumpir"""
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def load_module(self, run_file: str):
+        """
+        Retorna el módulo de run.py, reimportándolo solo si cambió en disco
+
+        Args:
+            run_file: Ruta del script de la automatización
+        """
+        mtime = os.stat(run_file).st_mtime_ns
+        with self.modules_lock:
+            cached = self.modules.get(run_file)
+            if cached and cached[0] == mtime:
+                return cached[1]
+
+            name = "aurore_automation_" + os.path.basename(os.path.dirname(run_file))
+            spec = importlib.util.spec_from_file_location(name, run_file)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+
+            self.modules[run_file] = (mtime, module)
+            return module
+
+    def _install_streams(self):
+        """Coloca los redirectores por hilo una sola vez"""
+        if self.stdout is None:
+            self.stdout = ThreadLocalStream(sys.stdout)
+            self.stderr = ThreadLocalStream(sys.stderr)
+            sys.stdout = self.stdout
+            sys.stderr = self.stderr
+
+    def _run(self, job: Dict):
+        job_id = job["id"]
+        self.stdout.set_sink(lambda text: self.stdoutReceived.emit(job_id, text))
+        self.stderr.set_sink(lambda text: self.stderrReceived.emit(job_id, text))
+        self.jobStarted.emit(job_id)
+
+        code = 1
+        try:
+            module = self.load_module(job["run_file"])
+            main = getattr(module, "main", None)
+            if main is None:
+                raise AttributeError(f"{job['run_file']} no define main()")
+
+            result = main(**self._main_arguments(main, job["inputs"]))
+            if isinstance(result, bool) or result is None:
+                code = 0 if result in (True, None) else 1
+            elif isinstance(result, int):
+                code = result
+            else:
+                code = 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            self.stdout.clear_sink()
+            self.stderr.clear_sink()
+            self.active.discard(job_id)
+            self.jobFinished.emit(job_id, code)
+
+    @staticmethod
+    def _main_arguments(main, inputs: Dict) -> Dict:
+        """Filtra los inputs a los parámetros que acepta main()"""
+        values = {key: value for key, value in inputs.items() if value}
+        parameters = inspect.signature(main).parameters
+        if any(p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters.values()):
+            return values
+        return {key: value for key, value in values.items() if key in parameters}
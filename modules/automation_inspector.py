@@ -0,0 +1,76 @@
+"""
+Automation Inspector
+Recorre los inputs de las automatizaciones (huellas, firmas de salida, tamaños) en hilos aparte
+
+Con carpetas grandes o unidades de red, recorrer los inputs puede tardar
+segundos: en el hilo de la interfaz congelaría la ventana al lanzar o al
+terminar un trabajo. El resultado se entrega en el hilo de la interfaz.
+"""
+
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from PySide6.QtCore import QCoreApplication, QObject, Signal
+
+
+class InputInspector(QObject):
+    """
+    Ejecuta funciones de E/S en un pool de hilos y llama a su callback en el hilo de la interfaz
+
+    El callback recibe (resultado, error): error es None si la función
+    terminó bien, o la excepción que lanzó.
+    """
+
+    _resultReady = Signal(int, object, object)  # petición, resultado, error (desde el hilo del pool)
+
+    def __init__(self, max_threads: int = 2, parent=None):
+        """
+        Inicializa el pool
+
+        Args:
+            max_threads: Recorridos simultáneos como máximo
+        """
+        super().__init__(parent)
+        self.pool = ThreadPoolExecutor(max_workers=max(1, max_threads), thread_name_prefix="inspector")
+        self.callbacks = {}
+        self.counter = itertools.count(1)
+        self._resultReady.connect(self._on_result)
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def submit(self, function: Callable, args: tuple, callback: Callable):
+        """
+        Ejecuta function(*args) en segundo plano
+
+        Args:
+            function: Función a ejecutar (no debe tocar la interfaz)
+            args: Argumentos de la función
+            callback: Recibe (resultado, error) en el hilo de la interfaz
+        """
+        request = next(self.counter)
+        self.callbacks[request] = callback
+        self.pool.submit(self._run, request, function, args)
+
+    def pending(self) -> int:
+        """Recorridos encolados o en curso"""
+        return len(self.callbacks)
+
+    def shutdown(self):
+        """Descarta los recorridos pendientes; los que están en curso terminan sin avisar"""
+        self.callbacks.clear()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, request: int, function: Callable, args: tuple):
+        try:
+            result, error = function(*args), None
+        except Exception as e:
+            result, error = None, e
+        self._resultReady.emit(request, result, error)
+
+    def _on_result(self, request: int, result, error):
+        callback = self.callbacks.pop(request, None)
+        if callback is not None:
+            callback(result, error)
@@ -0,0 +1,336 @@
+"""
+Automation Launcher
+Arranque del proceso hijo: aplica los límites del trabajo y ejecuta run.py
+
+Se lanza como script y solo usa la biblioteca estándar:
+    python automation_launcher.py '<opciones JSON>' run.py [args...]
+o, como hace build_command, con LAUNCH_STUB, que importa este módulo desde
+su bytecode en caché y ejecuta run.py desde el suyo (ver load_code):
+    python [flags] -c LAUNCH_STUB <carpeta de este módulo> '<opciones JSON>' run.py [args...]
+Los límites se aplican en el propio hijo antes de que run.py ejecute nada,
+así que valen también para los procesos que la automatización lance. Con
+"stack_dump" en las opciones, el hijo vuelca la pila de sus hilos por
+stderr al recibir STACK_DUMP_SIGNAL (ver enable_stack_dump). Con
+"parent_pid", el hijo muere si muere la aplicación (ver tie_to_parent).
+run.py encuentra en sys.path los ayudantes de SCRIPT_HELPERS_DIR
+(automation_inputs para leer sus inputs con nombre).
+"""
+
+import os
+import sys
+import json
+import marshal
+import importlib.util
+import signal
+import faulthandler
+from typing import Dict, List, Optional
+
+LAUNCHER_SCRIPT = os.path.abspath(__file__)
+LAUNCHER_DIR = os.path.dirname(LAUNCHER_SCRIPT)
+
+# Programa de -c de los hijos: un script siempre se compila desde el código fuente, un módulo importado no
+LAUNCH_STUB = "import sys;sys.path.insert(0,sys.argv.pop(1));import automation_launcher;automation_launcher.main()"
+
+# Módulos que run.py puede importar sin depender de la aplicación (todos los ejecutores la añaden a sys.path)
+SCRIPT_HELPERS_DIR = os.path.join(os.path.dirname(LAUNCHER_SCRIPT), "script_helpers")
+
+# Claves de ui_config.json que se aplican como límites del proceso
+LIMIT_KEYS = ("max_memory_mb", "max_cpu_seconds", "nice", "io_priority")
+
+# Número de la llamada ioprio_set por arquitectura (no está expuesta en os)
+IOPRIO_SET_SYSCALLS = {"x86_64": 251, "i386": 289, "i686": 289, "aarch64": 30, "armv7l": 314, "ppc64le": 273}
+IOPRIO_CLASS_BE = 2
+IOPRIO_CLASS_IDLE = 3
+IOPRIO_CLASS_SHIFT = 13
+
+# Señal con la que se pide a un trabajo que vuelque su pila (no existe en Windows)
+STACK_DUMP_SIGNAL = getattr(signal, "SIGUSR1", None)
+
+# prctl(PR_SET_PDEATHSIG): señal que recibe un proceso cuando muere su padre (solo Linux)
+PR_SET_PDEATHSIG = 1
+PDEATHSIG_SUPPORTED = sys.platform.startswith("linux")
+
+
+def extract_limits(config: Dict) -> Dict:
+    """
+    Obtiene los límites declarados en una configuración
+
+    Args:
+        config: Contenido de ui_config.json
+
+    Returns:
+        Diccionario solo con los límites presentes
+    """
+    return {key: config[key] for key in LIMIT_KEYS if config.get(key) is not None}
+
+
+def interpreter_flags(frozen_modules: str = "", isolated: bool = False, no_site: bool = False,
+                      optimize: int = 0, pycache_prefix: Optional[str] = None, unbuffered: bool = False) -> List[str]:
+    """
+    Opciones del intérprete de los hijos
+
+    PYTHONPYCACHEPREFIX y PYTHONUNBUFFERED no llegan a un intérprete aislado
+    (-I): en ese caso se pasan como -X pycache_prefix y -u.
+
+    Args:
+        frozen_modules: "on", "off" o "" para dejar el valor por defecto (-X frozen_modules)
+        isolated: -I, sin variables PYTHON*, site del usuario ni directorio actual en sys.path
+        no_site: -S, sin site-packages
+        optimize: -O (1) o -OO (2)
+        pycache_prefix: Carpeta del bytecode en caché
+        unbuffered: Salida sin búfer
+    """
+    flags = []
+    if frozen_modules:
+        flags += ["-X", f"frozen_modules={frozen_modules}"]
+    if isolated:
+        flags.append("-I")
+        if pycache_prefix:
+            flags += ["-X", f"pycache_prefix={pycache_prefix}"]
+        if unbuffered:
+            flags.append("-u")
+    if no_site:
+        flags.append("-S")
+    if optimize:
+        flags.append("-" + "O" * min(2, int(optimize)))
+    return flags
+
+
+def build_command(run_file: str, argv: List[str], limits: Dict, stack_dump: bool = False,
+                  python: Optional[str] = None, flags: Optional[List[str]] = None) -> List[str]:
+    """
+    Línea de comandos del proceso hijo, que siempre pasa por el launcher (vía LAUNCH_STUB)
+
+    El launcher pone SCRIPT_HELPERS_DIR en sys.path y, en Linux, ata el hijo
+    a la vida del proceso actual con PR_SET_PDEATHSIG.
+
+    Args:
+        run_file: Ruta del script de la automatización
+        argv: Argumentos del script
+        limits: Límites del trabajo (ver LIMIT_KEYS)
+        stack_dump: Preparar al hijo para volcar su pila con STACK_DUMP_SIGNAL
+        python: Intérprete del hijo (por defecto, el de la aplicación)
+        flags: Opciones del intérprete (ver interpreter_flags)
+    """
+    options = dict(limits or {})
+    if stack_dump and STACK_DUMP_SIGNAL is not None:
+        options["stack_dump"] = True
+    if PDEATHSIG_SUPPORTED:
+        options["parent_pid"] = os.getpid()
+    options["bytecode"] = True
+    return [python or sys.executable] + list(flags or []) + [
+        "-c", LAUNCH_STUB, LAUNCHER_DIR, json.dumps(options), run_file
+    ] + list(argv)
+
+
+def tie_to_parent(parent_pid: int, signum: int = getattr(signal, "SIGKILL", 9)) -> bool:
+    """
+    Hace que el proceso actual reciba signum cuando muera parent_pid, su padre
+
+    Así un trabajo no sigue corriendo sin supervisión si la aplicación se
+    cierra de golpe o falla. Solo Linux.
+
+    Args:
+        parent_pid: pid del padre esperado
+        signum: Señal que se recibe al morir el padre
+
+    Returns:
+        True si se aplicó
+    """
+    if not PDEATHSIG_SUPPORTED:
+        return False
+
+    import ctypes
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.prctl(PR_SET_PDEATHSIG, int(signum), 0, 0, 0) != 0:
+        return False
+    # El padre pudo morir antes de la llamada: ya no llegaría la señal
+    if os.getppid() != parent_pid:
+        os.kill(os.getpid(), signum)
+    return True
+
+
+def enable_stack_dump() -> bool:
+    """
+    Hace que el proceso actual vuelque la pila de todos sus hilos por stderr
+    al recibir STACK_DUMP_SIGNAL, sin interrumpir su ejecución
+
+    Returns:
+        True si la plataforma lo permite
+    """
+    if STACK_DUMP_SIGNAL is None or not hasattr(faulthandler, "register"):
+        return False
+    faulthandler.register(STACK_DUMP_SIGNAL, file=sys.stderr, all_threads=True)
+    return True
+
+
+def set_io_priority(priority) -> bool:
+    """
+    Cambia la prioridad de E/S del proceso actual (solo Linux)
+
+    Args:
+        priority: "idle" o nivel best-effort de 0 (más alta) a 7 (más baja)
+
+    Returns:
+        True si se aplicó
+    """
+    import platform
+
+    number = IOPRIO_SET_SYSCALLS.get(platform.machine())
+    if not sys.platform.startswith("linux") or number is None:
+        return False
+
+    import ctypes
+
+    if priority == "idle":
+        value = IOPRIO_CLASS_IDLE << IOPRIO_CLASS_SHIFT
+    else:
+        value = (IOPRIO_CLASS_BE << IOPRIO_CLASS_SHIFT) | max(0, min(7, int(priority)))
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    return libc.syscall(number, 1, 0, value) == 0  # IOPRIO_WHO_PROCESS, proceso actual
+
+
+def apply_limits(limits: Dict):
+    """
+    Aplica los límites al proceso actual; los que no se puedan aplicar se avisan por stderr
+
+    Args:
+        limits: Límites del trabajo (ver LIMIT_KEYS)
+    """
+    try:
+        import resource
+    except ImportError:
+        resource = None
+
+    if limits.get("max_memory_mb") is not None:
+        if resource is None:
+            print("⚠️  max_memory_mb no está disponible en esta plataforma", file=sys.stderr)
+        else:
+            size = int(limits["max_memory_mb"]) * 1024 * 1024
+            try:
+                resource.setrlimit(resource.RLIMIT_AS, (size, size))
+            except (ValueError, OSError) as e:
+                print(f"⚠️  No se pudo aplicar max_memory_mb: {e}", file=sys.stderr)
+
+    if limits.get("max_cpu_seconds") is not None:
+        if resource is None:
+            print("⚠️  max_cpu_seconds no está disponible en esta plataforma", file=sys.stderr)
+        else:
+            seconds = int(limits["max_cpu_seconds"])
+            try:
+                # SIGXCPU al alcanzar el límite blando, SIGKILL un segundo después
+                resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds + 1))
+            except (ValueError, OSError) as e:
+                print(f"⚠️  No se pudo aplicar max_cpu_seconds: {e}", file=sys.stderr)
+
+    if limits.get("nice") is not None:
+        try:
+            os.nice(int(limits["nice"]))
+        except (AttributeError, OSError) as e:
+            print(f"⚠️  No se pudo aplicar nice: {e}", file=sys.stderr)
+
+    if limits.get("io_priority") is not None:
+        if not set_io_priority(limits["io_priority"]):
+            print("⚠️  No se pudo aplicar io_priority", file=sys.stderr)
+
+
+def load_code(path: str):
+    """
+    Código de un script desde su .pyc en caché
+
+    Usa la misma ruta (sys.pycache_prefix incluido) y la misma validación por
+    fecha y tamaño que las importaciones; si falta o está desfasado, compila
+    el código fuente y guarda el .pyc para la siguiente ejecución (salvo con
+    sys.dont_write_bytecode).
+
+    Args:
+        path: Ruta del script
+
+    Returns:
+        Objeto código listo para exec
+    """
+    stat = os.stat(path)
+    header = (importlib.util.MAGIC_NUMBER + bytes(4)
+              + (int(stat.st_mtime) & 0xFFFFFFFF).to_bytes(4, "little")
+              + (stat.st_size & 0xFFFFFFFF).to_bytes(4, "little"))
+    cached = importlib.util.cache_from_source(path)
+    try:
+        with open(cached, "rb") as f:
+            data = f.read()
+        if data[:16] == header:
+            return marshal.loads(memoryview(data)[16:])
+    except (OSError, ValueError, EOFError):
+        pass
+
+    with open(path, "rb") as f:
+        code = compile(f.read(), path, "exec", dont_inherit=True)
+    if sys.dont_write_bytecode:
+        return code
+    try:
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        temporary = f"{cached}.{os.getpid()}"
+        with open(temporary, "wb") as f:
+            f.write(header + marshal.dumps(code))
+        os.replace(temporary, cached)
+    except OSError:
+        pass
+    return code
+
+
+def run_script(run_file: str, argv: List[str], bytecode: bool = False) -> int:
+    """
+    Ejecuta run.py como __main__ en el proceso actual
+
+    Args:
+        run_file: Ruta del script
+        argv: Argumentos del script
+        bytecode: Ejecutarlo desde su .pyc en caché (ver load_code) en vez de compilarlo
+
+    Returns:
+        Código de salida del script
+    """
+    sys.argv = [run_file] + list(argv)
+    sys.path[0] = os.path.dirname(os.path.abspath(run_file))
+    sys.path.append(SCRIPT_HELPERS_DIR)
+    try:
+        if bytecode:
+            main_module = type(sys)("__main__")
+            main_module.__file__ = run_file
+            sys.modules["__main__"] = main_module
+            exec(load_code(run_file), main_module.__dict__)
+        else:
+            import runpy
+            runpy.run_path(run_file, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException:
+        import traceback
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def main():
+    """Punto de entrada del hijo: sys.argv = [launcher, opciones JSON, run.py, args...]"""
+    options = json.loads(sys.argv[1])
+    if options.get("parent_pid"):
+        tie_to_parent(options.pop("parent_pid"))
+    if options.pop("stack_dump", False):
+        enable_stack_dump()
+    bytecode = options.pop("bytecode", False)
+    apply_limits(options)
+    code = run_script(sys.argv[2], sys.argv[3:], bytecode)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
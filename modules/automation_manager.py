@@ -5,23 +5,164 @@ Gestiona la detección y ejecución de automatizaciones Python
 
 import os
 import json
+import tempfile
+import signal
 import subprocess
-import sys
+import time
+import uuid
+from collections import OrderedDict
 from pathlib import Path
 from typing import List, Dict, Optional
 
+from PySide6.QtCore import QCoreApplication
+
+from .app_settings import Settings
+from .automation_scheduler import AutomationScheduler, priority_value
+from .automation_pool import AutomationWorkerPool
+from .automation_forkserver import AutomationForkServerExecutor
+from .automation_inprocess import AutomationInProcessExecutor
+from .automation_subinterp import AutomationSubinterpreterExecutor
+from .automation_pty import AutomationPtyExecutor
+from .automation_launcher import (
+    LAUNCHER_SCRIPT, SCRIPT_HELPERS_DIR, build_command, extract_limits, interpreter_flags
+)
+from .automation_output import AutomationOutputStore, read_tail
+from .automation_cache import AutomationResultCache, InputFingerprinter
+from .automation_inspector import InputInspector
+from .automation_resources import AutomationResourceMonitor
+from .automation_runtime import RuntimePredictor, batch_input_sizes, input_size
+from .automation_watchdog import HANG_ACTIONS, AutomationWatchdog
+from .automation_envs import AutomationEnvironments
+from .automation_bytecode import BytecodeCompiler
+from .automation_cron import AutomationCronScheduler, CronExpression, MISFIRE_POLICIES
+from . import automation_zygote
+from . import automation_subinterp
+from . import automation_pty
+
+# Ejecutores que dependen de la plataforma o de la versión de Python
+OPTIONAL_EXECUTORS = ("zygote", "subinterpreter", "pty")
+
+# Ejecutores que lanzan un proceso por trabajo y pueden aplicarle límites del SO
+LIMITED_EXECUTORS = ("subprocess", "zygote", "pty")
+
+# Ejecutores que lanzan el intérprete de cada trabajo y pueden usar el de su automatización
+INTERPRETER_EXECUTORS = ("subprocess", "pty")
+
+# Ejecutores cuyo proceso puede volcar su pila antes de detener un trabajo colgado
+STACK_DUMP_EXECUTORS = ("subprocess", "zygote", "pool", "pty")
+
+# Cómo recibe run.py sus inputs: posicionales en sys.argv o un JSON con nombre por stdin
+ARGUMENT_MODES = ("argv", "json")
+
+# Motivos por los que un trabajo espera en la cola sin lanzarse (job["holds"])
+CACHE_HOLD = "caché"
+ENVIRONMENT_HOLD = "entorno virtual"
+
+# Tamaños de inputs medidos que se recuerdan para estimar la duración al encolar
+KNOWN_INPUT_SIZES = 1000
+
 class AutomationManager:
-    def __init__(self, automations_folder: str = "Automatizaciones"):
+    def __init__(self, automations_folder: str = "Automatizaciones", max_workers: Optional[int] = None):
         """
         Inicializa el gestor de automatizaciones
         
         Args:
             automations_folder: Ruta de la carpeta que contiene las automatizaciones
+            max_workers: Trabajos simultáneos como máximo (por defecto Settings.MAX_WORKERS o número de CPUs)
         """
-        self.automations_folder = automations_folder
+        # Absoluta: las rutas de las automatizaciones no dependen del cwd de la aplicación
+        self.automations_folder = os.path.abspath(automations_folder)
         self.automations = []
         self.current_automation = None
+        self.batches = {}
+        self.known_input_sizes = OrderedDict()  # clave de inputs -> (bytes, archivos) de la última medición
+        self.scheduler = AutomationScheduler(
+            max_workers=max_workers or Settings.MAX_WORKERS or None,
+            history_size=Settings.JOB_HISTORY_SIZE,
+            cancel_grace_ms=int(Settings.CANCEL_GRACE_SECONDS * 1000),
+            preemption=Settings.PREEMPT_LOW_PRIORITY,
+            shortest_job_first=Settings.SHORTEST_JOB_FIRST,
+            progress_interval_ms=Settings.PROGRESS_INTERVAL_MS
+        )
+        self.scheduler.jobStarted.connect(self._on_job_started)
+        self.scheduler.stdoutReceived.connect(self._on_job_output)
+        self.scheduler.stderrReceived.connect(self._on_job_output)
+        self.scheduler.jobFinished.connect(self._on_job_finished)
+        # Un solo hilo para los recorridos de /proc, aparte de los de los inputs
+        self.process_scanner = InputInspector(max_threads=1)
+        self.resource_monitor = None
+        if Settings.ADMISSION_CONTROL:
+            self.resource_monitor = AutomationResourceMonitor(
+                os.path.join(Settings.DATA_FOLDER, "memory_peaks.json"),
+                process_id=self.scheduler.process_id,
+                scanner=self.process_scanner,
+                headroom_mb=Settings.MEMORY_HEADROOM_MB,
+                max_load_per_cpu=Settings.MAX_LOAD_PER_CPU
+            )
+            self.scheduler.set_admission_control(
+                self.resource_monitor, retry_ms=int(Settings.ADMISSION_RETRY_SECONDS * 1000)
+            )
+        self.output = AutomationOutputStore(
+            os.path.join(Settings.DATA_FOLDER, "logs"),
+            tail_bytes=Settings.OUTPUT_TAIL_BYTES,
+            logs_per_automation=Settings.OUTPUT_LOGS_PER_AUTOMATION
+        )
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.output.close_all)
+        self.watchdog = AutomationWatchdog(
+            self.scheduler,
+            scanner=self.process_scanner,
+            interval_ms=int(Settings.WATCHDOG_INTERVAL_SECONDS * 1000),
+            stack_dump_wait_ms=int(Settings.STACK_DUMP_WAIT_SECONDS * 1000)
+        )
+        self.runtime_predictor = RuntimePredictor(os.path.join(Settings.DATA_FOLDER, "runtimes.json"))
+        self.fingerprinter = InputFingerprinter(max_content_hashes=Settings.RESULT_CACHE_CONTENT_HASHES)
+        self.inspector = InputInspector(max_threads=Settings.INPUT_SCAN_THREADS)
+        self.result_cache = AutomationResultCache(
+            os.path.join(Settings.DATA_FOLDER, "cache"),
+            max_entries=Settings.RESULT_CACHE_MAX_ENTRIES,
+            max_bytes=Settings.RESULT_CACHE_MAX_MB * 1024 * 1024
+        )
+        self.worker_pool = AutomationWorkerPool(
+            size=Settings.WORKER_POOL_SIZE,
+            max_jobs_per_worker=Settings.WORKER_MAX_JOBS,
+            max_memory_mb=Settings.WORKER_MAX_MEMORY_MB
+        )
+        self.scheduler.add_executor("pool", self.worker_pool)
+        self.fork_server = None
+        if automation_zygote.is_supported():
+            self.fork_server = AutomationForkServerExecutor(preload=Settings.ZYGOTE_PRELOAD)
+            self.scheduler.add_executor("zygote", self.fork_server)
+        self.inprocess_executor = AutomationInProcessExecutor(max_threads=Settings.INPROCESS_THREADS)
+        self.scheduler.add_executor("inprocess", self.inprocess_executor)
+        self.subinterpreter_executor = None
+        if automation_subinterp.is_supported():
+            self.subinterpreter_executor = AutomationSubinterpreterExecutor(spares=Settings.SUBINTERPRETER_SPARES)
+            self.scheduler.add_executor("subinterpreter", self.subinterpreter_executor)
+        if automation_pty.is_supported():
+            self.scheduler.add_executor("pty", AutomationPtyExecutor())
+        self.environments = AutomationEnvironments(
+            os.path.join(Settings.DATA_FOLDER, "envs"), wheelhouse=Settings.WHEELHOUSE_FOLDER
+        )
+        self.environments.environmentReady.connect(self._on_environment_ready)
+        self.environments.environmentFailed.connect(self._on_environment_failed)
+        self.environment_jobs = {}
+        self.pycache_dir = None
+        self.bytecode = None
+        if Settings.PRECOMPILE_BYTECODE:
+            self.pycache_dir = os.path.abspath(os.path.join(Settings.DATA_FOLDER, "pycache"))
+            self.bytecode = BytecodeCompiler(self.pycache_dir, optimize=Settings.CHILD_OPTIMIZE)
         self.load_automations()
+        self.cron = None
+        if Settings.SCHEDULES_ENABLED:
+            self.cron = AutomationCronScheduler(
+                os.path.join(Settings.DATA_FOLDER, "schedules.json"),
+                misfire=Settings.SCHEDULE_MISFIRE_POLICY,
+                jitter_seconds=Settings.SCHEDULE_JITTER_SECONDS,
+                misfire_grace_seconds=Settings.SCHEDULE_MISFIRE_GRACE_SECONDS
+            )
+            self.cron.scheduleDue.connect(self._on_schedule_due)
     
     def load_automations(self) -> List[Dict]:
         """
@@ -38,7 +179,7 @@ class AutomationManager:
         
         # Buscar subcarpetas que contengan ui_config.json y run.py
         for item in os.listdir(self.automations_folder):
-            automation_path = os.path.join(self.automations_folder, item)
+            automation_path = os.path.abspath(os.path.join(self.automations_folder, item))
             
             if os.path.isdir(automation_path):
                 config_file = os.path.join(automation_path, "ui_config.json")
@@ -57,8 +198,62 @@ class AutomationManager:
                             "run_file": run_file,
                             "name": config.get("name", item),
                             "description": config.get("description", "Sin descripción"),
-                            "inputs": config.get("inputs", [])
+                            "inputs": config.get("inputs", []),
+                            "max_concurrency": config.get("max_concurrency"),
+                            "executor": config.get("executor", Settings.DEFAULT_EXECUTOR),
+                            "needs_cwd": config.get("needs_cwd", True),
+                            "arguments": config.get("arguments", "argv"),
+                            "timeout_seconds": config.get("timeout_seconds", Settings.DEFAULT_TIMEOUT_SECONDS) or None,
+                            "limits": extract_limits(config),
+                            "cache": self._cache_options(config.get("cache")),
+                            "retry": self._retry_options(config.get("retry")),
+                            "coalesce": config.get("coalesce", Settings.COALESCE_DUPLICATE_JOBS),
+                            "priority": config.get("priority"),
+                            "expected_memory_mb": config.get("expected_memory_mb"),
+                            "hang_seconds": config.get("hang_seconds", Settings.DEFAULT_HANG_SECONDS) or None,
+                            "hang_action": config.get("hang_action", Settings.HANG_ACTION)
                         }
+                        automation_info["environment"] = self.environments.spec(automation_info, config)
+                        
+                        if automation_info["arguments"] not in ARGUMENT_MODES:
+                            print(f"⚠️  arguments desconocido '{automation_info['arguments']}' en {item}, se usa 'argv'")
+                            automation_info["arguments"] = "argv"
+                        
+                        if automation_info["hang_action"] not in HANG_ACTIONS:
+                            print(f"⚠️  hang_action desconocida '{automation_info['hang_action']}' en {item}, se usa 'warn'")
+                            automation_info["hang_action"] = "warn"
+                        
+                        if automation_info["executor"] not in self.scheduler.executors:
+                            if automation_info["executor"] in OPTIONAL_EXECUTORS:
+                                print(f"⚠️  Ejecutor '{automation_info['executor']}' no disponible en esta plataforma ({item}), se usa subprocess")
+                            else:
+                                print(f"⚠️  Ejecutor desconocido '{automation_info['executor']}' en {item}, se usa subprocess")
+                            automation_info["executor"] = "subprocess"
+                        
+                        # Un subintérprete comparte el directorio de trabajo de la aplicación
+                        if automation_info["executor"] == "subinterpreter" and automation_info["needs_cwd"]:
+                            print(f"⚠️  subinterpreter no ejecuta {item} en su carpeta (\"needs_cwd\": false si run.py no usa rutas relativas), se usa subprocess")
+                            automation_info["executor"] = "subprocess"
+                        
+                        # Los límites del SO son por proceso: solo se aplican a hijos propios
+                        if automation_info["limits"] and automation_info["executor"] not in LIMITED_EXECUTORS:
+                            print(f"⚠️  Los límites de recursos de {item} requieren un proceso propio, se usa subprocess")
+                            automation_info["executor"] = "subprocess"
+                        
+                        if automation_info["environment"] and automation_info["executor"] not in INTERPRETER_EXECUTORS:
+                            print(f"⚠️  {item} usa su propio intérprete, que requiere un proceso propio, se usa subprocess")
+                            automation_info["executor"] = "subprocess"
+                        
+                        # Un entorno virtual necesita su site-packages
+                        environment = automation_info["environment"]
+                        automation_info["interpreter_flags"] = interpreter_flags(
+                            frozen_modules=Settings.CHILD_FROZEN_MODULES,
+                            isolated=Settings.CHILD_ISOLATED,
+                            no_site=Settings.CHILD_NO_SITE and not (environment and environment["requirements"]),
+                            optimize=Settings.CHILD_OPTIMIZE,
+                            pycache_prefix=self.pycache_dir,
+                            unbuffered=Settings.UNBUFFERED_OUTPUT
+                        )
                         
                         self.automations.append(automation_info)
                         print(f"✅ Automatización cargada: {automation_info['name']}")
@@ -67,6 +262,29 @@ class AutomationManager:
                         print(f"❌ Error cargando automatización en {item}: {str(e)}")
         
         print(f"📋 Total de automatizaciones cargadas: {len(self.automations)}")
+        
+        # Precalentar los ejecutores solo si alguna automatización los usa
+        if any(automation["executor"] == "pool" for automation in self.automations):
+            self.worker_pool.prewarm()
+        if any(automation["executor"] == "zygote" for automation in self.automations):
+            self.fork_server.prewarm()
+        if any(automation["executor"] == "subinterpreter" for automation in self.automations):
+            self.subinterpreter_executor.prewarm()
+        # Bytecode de las automatizaciones que lanzan su propio intérprete, agrupadas por intérprete
+        if self.bytecode:
+            folders = {}
+            for automation in self.automations:
+                if automation["executor"] in INTERPRETER_EXECUTORS:
+                    python = automation["environment"]["python"] if automation["environment"] else None
+                    folders.setdefault(python, []).append(automation["folder"])
+            for python, group in folders.items():
+                self.bytecode.compile(group + [LAUNCHER_SCRIPT, SCRIPT_HELPERS_DIR], python)
+        
+        # Los entornos que falten se crean ya en segundo plano, no al primer uso
+        for automation in self.automations:
+            if automation["environment"]:
+                self.environments.prepare(automation["environment"])
+        
         return self.automations
     
     def get_automations(self) -> List[Dict]:
@@ -112,16 +330,71 @@ class AutomationManager:
         """
         return self.current_automation
     
+    def build_arguments(self, automation: Dict, inputs: Dict[str, str]) -> tuple:
+        """
+        Construye los argumentos posicionales del script a partir de los inputs
+        
+        Con "arguments": "json" no hay argumentos posicionales (ver input_document),
+        pero se validan igualmente los inputs requeridos.
+        
+        Args:
+            automation: Diccionario de la automatización
+            inputs: Diccionario con los valores de entrada {input_id: path}
+            
+        Returns:
+            Tupla (success: bool, argv: list | mensaje de error: str)
+        """
+        argv = []
+        
+        # Validar inputs requeridos
+        for input_config in automation["inputs"]:
+            input_id = input_config["id"]
+            is_required = input_config.get("required", False)
+            
+            if is_required and (input_id not in inputs or not inputs[input_id]):
+                return False, f"Input requerido faltante: {input_config['label']}"
+            
+            if input_id in inputs and inputs[input_id]:
+                argv.append(inputs[input_id])
+            else:
+                argv.append("")  # Parámetro opcional vacío
+        
+        if automation.get("arguments") == "json":
+            return True, []
+        return True, argv
+    
+    @staticmethod
+    def input_document(automation: Dict, job_id: str, inputs: Dict[str, str]) -> str:
+        """
+        Documento JSON con los inputs con nombre que recibe run.py por stdin ("arguments": "json")
+        
+        Lo lee script_helpers/automation_inputs.read_inputs(). Los inputs
+        opcionales vacíos se omiten.
+        
+        Args:
+            automation: Diccionario de la automatización
+            job_id: ID del trabajo
+            inputs: Diccionario con los valores de entrada {input_id: path}
+        """
+        known = [input_config["id"] for input_config in automation["inputs"]]
+        named = {input_id: inputs[input_id] for input_id in known if inputs.get(input_id)}
+        return json.dumps({"automation": automation["id"], "job": job_id, "inputs": named}, ensure_ascii=False)
+    
     def execute_automation(self, automation_id: str, inputs: Dict[str, str]) -> tuple:
         """
-        Ejecuta una automatización con los inputs proporcionados
+        Ejecuta una automatización con los inputs proporcionados y espera a que termine
+        
+        Bloquea al llamador: desde la interfaz usar start_automation. Con el
+        ejecutor subinterpreter y sin timeout_seconds el script corre en un
+        subintérprete en este hilo; en el resto de casos, en un proceso nuevo
+        (un subintérprete no se puede interrumpir al vencer el timeout).
         
         Args:
             automation_id: ID de la automatización a ejecutar
             inputs: Diccionario con los valores de entrada {input_id: path}
             
         Returns:
-            Tupla (success: bool, output: str)
+            Tupla (success: bool, output: str con el final de la salida; la completa queda en el registro)
         """
         automation = self.get_automation_by_id(automation_id)
         if not automation:
@@ -129,38 +402,52 @@ class AutomationManager:
         
         try:
             # Preparar argumentos para el script
-            run_file = automation["run_file"]
-            args = [sys.executable, run_file]
+            valid, argv = self.build_arguments(automation, inputs)
+            if not valid:
+                return False, argv
             
-            # Validar inputs requeridos
-            for input_config in automation["inputs"]:
-                input_id = input_config["id"]
-                is_required = input_config.get("required", False)
-                
-                if is_required and (input_id not in inputs or not inputs[input_id]):
-                    return False, f"Input requerido faltante: {input_config['label']}"
-                
-                if input_id in inputs and inputs[input_id]:
-                    args.append(inputs[input_id])
-                else:
-                    args.append("")  # Parámetro opcional vacío
+            if automation["executor"] == "subinterpreter" and self.subinterpreter_executor and not automation["timeout_seconds"]:
+                return self._execute_in_subinterpreter(automation, inputs, argv)
             
-            print(f"🚀 Ejecutando: {' '.join(args)}")
+            python = None
+            if automation["environment"]:
+                ready, python = self.environments.prepare_blocking(automation["environment"])
+                if not ready:
+                    return False, f"❌ No se pudo crear el entorno de la automatización: {python}"
             
-            # Ejecutar el script
-            result = subprocess.run(
-                args,
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5 minutos de timeout
-                cwd=automation["folder"]
+            args = build_command(
+                automation["run_file"], argv, automation["limits"], python=python, flags=automation["interpreter_flags"]
             )
+            timeout = automation["timeout_seconds"]
+            job_id = uuid.uuid4().hex[:12]
+            log_file = self.output.prepare(automation_id, job_id)
+            
+            print(f"🚀 Ejecutando: {' '.join(args)}")
             
-            output = result.stdout
-            if result.stderr:
-                output += f"\n--- ERRORES ---\n{result.stderr}"
+            # Ejecutar el script; la salida va al registro en disco, no a memoria.
+            # En su propio grupo de procesos, para no dejar nietos vivos al cortarlo
+            with open(log_file, "wb") as log, tempfile.TemporaryFile() as stdin:
+                if automation["arguments"] == "json":
+                    stdin.write(self.input_document(automation, job_id, inputs).encode("utf-8"))
+                    stdin.seek(0)
+                process = subprocess.Popen(
+                    args,
+                    stdin=stdin if automation["arguments"] == "json" else None,
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                    cwd=automation["folder"],
+                    env=dict(os.environ, **self.job_environment()),
+                    start_new_session=hasattr(os, "killpg")
+                )
+                try:
+                    returncode = process.wait(timeout=timeout)
+                finally:
+                    if process.poll() is None:
+                        self._kill_process_tree(process)
             
-            success = result.returncode == 0
+            output = read_tail(log_file, Settings.OUTPUT_TAIL_BYTES)
+            
+            success = returncode == 0
             
             if success:
                 print(f"✅ Automatización {automation_id} ejecutada exitosamente")
@@ -170,10 +457,732 @@ class AutomationManager:
             return success, output
             
         except subprocess.TimeoutExpired:
-            return False, "⏰ Timeout: La automatización tardó más de 5 minutos en ejecutarse"
+            return False, f"⏰ Timeout: La automatización tardó más de {timeout} segundos en ejecutarse"
         except Exception as e:
             return False, f"❌ Error inesperado: {str(e)}"
     
+    def _execute_in_subinterpreter(self, automation: Dict, inputs: Dict[str, str], argv: List[str]) -> tuple:
+        """Parte de execute_automation con el ejecutor subinterpreter"""
+        job = {
+            "id": uuid.uuid4().hex[:12],
+            "run_file": automation["run_file"],
+            "cwd": automation["folder"],
+            "argv": argv,
+            "env": self.job_environment(),
+            "stdin_data": None
+        }
+        if automation["arguments"] == "json":
+            job["stdin_data"] = self.input_document(automation, job["id"], inputs)
+        log_file = self.output.prepare(automation["id"], job["id"])
+        
+        print(f"🚀 Ejecutando en un subintérprete: {automation['run_file']}")
+        with open(log_file, "wb") as log:
+            returncode = self.subinterpreter_executor.run_blocking(job, log.fileno())
+        output = read_tail(log_file, Settings.OUTPUT_TAIL_BYTES)
+        
+        if returncode == 0:
+            print(f"✅ Automatización {automation['id']} ejecutada exitosamente")
+        else:
+            print(f"❌ Error ejecutando automatización {automation['id']}")
+        return returncode == 0, output
+    
+    @staticmethod
+    def _kill_process_tree(process: subprocess.Popen):
+        """Mata un proceso lanzado con start_new_session junto con sus descendientes"""
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (AttributeError, OSError):
+            process.kill()
+        process.wait()
+    
+    def shutdown(self):
+        """
+        Termina los trabajos activos antes de cerrar según Settings.SHUTDOWN_POLICY
+        
+        El scheduler emite drained cuando ya no queda ningún trabajo vivo.
+        
+        Returns:
+            True si había trabajos activos y hay que esperar a drained
+        """
+        if not self.scheduler.is_busy() and not self.scheduler.queue:
+            return False
+        policy = Settings.SHUTDOWN_POLICY if Settings.SHUTDOWN_POLICY in ("drain", "kill") else "kill"
+        self.scheduler.shutdown(policy, int(Settings.SHUTDOWN_DRAIN_SECONDS * 1000))
+        return True
+    
+    def start_automation(self, automation_id: str, inputs: Dict[str, str], batch_id: Optional[str] = None,
+                         priority=None, measure_inputs: bool = True) -> tuple:
+        """
+        Encola una automatización para ejecutarla en segundo plano y retorna inmediatamente
+        
+        El progreso se notifica mediante las señales de self.scheduler
+        (jobQueued, jobStarted, stdoutReceived, stderrReceived, jobFinished).
+        
+        Args:
+            automation_id: ID de la automatización a ejecutar
+            inputs: Diccionario con los valores de entrada {input_id: path}
+            batch_id: Lote al que pertenece el trabajo (ver start_batch)
+            priority: "interactive", "batch" o "scheduled" (por defecto, "batch" en
+                      lotes y si no, la "priority" de ui_config.json o "interactive")
+            measure_inputs: Medir el tamaño de los inputs en segundo plano (start_batch
+                            los mide una sola vez para todo el lote)
+            
+        Returns:
+            Tupla (success: bool, job_id o mensaje de error: str)
+        """
+        automation = self.get_automation_by_id(automation_id)
+        if not automation:
+            return False, f"Automatización {automation_id} no encontrada"
+        
+        valid, argv = self.build_arguments(automation, inputs)
+        if not valid:
+            return False, argv
+        
+        if priority is None:
+            priority = "batch" if batch_id else (automation["priority"] or "interactive")
+        
+        job = {
+            "id": uuid.uuid4().hex[:12],
+            "automation_id": automation_id,
+            "inputs": dict(inputs),
+            "run_file": automation["run_file"],
+            "cwd": automation["folder"],
+            "argv": argv,
+            "max_concurrency": automation.get("max_concurrency"),
+            "executor": automation["executor"],
+            "python": None,
+            "stdin_data": None,
+            "env": self.job_environment(),
+            "interpreter_flags": automation["interpreter_flags"],
+            "timeout_seconds": automation["timeout_seconds"],
+            "retry": automation["retry"],
+            "limits": automation["limits"],
+            "expected_memory_mb": automation["expected_memory_mb"],
+            "hang_seconds": automation["hang_seconds"],
+            "hang_action": automation["hang_action"],
+            "stack_dump": automation["hang_action"] == "kill" and automation["executor"] in STACK_DUMP_EXECUTORS,
+            "log_file": None,
+            "batch_ids": [batch_id] if batch_id else [],
+            "priority": priority_value(priority),
+            "status": "queued",
+            "exit_code": None,
+            "queued_at": None,
+            "started_at": None,
+            "finished_at": None
+        }
+        
+        if automation["arguments"] == "json":
+            job["stdin_data"] = self.input_document(automation, job["id"], inputs)
+        
+        holds = []
+        if automation["cache"]:
+            # La huella se calcula en segundo plano; hasta entonces el trabajo espera en la cola
+            holds.append(CACHE_HOLD)
+        environment = automation["environment"]
+        if environment:
+            job["python"] = self.environments.interpreter(environment)
+            if job["python"] is None:
+                # Espera en la cola, sin ocupar un worker, a que se cree su entorno
+                holds.append(ENVIRONMENT_HOLD)
+        if holds:
+            job["holds"] = holds
+            job["held"] = holds[0]
+        
+        if automation["coalesce"]:
+            job["dedup_key"] = self.dedup_key(automation, inputs)
+        
+        # El tamaño se mide en segundo plano; hasta entonces la cola se ordena con
+        # el de la última ejecución con los mismos inputs (si no la hay, sin estimación)
+        job["input_bytes"] = job["input_files"] = 0
+        job["input_measured"] = False
+        job["predicted_seconds"] = None
+        known = self.known_input_sizes.get(self.input_size_key(automation, inputs))
+        if known and self.runtime_predictor.has_model(automation_id):
+            job["predicted_seconds"] = self.runtime_predictor.predict(automation_id, *known)
+        
+        job_id = self.scheduler.submit(job)
+        if job_id == job["id"] and measure_inputs and CACHE_HOLD not in holds:
+            # Con caché, el tamaño sale del mismo recorrido que la huella
+            self.inspector.submit(
+                input_size, (automation, dict(inputs)),
+                lambda result, error: self._on_inputs_measured(job_id, result, error)
+            )
+        if job_id == job["id"] and ENVIRONMENT_HOLD in holds:
+            self.environment_jobs.setdefault(environment["key"], []).append(job_id)
+            self.environments.prepare(environment)
+        if job_id == job["id"] and CACHE_HOLD in holds:
+            self.inspector.submit(
+                self._inspect_cache, (automation, dict(inputs)),
+                lambda result, error: self._on_cache_inspected(job_id, result, error)
+            )
+        if job_id != job["id"]:
+            # Petición idéntica a un trabajo activo: se comparte su resultado
+            shared = self.get_job(job_id)
+            if batch_id:
+                shared["batch_ids"].append(batch_id)
+            else:
+                print(f"🔗 {automation_id}: petición unida al trabajo {job_id} ({shared['requests']} solicitantes)")
+            return True, job_id
+        
+        if not batch_id:
+            arguments = "inputs JSON por stdin" if automation["arguments"] == "json" else " ".join(argv)
+            print(f"📥 Encolando {automation_id} (job {job['id']}): {arguments}")
+        return True, job_id
+    
+    def job_environment(self) -> Dict[str, str]:
+        """Variables de entorno que se añaden a los procesos de los trabajos"""
+        environment = {}
+        if Settings.UNBUFFERED_OUTPUT:
+            environment["PYTHONUNBUFFERED"] = "1"
+        if self.pycache_dir:
+            # Con prefijo no se usan los __pycache__ de la biblioteca estándar: si los
+            # hijos no pudieran escribir en la caché, la recompilarían en cada arranque
+            environment["PYTHONPYCACHEPREFIX"] = self.pycache_dir
+            environment["PYTHONDONTWRITEBYTECODE"] = ""
+        return environment
+    
+    @staticmethod
+    def dedup_key(automation: Dict, inputs: Dict[str, str]) -> str:
+        """
+        Clave que identifica peticiones equivalentes: automatización e inputs normalizados
+        
+        Args:
+            automation: Información de la automatización
+            inputs: Diccionario {input_id: path}
+        """
+        normalized = []
+        for input_config in automation["inputs"]:
+            value = inputs.get(input_config["id"], "").strip()
+            if value:
+                value = os.path.normcase(os.path.abspath(value))
+            normalized.append([input_config["id"], value])
+        return json.dumps([automation["id"], normalized])
+    
+    @staticmethod
+    def input_size_key(automation: Dict, inputs: Dict[str, str]) -> str:
+        """Clave de los inputs que se miden (sin los de salida) para recordar su tamaño"""
+        normalized = []
+        for input_config in automation["inputs"]:
+            value = inputs.get(input_config["id"], "").strip()
+            if value and input_config.get("role") != "output":
+                normalized.append([input_config["id"], os.path.normcase(os.path.abspath(value))])
+        return json.dumps([automation["id"], normalized])
+    
+    def start_batch(self, automation_id: str, inputs: Dict[str, str], input_id: str, paths: List[str],
+                    priority=None) -> tuple:
+        """
+        Ejecuta la automatización una vez por archivo del lote, en paralelo
+        
+        Cada trabajo recibe uno de los archivos en el input indicado y, en los
+        inputs de salida ("role": "output"), una subcarpeta propia con el
+        nombre del archivo.
+        
+        Args:
+            automation_id: ID de la automatización a ejecutar
+            inputs: Valores comunes a todos los trabajos {input_id: path}
+            input_id: Input que recibe cada archivo del lote
+            paths: Archivos del lote
+            priority: Prioridad de los trabajos (por defecto "batch")
+            
+        Returns:
+            Tupla (success: bool, batch_id o mensaje de error: str)
+        """
+        automation = self.get_automation_by_id(automation_id)
+        if not automation:
+            return False, f"Automatización {automation_id} no encontrada"
+        if not paths:
+            return False, "El lote no contiene archivos"
+        
+        output_ids = [
+            input_config["id"] for input_config in automation["inputs"]
+            if input_config.get("role") == "output" and inputs.get(input_config["id"])
+        ]
+        
+        batch = {
+            "id": uuid.uuid4().hex[:12],
+            "automation_id": automation_id,
+            "input_id": input_id,
+            "job_ids": [],
+            "total": len(paths),
+            "succeeded": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "errors": [],
+            "started_at": time.time(),
+            "finished_at": None
+        }
+        self.batches[batch["id"]] = batch
+        
+        # Con caché, cada trabajo se mide al calcular su huella
+        measure_batch = not automation["cache"]
+        measured_jobs = {}
+        used_names = set()
+        for path in paths:
+            job_inputs = dict(inputs)
+            job_inputs[input_id] = path
+            
+            # Subcarpeta de salida por archivo, sin colisiones entre nombres repetidos
+            name = Path(path).stem or "item"
+            candidate, suffix = name, 2
+            while candidate in used_names:
+                candidate, suffix = f"{name}_{suffix}", suffix + 1
+            used_names.add(candidate)
+            for output_id in output_ids:
+                job_inputs[output_id] = os.path.join(inputs[output_id], candidate)
+                os.makedirs(job_inputs[output_id], exist_ok=True)
+            
+            success, result = self.start_automation(
+                automation_id, job_inputs, batch_id=batch["id"], priority=priority,
+                measure_inputs=not measure_batch
+            )
+            if success:
+                batch["job_ids"].append(result)
+                job = self.get_job(result)
+                if job["batch_ids"][:1] == [batch["id"]] and result not in measured_jobs:
+                    # Unido a un trabajo de fuera del lote: ese ya mide sus inputs
+                    measured_jobs[result] = path
+            else:
+                batch["failed"] += 1
+                batch["errors"].append(f"{path}: {result}")
+        
+        if measure_batch and measured_jobs:
+            job_ids = list(measured_jobs)
+            self.inspector.submit(
+                batch_input_sizes, (automation, dict(inputs), input_id, list(measured_jobs.values())),
+                lambda result, error: self._on_batch_measured(job_ids, result, error)
+            )
+        
+        print(f"📥 Lote {batch['id']}: {len(batch['job_ids'])} trabajos de {automation_id} encolados")
+        self._update_batch(batch)
+        return True, batch["id"]
+    
+    def get_batch(self, batch_id: str) -> Optional[Dict]:
+        """
+        Obtiene el estado de un lote (total, succeeded, failed, cancelled, tiempos)
+        """
+        return self.batches.get(batch_id)
+    
+    def get_active_batch(self, automation_id: str) -> Optional[Dict]:
+        """
+        Retorna el lote más reciente sin terminar de una automatización
+        """
+        active = [
+            batch for batch in self.batches.values()
+            if batch["automation_id"] == automation_id and batch["finished_at"] is None
+        ]
+        return max(active, key=lambda batch: batch["started_at"]) if active else None
+    
+    def cancel_batch(self, batch_id: str) -> int:
+        """
+        Cancela los trabajos pendientes y en ejecución de un lote
+        
+        Returns:
+            Número de trabajos cancelados
+        """
+        batch = self.batches.get(batch_id)
+        if not batch:
+            return 0
+        # Primero los de la cola, para que no ocupen los workers que se liberan
+        jobs = [self.get_job(job_id) for job_id in batch["job_ids"]]
+        queued = [job["id"] for job in jobs if job and job["status"] == "queued"]
+        running = [job["id"] for job in jobs if job and job["status"] in ("running", "suspended")]
+        return sum(1 for job_id in queued + running if self.scheduler.cancel(job_id))
+    
+    @staticmethod
+    def batch_summary(batch: Dict) -> str:
+        """
+        Resumen legible de un lote: resultados, tiempo total y rendimiento
+        """
+        elapsed = max((batch["finished_at"] or time.time()) - batch["started_at"], 1e-6)
+        done = batch["succeeded"] + batch["failed"] + batch["cancelled"]
+        summary = f"✅ {batch['succeeded']} correctos · ❌ {batch['failed']} con error"
+        if batch["cancelled"]:
+            summary += f" · ⏹️ {batch['cancelled']} cancelados"
+        summary += f" · {done}/{batch['total']} en {elapsed:.1f} s ({done / elapsed:.2f} trabajos/s)"
+        return summary
+    
+    def _update_batch(self, batch: Dict):
+        """Marca el lote como terminado cuando no le quedan trabajos"""
+        done = batch["succeeded"] + batch["failed"] + batch["cancelled"]
+        if done >= batch["total"] and batch["finished_at"] is None:
+            batch["finished_at"] = time.time()
+            print(f"📦 Lote {batch['id']} terminado: {self.batch_summary(batch)}")
+    
+    def cancel(self, job_id: str) -> bool:
+        """
+        Detiene un trabajo en cola o en ejecución
+        
+        El proceso y sus descendientes reciben SIGTERM y, pasados
+        Settings.CANCEL_GRACE_SECONDS, SIGKILL. El worker se libera al momento.
+        
+        Args:
+            job_id: ID del trabajo
+            
+        Returns:
+            True si el trabajo estaba activo y se canceló
+        """
+        return self.scheduler.cancel(job_id)
+    
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """
+        Obtiene un trabajo (en cola, en ejecución o terminado) por su ID
+        """
+        return self.scheduler.get_job(job_id)
+    
+    def get_jobs(self, status: Optional[str] = None) -> List[Dict]:
+        """
+        Lista los trabajos conocidos por el planificador
+        
+        Args:
+            status: Filtra por estado (queued, running, suspended, finished, failed, cancelled)
+        """
+        return self.scheduler.get_jobs(status)
+    
+    def get_queued_jobs(self) -> List[Dict]:
+        """
+        Retorna los trabajos que esperan un worker libre
+        """
+        return self.scheduler.get_jobs("queued")
+    
+    def get_running_jobs(self) -> List[Dict]:
+        """
+        Retorna los trabajos en ejecución
+        """
+        return self.scheduler.get_jobs("running")
+    
+    def get_finished_jobs(self) -> List[Dict]:
+        """
+        Retorna el historial reciente de trabajos terminados (con éxito, con error o cancelados)
+        """
+        return [job for job in self.scheduler.get_jobs() if job["status"] in ("finished", "failed", "cancelled")]
+    
+    def set_max_workers(self, max_workers: int):
+        """
+        Cambia el número máximo de trabajos simultáneos
+        """
+        self.scheduler.set_max_workers(max_workers)
+    
+    def get_active_jobs(self, automation_id: str) -> List[Dict]:
+        """
+        Retorna los trabajos en cola o en ejecución de una automatización
+        """
+        return [
+            job for job in self.scheduler.get_jobs()
+            if job["automation_id"] == automation_id and job["status"] in ("queued", "running", "suspended")
+        ]
+    
+    def is_automation_running(self, automation_id: str) -> bool:
+        """
+        Indica si la automatización tiene algún trabajo en cola o en ejecución
+        """
+        return bool(self.get_active_jobs(automation_id))
+    
+    def clear_result_cache(self, automation_id: Optional[str] = None):
+        """
+        Descarta los resultados en caché de una automatización (o de todas)
+        """
+        self.result_cache.invalidate(automation_id)
+    
+    @staticmethod
+    def _cache_options(value) -> Optional[Dict]:
+        """Normaliza la clave "cache" de ui_config.json (true o {"content_hash": bool})"""
+        if not value:
+            return None
+        if isinstance(value, dict):
+            return {"content_hash": bool(value.get("content_hash", False))}
+        return {"content_hash": False}
+    
+    @staticmethod
+    def _retry_options(value) -> Optional[Dict]:
+        """
+        Normaliza la clave "retry" de ui_config.json
+        
+        Acepta true, un número de intentos o {"max_attempts", "backoff_seconds",
+        "max_backoff_seconds", "jitter", "exit_codes"}; sin "exit_codes" se
+        reintenta cualquier código distinto de 0.
+        
+        Returns:
+            Política de reintentos o None si no hay que reintentar
+        """
+        if not value:
+            return None
+        if not isinstance(value, dict):
+            value = {} if value is True else {"max_attempts": value}
+        options = {
+            "max_attempts": int(value.get("max_attempts", Settings.RETRY_MAX_ATTEMPTS)),
+            "backoff_seconds": max(0.0, float(value.get("backoff_seconds", Settings.RETRY_BACKOFF_SECONDS))),
+            "max_backoff_seconds": float(value.get("max_backoff_seconds", Settings.RETRY_MAX_BACKOFF_SECONDS)),
+            "jitter": min(1.0, max(0.0, float(value.get("jitter", Settings.RETRY_JITTER)))),
+            "exit_codes": [int(code) for code in value.get("exit_codes") or []]
+        }
+        return options if options["max_attempts"] > 1 else None
+    
+    def _output_signatures(self, automation: Dict, inputs: Dict[str, str]) -> Dict[str, str]:
+        """Firma actual de los inputs de salida ("role": "output" en ui_config.json); recorre carpetas"""
+        signatures = {}
+        for input_config in automation["inputs"]:
+            value = inputs.get(input_config["id"], "").strip()
+            if value and input_config.get("role") == "output":
+                signatures[input_config["id"]] = self.fingerprinter.path_signature(os.path.abspath(value))
+        return signatures
+    
+    @staticmethod
+    def job_duration(job: Dict) -> float:
+        """Segundos de ejecución del trabajo hasta ahora (o en total), sin contar las pausas"""
+        if not job.get("started_at"):
+            return 0.0
+        end = job["finished_at"] or job.get("suspended_at") or time.time()
+        return max(0.0, end - job["started_at"] - job.get("suspended_seconds", 0))
+    
+    def estimate_remaining(self, job_id: str) -> Optional[float]:
+        """
+        Segundos que previsiblemente le quedan a un trabajo activo
+        
+        Returns:
+            Estimación (0 si ya superó la duración prevista) o None si no hay predicción
+        """
+        job = self.get_job(job_id)
+        if not job or job.get("predicted_seconds") is None or job["status"] not in ("queued", "running", "suspended"):
+            return None
+        return max(0.0, job["predicted_seconds"] - self.job_duration(job))
+    
+    def batch_eta(self, batch: Dict) -> Optional[float]:
+        """
+        Segundos que previsiblemente le quedan a un lote, repartiendo sus trabajos entre los workers
+        
+        Returns:
+            Estimación o None si algún trabajo pendiente no tiene predicción
+        """
+        remaining = []
+        for job_id in batch["job_ids"]:
+            job = self.get_job(job_id)
+            if job and job["status"] in ("queued", "running", "suspended"):
+                estimate = self.estimate_remaining(job_id)
+                if estimate is None:
+                    return None
+                remaining.append(estimate)
+        if not remaining:
+            return 0.0
+        return max(max(remaining), sum(remaining) / self.scheduler.max_workers)
+    
+    def get_output_tail(self, job_id: str) -> str:
+        """
+        Retorna el final de la salida de un trabajo (la salida completa está en job["log_file"])
+        """
+        job = self.get_job(job_id)
+        if not job:
+            return ""
+        return self.output.tail(job_id, job.get("log_file"))
+    
+    def add_schedule(self, automation_id: str, cron: str, inputs: Dict[str, str], misfire: Optional[str] = None,
+                     jitter_seconds: Optional[float] = None) -> tuple:
+        """
+        Programa una automatización para que se ejecute sola con unos inputs fijos
+        
+        Args:
+            automation_id: ID de la automatización
+            cron: Expresión cron de cinco campos o macro (@daily, @hourly...)
+            inputs: Inputs de cada ejecución {input_id: path}
+            misfire: "catch_up" o "skip" (por defecto Settings.SCHEDULE_MISFIRE_POLICY)
+            jitter_seconds: Retraso aleatorio máximo (por defecto Settings.SCHEDULE_JITTER_SECONDS)
+            
+        Returns:
+            Tupla (success: bool, schedule_id o mensaje de error: str)
+        """
+        if self.cron is None:
+            return False, "Las programaciones están desactivadas (Settings.SCHEDULES_ENABLED)"
+        automation = self.get_automation_by_id(automation_id)
+        if not automation:
+            return False, f"Automatización {automation_id} no encontrada"
+        valid, message = self.build_arguments(automation, inputs)
+        if not valid:
+            return False, message
+        if misfire is not None and misfire not in MISFIRE_POLICIES:
+            return False, f"Política de ejecuciones perdidas desconocida: {misfire}"
+        try:
+            CronExpression(cron)
+        except ValueError as e:
+            return False, str(e)
+        
+        schedule_id = self.cron.add_schedule(automation_id, cron, inputs, misfire, jitter_seconds)
+        print(f"⏰ {automation_id} programada ({cron}), programación {schedule_id}")
+        return True, schedule_id
+    
+    def remove_schedule(self, schedule_id: str) -> bool:
+        """Elimina una programación"""
+        return self.cron is not None and self.cron.remove_schedule(schedule_id)
+    
+    def get_schedules(self, automation_id: Optional[str] = None) -> List[Dict]:
+        """Programaciones (opcionalmente de una automatización), por próxima ejecución"""
+        return self.cron.get_schedules(automation_id) if self.cron else []
+    
+    def _on_schedule_due(self, schedule_id: str, catch_up: bool):
+        schedule = self.cron.get_schedule(schedule_id)
+        success, result = self.start_automation(schedule["automation_id"], schedule["inputs"], priority="scheduled")
+        if not success:
+            print(f"❌ Programación {schedule_id} ({schedule['automation_id']}): {result}")
+            return
+        job = self.get_job(result)
+        if job:
+            job.setdefault("schedule_id", schedule_id)
+    
+    def _inspect_cache(self, automation: Dict, inputs: Dict[str, str]) -> tuple:
+        """Huella de la ejecución, firma de sus salidas y tamaño de sus inputs (en un hilo del inspector)"""
+        totals = [0, 0]
+        fingerprint = self.fingerprinter.fingerprint(automation, inputs, automation["cache"]["content_hash"], totals)
+        return fingerprint, self._output_signatures(automation, inputs), tuple(totals)
+    
+    def _on_cache_inspected(self, job_id: str, result: Optional[tuple], error: Optional[Exception]):
+        self._on_inputs_measured(job_id, result[2] if result else None, error)
+        job = self.get_job(job_id)
+        if not job or job["status"] != "queued":
+            # Cancelado mientras se calculaba la huella
+            return
+        if error is not None:
+            print(f"⚠️  {job['automation_id']} (job {job_id}): no se pudo comprobar la caché: {error}")
+            self._release_hold(job, CACHE_HOLD)
+            return
+        
+        job["fingerprint"], output_signatures, _ = result
+        entry = self.result_cache.lookup(job["fingerprint"], output_signatures)
+        if not entry:
+            self._release_hold(job, CACHE_HOLD)
+            return
+        job["cached"] = True
+        job["log_file"] = entry["log_file"]
+        print(f"♻️  {job['automation_id']} (job {job_id}): resultado en caché, no se vuelve a ejecutar")
+        output = "♻️  Inputs sin cambios: se muestra el resultado de una ejecución anterior\n"
+        output += read_tail(entry["log_file"], Settings.OUTPUT_TAIL_BYTES)
+        self.scheduler.complete(job, entry["exit_code"], output)
+    
+    def _on_inputs_measured(self, job_id: str, result: Optional[tuple], error: Optional[Exception]):
+        job = self.get_job(job_id)
+        if not job:
+            return
+        if error is not None:
+            print(f"⚠️  {job['automation_id']} (job {job_id}): no se pudo medir el tamaño de los inputs: {error}")
+            job.pop("observe_pending", None)
+            return
+        
+        job["input_bytes"], job["input_files"] = result
+        job["input_measured"] = True
+        automation = self.get_automation_by_id(job["automation_id"])
+        if automation:
+            key = self.input_size_key(automation, job["inputs"])
+            self.known_input_sizes.pop(key, None)
+            self.known_input_sizes[key] = result
+            while len(self.known_input_sizes) > KNOWN_INPUT_SIZES:
+                self.known_input_sizes.popitem(last=False)
+        if job["status"] in ("queued", "running", "suspended"):
+            # Con SHORTEST_JOB_FIRST, el siguiente reparto ya usa la predicción corregida
+            job["predicted_seconds"] = self.runtime_predictor.predict(
+                job["automation_id"], job["input_bytes"], job["input_files"]
+            )
+        if job.pop("observe_pending", False):
+            self._observe_runtime(job)
+    
+    def _on_batch_measured(self, job_ids: List[str], result: Optional[List[tuple]], error: Optional[Exception]):
+        if error is not None:
+            print(f"⚠️  No se pudo medir el tamaño de los inputs del lote: {error}")
+            for job_id in job_ids:
+                job = self.get_job(job_id)
+                if job:
+                    job.pop("observe_pending", None)
+            return
+        for job_id, size in zip(job_ids, result):
+            self._on_inputs_measured(job_id, size, None)
+    
+    def _observe_runtime(self, job: Dict):
+        """Registra la duración de un trabajo terminado; si sus inputs aún se miden, al acabar la medición"""
+        if not job["input_measured"]:
+            job["observe_pending"] = True
+            return
+        self.runtime_predictor.observe(
+            job["automation_id"], job["input_bytes"], job["input_files"], self.job_duration(job)
+        )
+    
+    def _release_hold(self, job: Dict, reason: str):
+        """Quita un motivo de espera; sin motivos pendientes, el trabajo ya se puede lanzar"""
+        holds = job.get("holds", [])
+        if reason in holds:
+            holds.remove(reason)
+        if holds:
+            job["held"] = holds[0]
+        else:
+            self.scheduler.release(job["id"])
+    
+    def _store_result(self, job: Dict, exit_code: int, output_signatures: Optional[Dict[str, str]],
+                      error: Optional[Exception]):
+        if error is not None:
+            print(f"⚠️  No se pudo guardar el resultado de {job['automation_id']} en caché: {error}")
+            return
+        self.result_cache.store(
+            job["fingerprint"], job["automation_id"], exit_code, job.get("log_file"), output_signatures
+        )
+    
+    def _on_environment_ready(self, key: str, python: str):
+        for job_id in self.environment_jobs.pop(key, []):
+            job = self.get_job(job_id)
+            if job and job["status"] == "queued":
+                job["python"] = python
+                self._release_hold(job, ENVIRONMENT_HOLD)
+    
+    def _on_environment_failed(self, key: str, error: str):
+        for job_id in self.environment_jobs.pop(key, []):
+            self.scheduler.reject(job_id, f"❌ No se pudo crear el entorno de la automatización: {error}\n")
+    
+    def _on_job_started(self, job_id: str):
+        job = self.get_job(job_id)
+        if job and not job.get("log_file"):
+            job["log_file"] = self.output.open(job)
+    
+    def _on_job_output(self, job_id: str, text: str):
+        job = self.get_job(job_id)
+        if not job or job["status"] not in ("running", "suspended"):
+            return
+        if not job.get("log_file"):
+            # La salida puede adelantarse a jobStarted (zygote)
+            job["log_file"] = self.output.open(job)
+        self.output.write(job_id, text)
+    
+    def _on_job_finished(self, job_id: str, exit_code: int):
+        self.output.close(job_id)
+        job = self.get_job(job_id)
+        if not job:
+            return
+        
+        batches = [self.batches[batch_id] for batch_id in job.get("batch_ids", []) if batch_id in self.batches]
+        for batch in batches:
+            if job["status"] == "cancelled":
+                batch["cancelled"] += 1
+            elif job["status"] == "finished":
+                batch["succeeded"] += 1
+            else:
+                batch["failed"] += 1
+            self._update_batch(batch)
+        
+        if job.get("fingerprint") and not job.get("cached") and job["status"] == "finished":
+            automation = self.get_automation_by_id(job["automation_id"])
+            if automation:
+                # Las salidas se firman en segundo plano: pueden ser carpetas grandes
+                self.inspector.submit(
+                    self._output_signatures, (automation, job["inputs"]),
+                    lambda signatures, error: self._store_result(job, exit_code, signatures, error)
+                )
+        
+        if job["status"] == "finished" and not job.get("cached") and job.get("started_at"):
+            self._observe_runtime(job)
+        
+        # Los lotes informan de su resultado agregado en _update_batch
+        if job.get("cached") or (batches and job["status"] == "finished"):
+            return
+        if job["status"] == "cancelled":
+            print(f"⏹️  Automatización {job['automation_id']} cancelada (job {job_id})")
+        elif exit_code == 0:
+            print(f"✅ Automatización {job['automation_id']} ejecutada exitosamente")
+        else:
+            print(f"❌ Error ejecutando automatización {job['automation_id']} (código {exit_code})")
+    
     def validate_input_path(self, input_config: Dict, path: str) -> tuple:
         """
         Valida que un path sea válido según la configuración del input
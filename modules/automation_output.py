@@ -0,0 +1,190 @@
+"""
+Automation Output
+Registro en disco de la salida de cada trabajo y cola en memoria de tamaño fijo
+"""
+
+import os
+from collections import deque
+from typing import Dict, Optional
+
+
+class OutputTail:
+    """Últimos max_bytes bytes (en UTF-8) de la salida de un trabajo"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.chunks = deque()  # (texto, bytes)
+        self.size = 0
+
+    def append(self, text: str):
+        size = _encoded_size(text)
+        if size >= self.max_bytes:
+            self.chunks.clear()
+            self.size = 0
+            text = _drop_bytes(text, size - self.max_bytes)
+            size = _encoded_size(text)
+
+        self.chunks.append((text, size))
+        self.size += size
+        while self.size > self.max_bytes:
+            excess = self.size - self.max_bytes
+            first, first_size = self.chunks[0]
+            if first_size <= excess:
+                self.chunks.popleft()
+                self.size -= first_size
+            else:
+                trimmed = _drop_bytes(first, excess)
+                trimmed_size = _encoded_size(trimmed)
+                self.chunks[0] = (trimmed, trimmed_size)
+                self.size -= first_size - trimmed_size
+
+    def text(self) -> str:
+        return "".join(text for text, _ in self.chunks)
+
+
+def _encoded_size(text: str) -> int:
+    """Bytes que ocupa text en UTF-8"""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def _drop_bytes(text: str, count: int) -> str:
+    """Quita los primeros count bytes de text sin partir un carácter"""
+    if text.isascii():
+        return text[count:]
+    # Un carácter cortado por la mitad se descarta entero
+    return text.encode("utf-8")[count:].decode("utf-8", errors="ignore")
+
+
+def read_tail(path: str, max_bytes: int) -> str:
+    """
+    Lee el final de un archivo de registro sin cargarlo entero
+
+    Args:
+        path: Ruta del registro
+        max_bytes: Bytes como máximo desde el final
+
+    Returns:
+        Texto leído (vacío si el archivo no existe)
+    """
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - max_bytes))
+            data = f.read()
+    except OSError:
+        return ""
+
+    text = data.decode("utf-8", errors="replace")
+    if size > max_bytes and "\n" in text:
+        # Empezar en una línea completa
+        text = text[text.index("\n") + 1:]
+    return text
+
+
+class AutomationOutputStore:
+    """
+    Salida de los trabajos: todo va a un registro por ejecución en disco y
+    solo se conserva en memoria la cola de los trabajos activos
+
+    El consumo de memoria no depende de cuánto imprima la automatización.
+    """
+
+    def __init__(self, logs_folder: str, tail_bytes: int = 64 * 1024, logs_per_automation: int = 50):
+        """
+        Inicializa el almacén
+
+        Args:
+            logs_folder: Carpeta raíz de los registros (una subcarpeta por automatización)
+            tail_bytes: Tamaño de la cola en memoria por trabajo activo
+            logs_per_automation: Registros que se conservan por automatización (0 = todos)
+        """
+        self.logs_folder = os.path.abspath(logs_folder)
+        self.tail_bytes = tail_bytes
+        self.logs_per_automation = logs_per_automation
+        self.files = {}
+        self.tails = {}
+
+    def log_path(self, automation_id: str, job_id: str) -> str:
+        """Ruta del registro de un trabajo"""
+        return os.path.join(self.logs_folder, automation_id, f"{job_id}.log")
+
+    def prepare(self, automation_id: str, job_id: str) -> str:
+        """
+        Crea la carpeta del registro y borra los más antiguos
+
+        Returns:
+            Ruta del registro del trabajo
+        """
+        path = self.log_path(automation_id, job_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._prune(os.path.dirname(path))
+        return path
+
+    def open(self, job: Dict) -> str:
+        """
+        Crea el registro del trabajo y empieza a guardar su cola
+
+        Args:
+            job: Diccionario del trabajo (id, automation_id)
+
+        Returns:
+            Ruta del registro
+        """
+        path = self.prepare(job["automation_id"], job["id"])
+        self.files[job["id"]] = open(path, "w", encoding="utf-8", errors="replace", buffering=65536)
+        self.tails[job["id"]] = OutputTail(self.tail_bytes)
+        return path
+
+    def write(self, job_id: str, text: str):
+        """Añade salida de un trabajo activo (se ignora si no está abierto)"""
+        log = self.files.get(job_id)
+        if log is None:
+            return
+        log.write(text)
+        self.tails[job_id].append(text)
+
+    def close(self, job_id: str):
+        """Cierra el registro del trabajo y libera su cola en memoria"""
+        log = self.files.pop(job_id, None)
+        self.tails.pop(job_id, None)
+        if log is not None:
+            log.close()
+
+    def tail(self, job_id: str, log_file: Optional[str] = None) -> str:
+        """
+        Final de la salida de un trabajo: desde memoria si está activo o desde su registro
+
+        Args:
+            job_id: ID del trabajo
+            log_file: Registro del trabajo, para los ya terminados
+        """
+        tail = self.tails.get(job_id)
+        if tail is not None:
+            return tail.text()
+        if log_file:
+            return read_tail(log_file, self.tail_bytes)
+        return ""
+
+    def close_all(self):
+        """Cierra los registros abiertos"""
+        for job_id in list(self.files):
+            self.close(job_id)
+
+    def _prune(self, folder: str):
+        """Borra los registros más antiguos de una automatización"""
+        if not self.logs_per_automation:
+            return
+        try:
+            logs = [entry for entry in os.scandir(folder) if entry.name.endswith(".log")]
+        except OSError:
+            return
+        # Los registros de trabajos activos no se tocan
+        active = {log.name for log in self.files.values()}
+        logs = [entry for entry in logs if entry.path not in active]
+        logs.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in logs[:max(0, len(logs) - self.logs_per_automation + 1)]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
@@ -0,0 +1,91 @@
+"""
+Automation Pipes
+Base común para ejecutores que leen la salida de los trabajos desde descriptores propios
+"""
+
+import os
+import codecs
+from typing import Dict, List
+
+from PySide6.QtCore import QObject, QSocketNotifier, Signal
+
+
+class PipeExecutorBase(QObject):
+    """
+    Lectura de stdout/stderr con QSocketNotifier y cierre ordenado del trabajo
+
+    Un trabajo termina cuando se conoce su código de salida y todos sus
+    descriptores llegaron a EOF, así no se pierde salida pendiente.
+    """
+
+    jobStarted = Signal(str)           # job_id
+    stdoutReceived = Signal(str, str)  # job_id, texto
+    stderrReceived = Signal(str, str)  # job_id, texto
+    jobFinished = Signal(str, int)     # job_id, exit_code
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.jobs = {}
+
+    def is_running(self, job_id: str) -> bool:
+        """Indica si el trabajo sigue activo"""
+        return job_id in self.jobs
+
+    def running_jobs(self) -> List[str]:
+        """Retorna los IDs de los trabajos en ejecución"""
+        return list(self.jobs.keys())
+
+    def _track_job(self, job_id: str, stdout_fd: int, stderr_fd: int) -> Dict:
+        """Registra el trabajo y empieza a leer sus descriptores"""
+        state = {
+            "pid": None,
+            "exit_code": None,
+            "streams": {}
+        }
+        self.jobs[job_id] = state
+        self._watch_stream(job_id, stdout_fd, self.stdoutReceived)
+        self._watch_stream(job_id, stderr_fd, self.stderrReceived)
+        return state
+
+    def _watch_stream(self, job_id: str, fd: int, signal):
+        notifier = QSocketNotifier(fd, QSocketNotifier.Read, self)
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.jobs[job_id]["streams"][fd] = notifier
+        notifier.activated.connect(lambda: self._read_stream(job_id, fd, decoder, signal))
+
+    def _read_stream(self, job_id: str, fd: int, decoder, signal):
+        state = self.jobs.get(job_id)
+        if state is None or fd not in state["streams"]:
+            return
+
+        try:
+            data = os.read(fd, 65536)
+        except OSError:
+            # Un pseudo-terminal da EIO en vez de EOF cuando se cierra el otro extremo
+            data = b""
+        text = decoder.decode(data, final=not data)
+        if text:
+            signal.emit(job_id, text)
+
+        if not data:
+            # EOF: el trabajo (y sus descendientes) cerraron el descriptor
+            notifier = state["streams"].pop(fd)
+            notifier.setEnabled(False)
+            notifier.deleteLater()
+            os.close(fd)
+            self._finish_if_done(job_id)
+
+    def _set_exit_code(self, job_id: str, exit_code: int):
+        state = self.jobs.get(job_id)
+        if state is not None and state["exit_code"] is None:
+            state["exit_code"] = int(exit_code)
+            self._finish_if_done(job_id)
+
+    def _finish_if_done(self, job_id: str):
+        """El trabajo termina cuando salió y su salida se leyó completa"""
+        state = self.jobs.get(job_id)
+        if state is None or state["exit_code"] is None or state["streams"]:
+            return
+
+        del self.jobs[job_id]
+        self.jobFinished.emit(job_id, state["exit_code"])
@@ -0,0 +1,259 @@
+"""
+Automation Worker Pool
+Pool de intérpretes Python precalentados que ejecutan run.py sin arrancar un proceso nuevo
+"""
+
+import os
+import sys
+import json
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QCoreApplication, QObject, QProcess, QTimer, Signal
+
+from .automation_runner import (
+    resume_process_group, suspend_process_group, terminate_process_group, use_own_process_group
+)
+
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "automation_worker.py")
+
+
+class AutomationWorkerPool(QObject):
+    """Ejecutor que reparte trabajos entre workers persistentes (automation_worker.py)"""
+
+    jobStarted = Signal(str)           # job_id
+    stdoutReceived = Signal(str, str)  # job_id, texto
+    stderrReceived = Signal(str, str)  # job_id, texto
+    jobFinished = Signal(str, int)     # job_id, exit_code
+
+    def __init__(self, size: int = 2, max_jobs_per_worker: int = 50, max_memory_mb: int = 512, parent=None):
+        """
+        Inicializa el pool (los workers se crean con prewarm o bajo demanda)
+
+        Args:
+            size: Workers ociosos que se mantienen calientes
+            max_jobs_per_worker: Trabajos tras los cuales se recicla un worker
+            max_memory_mb: Memoria residente a partir de la cual se recicla un worker
+        """
+        super().__init__(parent)
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.max_memory_mb = max_memory_mb
+        self.workers = []
+        self.job_workers = {}
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def prewarm(self, count: Optional[int] = None):
+        """Arranca workers hasta tener count (por defecto size) disponibles"""
+        count = self.size if count is None else count
+        available = [w for w in self.workers if w["job"] is None and not w["retiring"]]
+        for _ in range(count - len(available)):
+            self._spawn_worker()
+
+    def start(self, job: Dict):
+        """
+        Asigna el trabajo a un worker libre, arrancando uno si no hay
+
+        Args:
+            job: Diccionario del trabajo (id, run_file, argv, cwd)
+        """
+        worker = self._idle_worker()
+        if worker is None:
+            worker = self._spawn_worker()
+
+        worker["job"] = job
+        self.job_workers[job["id"]] = worker
+        if worker["ready"]:
+            self._send_job(worker)
+
+    def cancel(self, job_id: str, grace_ms: int) -> bool:
+        """
+        Cancela un trabajo terminando el worker que lo ejecuta (se repone otro)
+
+        Args:
+            job_id: ID del trabajo
+            grace_ms: Milisegundos entre SIGTERM y SIGKILL
+
+        Returns:
+            True si el trabajo estaba asignado a un worker
+        """
+        worker = self.job_workers.get(job_id)
+        if worker is None:
+            return False
+        if worker.get("cancelled"):
+            return True
+
+        # El trabajo sigue asignado (is_running, running_jobs) hasta que el
+        # worker muere de verdad: entonces se notifica su fin
+        worker["cancelled"] = True
+        worker["retiring"] = True
+        process = worker["process"]
+        if not terminate_process_group(process.processId(), grace_ms):
+            process.terminate()
+            QTimer.singleShot(grace_ms, process.kill)
+        self.prewarm()
+        return True
+
+    def suspend(self, job_id: str) -> bool:
+        """Detiene (SIGSTOP) el worker que ejecuta el trabajo"""
+        worker = self.job_workers.get(job_id)
+        return worker is not None and suspend_process_group(worker["process"].processId())
+
+    def resume(self, job_id: str) -> bool:
+        """Reanuda (SIGCONT) el worker que ejecuta el trabajo"""
+        worker = self.job_workers.get(job_id)
+        return worker is not None and resume_process_group(worker["process"].processId())
+
+    def process_id(self, job_id: str) -> Optional[int]:
+        """pid del worker que ejecuta el trabajo"""
+        worker = self.job_workers.get(job_id)
+        if worker is None:
+            return None
+        return worker["process"].processId() or None
+
+    def is_running(self, job_id: str) -> bool:
+        """Indica si el trabajo está asignado a un worker"""
+        return job_id in self.job_workers
+
+    def running_jobs(self) -> List[str]:
+        """Retorna los IDs de los trabajos en ejecución"""
+        return list(self.job_workers.keys())
+
+    def shutdown(self, timeout_ms: int = 1000):
+        """Cierra todos los workers, matándolos si no terminan a tiempo"""
+        for worker in list(self.workers):
+            self._retire(worker)
+        for worker in list(self.workers):
+            process = worker["process"]
+            if not process.waitForFinished(timeout_ms):
+                process.kill()
+                process.waitForFinished(timeout_ms)
+
+    def _idle_worker(self) -> Optional[Dict]:
+        candidates = [w for w in self.workers if w["job"] is None and not w["retiring"]]
+        # Preferir workers ya listos frente a los que aún están arrancando
+        candidates.sort(key=lambda w: not w["ready"])
+        return candidates[0] if candidates else None
+
+    def _spawn_worker(self) -> Dict:
+        process = QProcess(self)
+        process.setProgram(sys.executable)
+        process.setArguments([WORKER_SCRIPT])
+        # Carpeta fija mientras espera; cada trabajo se ejecuta en la suya (job["cwd"])
+        process.setWorkingDirectory(os.path.dirname(WORKER_SCRIPT))
+        use_own_process_group(process)
+
+        worker = {
+            "process": process,
+            "pid": None,
+            "ready": False,
+            "retiring": False,
+            "job": None,
+            "jobs_done": 0,
+            "buffer": b""
+        }
+
+        process.readyReadStandardOutput.connect(lambda: self._read_channel(worker))
+        process.readyReadStandardError.connect(lambda: self._read_stderr(worker))
+        process.finished.connect(lambda exit_code, exit_status: self._on_worker_exit(worker))
+        process.errorOccurred.connect(lambda error: self._on_worker_error(worker, error))
+
+        self.workers.append(worker)
+        process.start()
+        return worker
+
+    def _send_job(self, worker: Dict):
+        job = worker["job"]
+        request = {
+            "job": job["id"],
+            "run_file": job["run_file"],
+            "argv": list(job["argv"]),
+            "cwd": job["cwd"]
+        }
+        if job.get("stdin_data") is not None:
+            request["stdin"] = job["stdin_data"]
+        if job.get("env"):
+            request["env"] = job["env"]
+        worker["process"].write((json.dumps(request) + "\n").encode("utf-8"))
+        self.jobStarted.emit(job["id"])
+
+    def _read_channel(self, worker: Dict):
+        worker["buffer"] += worker["process"].readAllStandardOutput().data()
+        *lines, worker["buffer"] = worker["buffer"].split(b"\n")
+
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            self._handle_message(worker, message)
+
+    def _handle_message(self, worker: Dict, message: Dict):
+        event = message.get("event")
+
+        if event == "ready":
+            worker["ready"] = True
+            worker["pid"] = message.get("pid")
+            if worker["job"] is not None:
+                self._send_job(worker)
+            return
+
+        job = worker["job"]
+        if job is None or message.get("job") != job["id"]:
+            return
+
+        if event == "stdout":
+            self.stdoutReceived.emit(job["id"], message["data"])
+        elif event == "stderr":
+            self.stderrReceived.emit(job["id"], message["data"])
+        elif event == "exit":
+            worker["job"] = None
+            worker["jobs_done"] += 1
+            self.job_workers.pop(job["id"], None)
+
+            # Reciclar el worker si ya ejecutó muchos trabajos o creció demasiado
+            if (worker["jobs_done"] >= self.max_jobs_per_worker
+                    or message.get("rss_mb", 0) > self.max_memory_mb):
+                self._retire(worker)
+                self.prewarm()
+
+            self.jobFinished.emit(job["id"], int(message.get("code", 1)))
+
+    def _read_stderr(self, worker: Dict):
+        # Escrituras directas a los descriptores 1/2 del worker
+        text = worker["process"].readAllStandardError().data().decode("utf-8", errors="replace")
+        if not text:
+            return
+        if worker["job"] is not None:
+            self.stderrReceived.emit(worker["job"]["id"], text)
+        else:
+            print(f"⚠️  Worker {worker['pid']}: {text}", end="")
+
+    def _retire(self, worker: Dict):
+        """Cierra el stdin del worker para que termine tras su trabajo actual"""
+        worker["retiring"] = True
+        if worker["process"].state() != QProcess.NotRunning:
+            worker["process"].closeWriteChannel()
+
+    def _on_worker_exit(self, worker: Dict):
+        if worker in self.workers:
+            self.workers.remove(worker)
+        worker["process"].deleteLater()
+
+        job = worker["job"]
+        if job is not None:
+            # El worker murió en mitad del trabajo
+            worker["job"] = None
+            self.job_workers.pop(job["id"], None)
+            if not worker.get("cancelled"):
+                self.stderrReceived.emit(job["id"], "❌ El worker del pool terminó inesperadamente\n")
+            self.jobFinished.emit(job["id"], -1)
+
+    def _on_worker_error(self, worker: Dict, error):
+        if error == QProcess.FailedToStart:
+            self._on_worker_exit(worker)
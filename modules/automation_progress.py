@@ -0,0 +1,207 @@
+"""
+Automation Progress
+Protocolo de progreso entre run.py y la aplicación: líneas JSON con un prefijo en stdout
+"""
+
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+# Una línea de stdout que empieza por este prefijo es un aviso de progreso, no salida:
+#   @@progress {"progress": 120, "total": 500, "stage": "Comprimiendo", "message": "fotos/a.jpg"}
+PROGRESS_PREFIX = "@@progress "
+
+PROGRESS_FIELDS = ("progress", "total", "stage", "message")
+
+# Peso de la última medida en la media móvil de la velocidad
+RATE_SMOOTHING = 0.3
+
+
+def parse_progress(line: str) -> Optional[Dict]:
+    """
+    Interpreta una línea del protocolo de progreso
+
+    Args:
+        line: Línea completa, con el prefijo
+
+    Returns:
+        Campos reconocidos (progress, total, stage, message) o None si no es válida
+    """
+    try:
+        data = json.loads(line[len(PROGRESS_PREFIX):])
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    update = {}
+    for key in ("progress", "total"):
+        value = data.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            update[key] = value
+    for key in ("stage", "message"):
+        if data.get(key) is not None:
+            update[key] = str(data[key])
+    return update or None
+
+
+class ProgressParser:
+    """
+    Separa incrementalmente las líneas de progreso del resto de la salida de un trabajo
+
+    Los fragmentos pueden cortar una línea por cualquier sitio: solo se retiene
+    el final de un fragmento que podría ser el comienzo de una línea de progreso.
+    """
+
+    def __init__(self):
+        self.pending = ""
+        self.at_line_start = True
+
+    def feed(self, text: str) -> Tuple[str, List[Dict]]:
+        """
+        Procesa un fragmento de stdout
+
+        Returns:
+            (salida sin las líneas de progreso, avisos de progreso en orden)
+        """
+        text = self.pending + text
+        self.pending = ""
+
+        # Camino rápido: fragmento sin nada que pueda ser una línea de progreso
+        if PROGRESS_PREFIX[:2] not in text and not text.endswith(PROGRESS_PREFIX[0]):
+            if text:
+                self.at_line_start = text.endswith("\n")
+            return text, []
+
+        output = []
+        updates = []
+        lines = text.split("\n")
+        for index, line in enumerate(lines):
+            complete = index < len(lines) - 1
+            if self.at_line_start and complete and line.startswith(PROGRESS_PREFIX):
+                update = parse_progress(line)
+                if update is not None:
+                    updates.append(update)
+                    continue
+            elif self.at_line_start and not complete and line and (
+                    line.startswith(PROGRESS_PREFIX) or PROGRESS_PREFIX.startswith(line)):
+                self.pending = line
+                continue
+
+            if complete:
+                output.append(line + "\n")
+                self.at_line_start = True
+            elif line:
+                output.append(line)
+                self.at_line_start = False
+        return "".join(output), updates
+
+    def flush(self) -> str:
+        """Devuelve lo retenido (el trabajo terminó sin completar la línea)"""
+        text, self.pending = self.pending, ""
+        return text
+
+
+class ProgressTracker(QObject):
+    """
+    Progreso de los trabajos en ejecución, con velocidad y tiempo restante
+
+    Cada aviso actualiza job["progress"] al instante, pero jobProgress se
+    emite como mucho una vez por intervalo y trabajo: un script que informe
+    miles de veces por segundo no satura el bucle de eventos de la interfaz.
+    """
+
+    jobProgress = Signal(str)  # job_id
+
+    def __init__(self, interval_ms: int = 200, parent=None):
+        """
+        Inicializa el seguimiento
+
+        Args:
+            interval_ms: Tiempo mínimo entre dos jobProgress del mismo trabajo
+        """
+        super().__init__(parent)
+        self.parsers = {}
+        self.samples = {}
+        self.dirty = {}
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self._flush)
+
+    def feed(self, job: Dict, text: str) -> str:
+        """
+        Procesa un fragmento de stdout del trabajo
+
+        Returns:
+            La salida sin las líneas de progreso
+        """
+        parser = self.parsers.get(job["id"])
+        if parser is None:
+            parser = self.parsers[job["id"]] = ProgressParser()
+        text, updates = parser.feed(text)
+        for update in updates:
+            self._apply(job, update)
+        if updates:
+            self.dirty[job["id"]] = job
+            if not self.timer.isActive():
+                self._flush()
+                self.timer.start()
+        return text
+
+    def forget(self, job_id: str) -> str:
+        """
+        Deja de seguir un trabajo que salió de ejecución
+
+        Returns:
+            Salida retenida que aún no se había entregado
+        """
+        job = self.dirty.pop(job_id, None)
+        if job is not None:
+            self._update_rate(job)
+            self.jobProgress.emit(job_id)
+        parser = self.parsers.pop(job_id, None)
+        self.samples.pop(job_id, None)
+        return parser.flush() if parser else ""
+
+    def _apply(self, job: Dict, update: Dict):
+        progress = job.get("progress")
+        if progress is None:
+            progress = job["progress"] = dict.fromkeys(PROGRESS_FIELDS + ("rate", "eta"))
+        if "stage" in update and update["stage"] != progress["stage"]:
+            # Cada etapa tiene sus propias unidades: la velocidad empieza de cero
+            progress["rate"] = progress["eta"] = None
+            self.samples.pop(job["id"], None)
+        progress.update(update)
+
+    def _flush(self):
+        if not self.dirty:
+            self.timer.stop()
+            return
+        dirty, self.dirty = self.dirty, {}
+        for job_id, job in dirty.items():
+            self._update_rate(job)
+            self.jobProgress.emit(job_id)
+
+    def _update_rate(self, job: Dict):
+        progress = job["progress"]
+        value = progress["progress"]
+        if value is None:
+            return
+
+        now = time.monotonic()
+        previous = self.samples.get(job["id"])
+        if previous is None or value < previous[1]:
+            self.samples[job["id"]] = (now, value)
+            return
+        elapsed = now - previous[0]
+        if elapsed > 0 and value > previous[1]:
+            rate = (value - previous[1]) / elapsed
+            if progress["rate"] is not None:
+                rate = RATE_SMOOTHING * rate + (1 - RATE_SMOOTHING) * progress["rate"]
+            progress["rate"] = rate
+            self.samples[job["id"]] = (now, value)
+        if progress["total"] and progress["rate"]:
+            progress["eta"] = max(0.0, progress["total"] - value) / progress["rate"]
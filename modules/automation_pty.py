@@ -0,0 +1,179 @@
+"""
+Automation PTY Executor
+Ejecuta cada run.py con un pseudo-terminal como stdout (Unix)
+
+Con un terminal, Python y la mayoría de programas escriben línea a línea
+(como en una consola) en lugar de acumular bloques de 8 KiB, y las
+bibliotecas que solo colorean si isatty() muestran sus colores ANSI.
+"""
+
+import os
+import signal
+import tempfile
+import subprocess
+from typing import Dict, Optional
+
+from PySide6.QtCore import QCoreApplication, QTimer
+
+from .automation_launcher import build_command
+from .automation_pipes import PipeExecutorBase
+from .automation_runner import (
+    resume_process_group, signal_process_group, suspend_process_group, terminate_process_group
+)
+
+try:
+    import fcntl
+    import struct
+    import termios
+except ImportError:
+    termios = None
+
+# Tamaño que ve el script en su terminal (filas, columnas)
+TERMINAL_SIZE = (40, 120)
+
+# Cada cuánto se comprueba si los procesos terminaron
+POLL_INTERVAL_MS = 50
+
+
+def is_supported() -> bool:
+    """Indica si la plataforma tiene pseudo-terminales"""
+    return termios is not None and hasattr(os, "openpty")
+
+
+def open_terminal():
+    """
+    Crea un pseudo-terminal para la salida de un trabajo
+
+    Sin conversión de "\\n" a "\\r\\n" (ONLCR), para que la salida llegue
+    igual que por un pipe.
+
+    Returns:
+        (descriptor maestro, descriptor esclavo)
+    """
+    master, slave = os.openpty()
+    attributes = termios.tcgetattr(slave)
+    attributes[1] &= ~termios.ONLCR
+    termios.tcsetattr(slave, termios.TCSANOW, attributes)
+    rows, columns = TERMINAL_SIZE
+    fcntl.ioctl(slave, termios.TIOCSWINSZ, struct.pack("HHHH", rows, columns, 0, 0))
+    return master, slave
+
+
+class AutomationPtyExecutor(PipeExecutorBase):
+    """Ejecutor con un proceso por trabajo cuyo stdout es un pseudo-terminal (stderr sigue siendo un pipe)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.processes = {}
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(POLL_INTERVAL_MS)
+        self.poll_timer.timeout.connect(self._poll)
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def start(self, job: Dict):
+        """
+        Lanza el proceso del trabajo con su terminal y retorna inmediatamente
+
+        Args:
+            job: Diccionario del trabajo (id, run_file, argv, cwd y opcionalmente
+                 limits, stack_dump, python, interpreter_flags, env y stdin_data)
+        """
+        job_id = job["id"]
+        command = build_command(job["run_file"], job["argv"], job.get("limits"), job.get("stack_dump", False),
+                                job.get("python"), job.get("interpreter_flags"))
+        environment = dict(os.environ, **(job.get("env") or {}))
+        environment.setdefault("TERM", "xterm-256color")
+
+        master, slave = open_terminal()
+        stderr_r, stderr_w = os.pipe()
+        stdin = subprocess.DEVNULL
+        try:
+            if job.get("stdin_data") is not None:
+                stdin = tempfile.TemporaryFile()
+                stdin.write(job["stdin_data"].encode("utf-8"))
+                stdin.seek(0)
+            process = subprocess.Popen(
+                command,
+                cwd=job["cwd"],
+                stdin=stdin,
+                stdout=slave,
+                stderr=stderr_w,
+                env=environment,
+                start_new_session=True
+            )
+        except OSError as e:
+            os.close(master)
+            os.close(stderr_r)
+            self.stderrReceived.emit(job_id, f"❌ No se pudo iniciar el proceso: {e}\n")
+            self.jobFinished.emit(job_id, -1)
+            return
+        finally:
+            # Solo el hijo debe tener el esclavo abierto: al salir, el maestro da EOF
+            os.close(slave)
+            os.close(stderr_w)
+            if stdin is not subprocess.DEVNULL:
+                stdin.close()
+
+        state = self._track_job(job_id, master, stderr_r)
+        state["pid"] = process.pid
+        self.processes[job_id] = process
+        if not self.poll_timer.isActive():
+            self.poll_timer.start()
+        self.jobStarted.emit(job_id)
+
+    def cancel(self, job_id: str, grace_ms: int) -> bool:
+        """
+        Termina el trabajo y todo su grupo de procesos
+
+        Args:
+            job_id: ID del trabajo
+            grace_ms: Milisegundos entre SIGTERM y SIGKILL
+
+        Returns:
+            True si el trabajo seguía activo
+        """
+        state = self.jobs.get(job_id)
+        if state is None:
+            return False
+        terminate_process_group(state["pid"], grace_ms)
+        return True
+
+    def suspend(self, job_id: str) -> bool:
+        """Detiene (SIGSTOP) el grupo de procesos del trabajo"""
+        state = self.jobs.get(job_id)
+        return state is not None and suspend_process_group(state["pid"])
+
+    def resume(self, job_id: str) -> bool:
+        """Reanuda (SIGCONT) el grupo de procesos del trabajo"""
+        state = self.jobs.get(job_id)
+        return state is not None and resume_process_group(state["pid"])
+
+    def process_id(self, job_id: str) -> Optional[int]:
+        """pid del proceso del trabajo (líder de su grupo)"""
+        state = self.jobs.get(job_id)
+        return state["pid"] if state is not None else None
+
+    def shutdown(self, timeout: float = 1.0):
+        """Mata los trabajos que sigan vivos, con todo su grupo de procesos, y espera a que terminen"""
+        for process in list(self.processes.values()):
+            signal_process_group(process.pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+        for process in list(self.processes.values()):
+            try:
+                process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                pass
+
+    def _poll(self):
+        for job_id, process in list(self.processes.items()):
+            exit_code = process.poll()
+            if exit_code is None:
+                continue
+            del self.processes[job_id]
+            # Popen da -N si lo mató la señal N; QProcess lo notifica como -1
+            self._set_exit_code(job_id, -1 if exit_code < 0 else exit_code)
+        if not self.processes:
+            self.poll_timer.stop()
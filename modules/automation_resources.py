@@ -0,0 +1,245 @@
+"""
+Automation Resources
+Control de admisión por memoria y carga del sistema, con el pico de memoria
+de cada automatización aprendido de ejecuciones anteriores
+"""
+
+import os
+import json
+from collections import defaultdict
+from typing import Callable, Dict, Optional
+
+from PySide6.QtCore import QObject, QTimer
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Picos que se recuerdan por automatización
+PEAK_HISTORY = 5
+
+# Mediciones extra tras arrancar cada trabajo, antes del intervalo normal (ms)
+STARTUP_SAMPLES_MS = (0, 50, 150, 300)
+
+
+def read_available_memory() -> Optional[int]:
+    """
+    Memoria disponible sin recurrir al swap según /proc/meminfo (solo Linux)
+
+    Returns:
+        Bytes disponibles o None si no se puede saber
+    """
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def load_per_cpu() -> Optional[float]:
+    """Carga media del último minuto dividida entre el número de CPUs"""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return None
+
+
+def scan_process_groups() -> Dict[int, Dict]:
+    """
+    Recorre /proc/<pid>/stat y agrupa los procesos por grupo
+
+    Returns:
+        Diccionario {pgid: {"rss": bytes, "cpu_ticks": tiempo de CPU en ticks
+        (incluye el de los hijos ya terminados), "pids": [...]}}; vacío fuera de Linux
+    """
+    groups = defaultdict(lambda: {"rss": 0, "cpu_ticks": 0, "pids": []})
+    try:
+        pids = [entry for entry in os.listdir("/proc") if entry.isdigit()]
+    except OSError:
+        return groups
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # El nombre del proceso puede contener espacios y paréntesis
+        fields = stat[stat.rfind(b")") + 2:].split()
+        try:
+            group = groups[int(fields[2])]
+            group["rss"] += int(fields[21]) * PAGE_SIZE
+            group["cpu_ticks"] += sum(int(value) for value in fields[11:15])
+            group["pids"].append(int(pid))
+        except (IndexError, ValueError):
+            continue
+    return groups
+
+
+class AutomationResourceMonitor(QObject):
+    """
+    Decide si un trabajo puede arrancar sin sobrecargar la máquina
+
+    Un trabajo espera en la cola si su pico de memoria previsto, más lo que
+    aún pueden crecer los trabajos en ejecución y un margen, no cabe en la
+    memoria disponible, o si la carga por CPU supera el máximo. El pico
+    previsto es "expected_memory_mb" de ui_config.json o, si no se declara,
+    el mayor de los últimos picos medidos de la automatización.
+
+    El recorrido de /proc se hace en un hilo del scanner, nunca en el de la
+    interfaz. Cada trabajo se mide varias veces al arrancar y luego cada
+    sample_ms; si termina con una medición aún en curso, su pico se aprende
+    al llegar.
+    """
+
+    def __init__(self, history_file: str, process_id: Callable[[str], Optional[int]], scanner,
+                 headroom_mb: int = 512, max_load_per_cpu: float = 0, sample_ms: int = 500, parent=None):
+        """
+        Inicializa el monitor
+
+        Args:
+            history_file: JSON donde se guardan los picos medidos
+            process_id: Función que da el pid (líder de grupo) de un trabajo en ejecución
+            scanner: InputInspector en el que se recorre /proc
+            headroom_mb: Memoria que se deja siempre libre
+            max_load_per_cpu: Carga por CPU a partir de la cual no se arrancan trabajos (0 = sin límite)
+            sample_ms: Intervalo de medición de la memoria de los trabajos
+        """
+        super().__init__(parent)
+        self.history_file = os.path.abspath(history_file)
+        self.process_id = process_id
+        self.headroom = headroom_mb * 1024 * 1024
+        self.max_load_per_cpu = max_load_per_cpu
+        self.scanner = scanner
+        self.peaks = {}
+        self.running = {}
+        self.finishing = {}  # trabajos terminados a la espera de la medición en curso
+        self.scan_targets = None  # {job_id: pid} de la medición en curso
+        self.rescan = False  # un trabajo arrancó durante la medición en curso
+        self.reason = ""
+        self._load()
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(sample_ms)
+        self.timer.timeout.connect(self.sample)
+
+    def expected_memory(self, job: Dict) -> int:
+        """Pico de memoria previsto del trabajo en bytes (0 si se desconoce)"""
+        if job.get("expected_memory_mb"):
+            return int(job["expected_memory_mb"] * 1024 * 1024)
+        peaks = self.peaks.get(job["automation_id"])
+        return max(peaks) if peaks else 0
+
+    def can_start(self, job: Dict) -> bool:
+        """
+        Indica si el trabajo cabe ahora; si no, deja el motivo en self.reason
+
+        Sin trabajos en ejecución siempre se admite, para que un trabajo
+        mayor que la memoria libre no se quede en la cola para siempre.
+        """
+        self.reason = ""
+        if not self.running:
+            return True
+
+        if self.max_load_per_cpu:
+            load = load_per_cpu()
+            if load is not None and load > self.max_load_per_cpu:
+                self.reason = f"carga por CPU {load:.2f} > {self.max_load_per_cpu}"
+                return False
+
+        available = read_available_memory()
+        if available is None:
+            return True
+        # Lo que los trabajos en marcha aún pueden crecer hasta su pico previsto
+        reserved = sum(max(0, state["expected"] - state["rss"]) for state in self.running.values())
+        needed = self.expected_memory(job) + reserved + self.headroom
+        if needed > available:
+            self.reason = (
+                f"memoria: necesita {needed // 2 ** 20} MB, disponibles {available // 2 ** 20} MB"
+            )
+            return False
+        return True
+
+    def job_started(self, job: Dict):
+        """Empieza a medir la memoria del trabajo"""
+        self.running[job["id"]] = {
+            "automation_id": job["automation_id"],
+            "expected": self.expected_memory(job),
+            "rss": 0,
+            "peak": 0
+        }
+        if not self.timer.isActive():
+            self.timer.start()
+        # Mediciones seguidas al arrancar (tras lanzar el proceso): un trabajo corto también deja su pico
+        for delay in STARTUP_SAMPLES_MS:
+            QTimer.singleShot(delay, self.sample)
+
+    def job_finished(self, job: Dict):
+        """Deja de medir el trabajo y aprende su pico si terminó por sí mismo"""
+        state = self.running.pop(job["id"], None)
+        if not self.running:
+            self.timer.stop()
+        if state is None or job["status"] == "cancelled" or job.get("aborted"):
+            return
+        if self.scan_targets and job["id"] in self.scan_targets:
+            # La medición en curso empezó con el proceso vivo: se aprende al llegar
+            self.finishing[job["id"]] = state
+            return
+        self._learn(state)
+
+    def sample(self):
+        """Mide en segundo plano la memoria residente del grupo de procesos de cada trabajo"""
+        if self.scan_targets is not None:
+            self.rescan = True
+            return
+        self.rescan = False
+        targets = {}
+        for job_id in self.running:
+            pid = self.process_id(job_id)
+            if pid:
+                targets[job_id] = pid
+        if not targets:
+            return
+        self.scan_targets = targets
+        self.scanner.submit(scan_process_groups, (), self._on_scan)
+
+    def _on_scan(self, groups: Optional[Dict[int, Dict]], error: Optional[Exception]):
+        targets, self.scan_targets = self.scan_targets, None
+        for job_id, pid in targets.items():
+            state = self.running.get(job_id) or self.finishing.get(job_id)
+            if state is None or not groups or pid not in groups:
+                continue
+            state["rss"] = groups[pid]["rss"]
+            state["peak"] = max(state["peak"], state["rss"])
+
+        finished, self.finishing = self.finishing, {}
+        for state in finished.values():
+            self._learn(state)
+        if self.rescan:
+            self.sample()
+
+    def _learn(self, state: Dict):
+        """Guarda el pico medido de un trabajo terminado"""
+        if not state["peak"]:
+            return
+        peaks = self.peaks.setdefault(state["automation_id"], [])
+        peaks.append(state["peak"])
+        del peaks[:-PEAK_HISTORY]
+        self._save()
+
+    def _load(self):
+        try:
+            with open(self.history_file, "r", encoding="utf-8") as f:
+                self.peaks = json.load(f)
+        except (OSError, ValueError):
+            self.peaks = {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.history_file), exist_ok=True)
+        temp_file = self.history_file + ".tmp"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(self.peaks, f)
+            os.replace(temp_file, self.history_file)
+        except OSError as e:
+            print(f"⚠️  No se pudo guardar el historial de memoria: {e}")
@@ -0,0 +1,241 @@
+"""
+Automation Runner
+Ejecuta automatizaciones en procesos hijos sin bloquear la interfaz
+"""
+
+import os
+import sys
+import codecs
+import signal
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QCoreApplication, QObject, QProcess, QProcessEnvironment, QTimer, Signal
+
+from .automation_launcher import build_command
+
+
+def use_own_process_group(process: QProcess):
+    """
+    Hace que el proceso arranque en una sesión (y grupo de procesos) propia
+
+    Así se puede señalizar al trabajo junto con todos sus descendientes.
+    Requiere Qt 6.7+ en Unix; en otros casos no hace nada.
+    """
+    if sys.platform == "win32" or not hasattr(QProcess, "setUnixProcessParameters"):
+        return
+    if not hasattr(QProcess.UnixProcessFlag, "CreateNewSession"):
+        return
+
+    params = QProcess.UnixProcessParameters()
+    params.flags = QProcess.UnixProcessFlag.CreateNewSession | QProcess.UnixProcessFlag.ResetSignalHandlers
+    process.setUnixProcessParameters(params)
+
+
+def signal_process_group(pid: int, signum: int) -> bool:
+    """
+    Envía una señal al grupo de procesos cuyo líder es pid
+
+    Returns:
+        True si se pudo enviar la señal
+    """
+    if not pid or not hasattr(os, "killpg"):
+        return False
+    try:
+        os.killpg(pid, signum)
+        return True
+    except (ProcessLookupError, PermissionError):
+        return False
+
+
+def terminate_process_group(pid: int, grace_ms: int) -> bool:
+    """
+    SIGTERM al grupo del trabajo y SIGKILL si sigue vivo tras el periodo de gracia
+
+    Returns:
+        True si el grupo existía y se le pidió terminar
+    """
+    if not signal_process_group(pid, signal.SIGTERM):
+        return False
+    QTimer.singleShot(grace_ms, lambda: signal_process_group(pid, signal.SIGKILL))
+    return True
+
+
+def suspend_process_group(pid: int) -> bool:
+    """Detiene el grupo de procesos (no disponible en Windows)"""
+    return hasattr(signal, "SIGSTOP") and signal_process_group(pid, signal.SIGSTOP)
+
+
+def resume_process_group(pid: int) -> bool:
+    """Reanuda un grupo de procesos detenido con suspend_process_group"""
+    return hasattr(signal, "SIGCONT") and signal_process_group(pid, signal.SIGCONT)
+
+
+class AutomationRunner(QObject):
+    """Ejecutor asíncrono basado en QProcess"""
+
+    jobStarted = Signal(str)           # job_id
+    stdoutReceived = Signal(str, str)  # job_id, texto
+    stderrReceived = Signal(str, str)  # job_id, texto
+    jobFinished = Signal(str, int)     # job_id, exit_code
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.processes = {}
+        self.decoders = {}
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def start(self, job: Dict):
+        """
+        Lanza el proceso hijo de un trabajo y retorna inmediatamente
+
+        Args:
+            job: Diccionario del trabajo (id, run_file, argv, cwd y opcionalmente limits,
+                 stack_dump, python e interpreter_flags para build_command, env con
+                 variables de entorno extra y stdin_data, que se escribe en el stdin
+                 del proceso)
+        """
+        job_id = job["id"]
+        command = build_command(job["run_file"], job["argv"], job.get("limits"), job.get("stack_dump", False),
+                                job.get("python"), job.get("interpreter_flags"))
+
+        process = QProcess(self)
+        process.setProgram(command[0])
+        process.setArguments(command[1:])
+        process.setWorkingDirectory(job["cwd"])
+        if job.get("env"):
+            environment = QProcessEnvironment.systemEnvironment()
+            for name, value in job["env"].items():
+                environment.insert(name, value)
+            process.setProcessEnvironment(environment)
+        use_own_process_group(process)
+
+        process.readyReadStandardOutput.connect(lambda: self._read_stdout(job_id))
+        process.readyReadStandardError.connect(lambda: self._read_stderr(job_id))
+        process.started.connect(lambda: self.jobStarted.emit(job_id))
+        process.finished.connect(
+            lambda exit_code, exit_status: self._on_finished(job_id, exit_code, exit_status)
+        )
+        process.errorOccurred.connect(lambda error: self._on_error(job_id, error))
+
+        # Decodificadores incrementales: un carácter UTF-8 puede quedar partido entre lecturas
+        self.decoders[job_id] = (
+            codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            codecs.getincrementaldecoder("utf-8")(errors="replace"),
+        )
+        self.processes[job_id] = process
+        process.start()
+        if job.get("stdin_data") is not None:
+            # QProcess lo escribe en segundo plano; al cerrar el canal el script ve EOF
+            process.write(job["stdin_data"].encode("utf-8"))
+            process.closeWriteChannel()
+
+    def cancel(self, job_id: str, grace_ms: int) -> bool:
+        """
+        Termina el trabajo y todo su grupo de procesos
+
+        Args:
+            job_id: ID del trabajo
+            grace_ms: Milisegundos entre SIGTERM y SIGKILL
+
+        Returns:
+            True si se envió la orden de terminar
+        """
+        process = self.processes.get(job_id)
+        if process is None:
+            return False
+
+        if terminate_process_group(process.processId(), grace_ms):
+            return True
+
+        # Sin grupos de procesos (Windows o Qt < 6.7): solo el proceso principal
+        process.terminate()
+        QTimer.singleShot(grace_ms, lambda: self._kill_if_running(job_id))
+        return True
+
+    def suspend(self, job_id: str) -> bool:
+        """Detiene (SIGSTOP) el grupo de procesos del trabajo"""
+        process = self.processes.get(job_id)
+        return process is not None and suspend_process_group(process.processId())
+
+    def resume(self, job_id: str) -> bool:
+        """Reanuda (SIGCONT) el grupo de procesos del trabajo"""
+        process = self.processes.get(job_id)
+        return process is not None and resume_process_group(process.processId())
+
+    def process_id(self, job_id: str) -> Optional[int]:
+        """pid del proceso del trabajo (líder de su grupo)"""
+        process = self.processes.get(job_id)
+        if process is None:
+            return None
+        return process.processId() or None
+
+    def shutdown(self, timeout_ms: int = 1000):
+        """Mata los trabajos que sigan vivos, con todo su grupo de procesos, y espera a que terminen"""
+        for process in list(self.processes.values()):
+            if not signal_process_group(process.processId(), getattr(signal, "SIGKILL", signal.SIGTERM)):
+                process.kill()
+        for process in list(self.processes.values()):
+            process.waitForFinished(timeout_ms)
+
+    def _kill_if_running(self, job_id: str):
+        process = self.processes.get(job_id)
+        if process is not None:
+            process.kill()
+
+    def is_running(self, job_id: str) -> bool:
+        """Indica si el trabajo sigue teniendo un proceso activo"""
+        return job_id in self.processes
+
+    def running_jobs(self) -> List[str]:
+        """Retorna los IDs de los trabajos en ejecución"""
+        return list(self.processes.keys())
+
+    def _read_stdout(self, job_id: str):
+        process = self.processes.get(job_id)
+        if process is None:
+            return
+        data = process.readAllStandardOutput().data()
+        text = self.decoders[job_id][0].decode(data)
+        if text:
+            self.stdoutReceived.emit(job_id, text)
+
+    def _read_stderr(self, job_id: str):
+        process = self.processes.get(job_id)
+        if process is None:
+            return
+        data = process.readAllStandardError().data()
+        text = self.decoders[job_id][1].decode(data)
+        if text:
+            self.stderrReceived.emit(job_id, text)
+
+    def _on_finished(self, job_id: str, exit_code: int, exit_status):
+        if job_id not in self.processes:
+            return
+
+        # Vaciar lo que quede pendiente en los pipes
+        self._read_stdout(job_id)
+        self._read_stderr(job_id)
+
+        if exit_status == QProcess.CrashExit:
+            exit_code = -1
+
+        self._release(job_id)
+        self.jobFinished.emit(job_id, exit_code)
+
+    def _on_error(self, job_id: str, error):
+        # Solo FailedToStart deja al proceso sin señal finished
+        if error != QProcess.FailedToStart or job_id not in self.processes:
+            return
+
+        message = self.processes[job_id].errorString()
+        self._release(job_id)
+        self.stderrReceived.emit(job_id, f"❌ No se pudo iniciar el proceso: {message}\n")
+        self.jobFinished.emit(job_id, -1)
+
+    def _release(self, job_id: str):
+        process = self.processes.pop(job_id)
+        self.decoders.pop(job_id, None)
+        process.deleteLater()
@@ -0,0 +1,220 @@
+"""
+Automation Runtime
+Predicción de la duración de cada automatización a partir del tamaño de sus inputs
+"""
+
+import os
+import json
+from typing import Dict, List, Optional, Tuple
+
+# Peso de las ejecuciones anteriores en cada actualización (1 = no olvidar nunca)
+DECAY = 0.95
+
+# Regularización de la regresión: evita pendientes absurdas con pocas ejecuciones
+RIDGE = 1e-3
+
+# Ejecuciones a partir de las cuales se usa la regresión en vez de la media
+MIN_SAMPLES_FOR_FIT = 3
+
+
+def input_size(automation: Dict, inputs: Dict[str, str]) -> Tuple[int, int]:
+    """
+    Tamaño de los inputs de una ejecución (sin contar los de salida)
+
+    El recorrido completo de una carpeta grande puede tardar segundos: no se
+    hace en el hilo de la interfaz (ver InputInspector).
+
+    Args:
+        automation: Información de la automatización (inputs)
+        inputs: Diccionario {input_id: path}
+
+    Returns:
+        (bytes totales, número de archivos)
+    """
+    total_bytes = 0
+    total_files = 0
+    for input_config in automation["inputs"]:
+        path = inputs.get(input_config["id"], "").strip()
+        if not path or input_config.get("role") == "output":
+            continue
+        size_bytes, files = path_size(path)
+        total_bytes += size_bytes
+        total_files += files
+    return total_bytes, total_files
+
+
+def batch_input_sizes(automation: Dict, inputs: Dict[str, str], input_id: str,
+                      paths: List[str]) -> List[Tuple[int, int]]:
+    """
+    Tamaño de los inputs de cada trabajo de un lote
+
+    Los inputs comunes se recorren una sola vez para todo el lote; de cada
+    trabajo solo se mide su propio archivo.
+
+    Args:
+        automation: Información de la automatización (inputs)
+        inputs: Valores comunes a todos los trabajos {input_id: path}
+        input_id: Input que recibe cada archivo del lote
+        paths: Archivos del lote
+
+    Returns:
+        Lista (bytes totales, número de archivos), en el orden de paths
+    """
+    common = {key: value for key, value in inputs.items() if key != input_id}
+    common_bytes, common_files = input_size(automation, common)
+    sizes = []
+    for path in paths:
+        size_bytes, files = path_size(path)
+        sizes.append((common_bytes + size_bytes, common_files + files))
+    return sizes
+
+
+def path_size(path: str) -> Tuple[int, int]:
+    """
+    Tamaño de un archivo o de una carpeta completa (recursiva)
+
+    Returns:
+        (bytes totales, número de archivos); (0, 0) si no existe
+    """
+    if os.path.isdir(path):
+        total_bytes = 0
+        total_files = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total_bytes += os.path.getsize(os.path.join(root, name))
+                    total_files += 1
+                except OSError:
+                    pass
+        return total_bytes, total_files
+    try:
+        return os.path.getsize(path), 1
+    except OSError:
+        return 0, 0
+
+
+def _features(size_bytes: int, files: int) -> List[float]:
+    return [1.0, size_bytes / (1024 * 1024), float(files)]
+
+
+def _solve(matrix: List[List[float]], vector: List[float]) -> Optional[List[float]]:
+    """Resuelve un sistema pequeño por eliminación gaussiana con pivoteo parcial"""
+    n = len(vector)
+    rows = [list(matrix[i]) + [vector[i]] for i in range(n)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda row: abs(rows[row][col]))
+        if abs(rows[pivot][col]) < 1e-12:
+            return None
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for row in range(col + 1, n):
+            factor = rows[row][col] / rows[col][col]
+            for k in range(col, n + 1):
+                rows[row][k] -= factor * rows[col][k]
+    solution = [0.0] * n
+    for row in range(n - 1, -1, -1):
+        solution[row] = (rows[row][n] - sum(rows[row][k] * solution[k] for k in range(row + 1, n))) / rows[row][row]
+    return solution
+
+
+class RuntimePredictor:
+    """
+    Regresión lineal incremental de la duración por automatización
+
+    duración ≈ a + b·MB + c·archivos. Por automatización solo se guardan las
+    sumas de la ecuación normal (XᵀX y Xᵀy), que se actualizan en O(1) con
+    cada ejecución y se descuentan con DECAY para seguir los cambios del
+    script. Con menos de MIN_SAMPLES_FOR_FIT ejecuciones se usa la media.
+    """
+
+    def __init__(self, history_file: str):
+        """
+        Inicializa el predictor y carga su historial
+
+        Args:
+            history_file: JSON donde se guardan las sumas de cada automatización
+        """
+        self.history_file = os.path.abspath(history_file)
+        self.models = {}
+        self._load()
+
+    def has_model(self, automation_id: str) -> bool:
+        """Indica si la automatización tiene ejecuciones registradas con las que predecir"""
+        model = self.models.get(automation_id)
+        return bool(model) and model["count"] >= 1
+
+    def predict(self, automation_id: str, size_bytes: int, files: int) -> Optional[float]:
+        """
+        Duración prevista en segundos, o None si la automatización nunca se ejecutó
+
+        Args:
+            automation_id: ID de la automatización
+            size_bytes: Bytes totales de los inputs
+            files: Número de archivos de los inputs
+        """
+        model = self.models.get(automation_id)
+        if not model or model["count"] < 1:
+            return None
+
+        mean = model["xty"][0] / model["xtx"][0][0]
+        if model["count"] < MIN_SAMPLES_FOR_FIT:
+            return mean
+
+        xtx = [row[:] for row in model["xtx"]]
+        for i in range(1, len(xtx)):
+            xtx[i][i] += RIDGE * max(1.0, xtx[i][i])
+        coefficients = _solve(xtx, model["xty"])
+        if coefficients is None:
+            return mean
+
+        x = _features(size_bytes, files)
+        prediction = sum(c * v for c, v in zip(coefficients, x))
+        # Fuera del rango observado la recta puede dar valores sin sentido
+        return min(max(prediction, model["min"] * 0.5), max(model["max"] * 2, mean))
+
+    def observe(self, automation_id: str, size_bytes: int, files: int, duration: float):
+        """
+        Incorpora la duración de una ejecución terminada
+
+        Args:
+            automation_id: ID de la automatización
+            size_bytes: Bytes totales de los inputs
+            files: Número de archivos de los inputs
+            duration: Segundos que tardó
+        """
+        x = _features(size_bytes, files)
+        model = self.models.get(automation_id)
+        if model is None:
+            model = {
+                "count": 0,
+                "xtx": [[0.0] * len(x) for _ in x],
+                "xty": [0.0] * len(x),
+                "min": duration,
+                "max": duration
+            }
+            self.models[automation_id] = model
+
+        for i in range(len(x)):
+            model["xty"][i] = model["xty"][i] * DECAY + x[i] * duration
+            for j in range(len(x)):
+                model["xtx"][i][j] = model["xtx"][i][j] * DECAY + x[i] * x[j]
+        model["count"] += 1
+        model["min"] = min(model["min"], duration)
+        model["max"] = max(model["max"], duration)
+        self._save()
+
+    def _load(self):
+        try:
+            with open(self.history_file, "r", encoding="utf-8") as f:
+                self.models = json.load(f)
+        except (OSError, ValueError):
+            self.models = {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.history_file), exist_ok=True)
+        temp_file = self.history_file + ".tmp"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(self.models, f)
+            os.replace(temp_file, self.history_file)
+        except OSError as e:
+            print(f"⚠️  No se pudo guardar el historial de duraciones: {e}")
@@ -0,0 +1,714 @@
+"""
+Automation Scheduler
+Cola de trabajos por prioridad con límite global de workers y límites por automatización
+"""
+
+import os
+import time
+import random
+from collections import deque
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from .automation_progress import ProgressTracker
+from .automation_runner import AutomationRunner
+
+
+# Código con el que se notifica jobFinished de un trabajo cancelado
+CANCELLED_EXIT_CODE = -15
+
+# Prioridades de los trabajos (menor = más urgente)
+PRIORITIES = {"interactive": 0, "batch": 1, "scheduled": 2}
+
+
+def priority_value(priority, default: int = 0) -> int:
+    """
+    Convierte una prioridad (nombre de PRIORITIES o entero) a su valor numérico
+
+    Args:
+        priority: "interactive", "batch", "scheduled" o un entero
+        default: Valor si la prioridad no es válida
+    """
+    if isinstance(priority, int) and not isinstance(priority, bool):
+        return priority
+    return PRIORITIES.get(str(priority).lower(), default) if priority is not None else default
+
+
+def retry_delay(policy: Dict, attempt: int) -> float:
+    """
+    Espera antes de reintentar tras el intento fallido número attempt
+
+    Backoff exponencial (backoff_seconds · 2^(attempt-1), como mucho
+    max_backoff_seconds) del que se resta al azar hasta una fracción "jitter",
+    para que los trabajos que fallaron a la vez no se reintenten a la vez.
+
+    Args:
+        policy: Política "retry" del trabajo
+        attempt: Intentos realizados hasta ahora (1 = el primero falló)
+    """
+    delay = min(policy["max_backoff_seconds"], policy["backoff_seconds"] * 2 ** (attempt - 1))
+    return delay * (1 - policy["jitter"] * random.random())
+
+
+class AutomationScheduler(QObject):
+    """Planificador de trabajos de automatización"""
+
+    jobQueued = Signal(str)            # job_id
+    jobCoalesced = Signal(str)         # job_id que absorbió una petición duplicada
+    jobStarted = Signal(str)           # job_id
+    jobSuspended = Signal(str)         # job_id pausado para ceder su worker
+    jobResumed = Signal(str)           # job_id reanudado
+    jobRetrying = Signal(str, float)   # job_id que falló y se reintentará, segundos de espera
+    stdoutReceived = Signal(str, str)  # job_id, texto
+    stderrReceived = Signal(str, str)  # job_id, texto
+    jobProgress = Signal(str)          # job_id con job["progress"] actualizado (como mucho uno por intervalo)
+    jobFinished = Signal(str, int)     # job_id, exit_code
+    drained = Signal()                 # tras shutdown(), ya no queda ningún trabajo vivo
+
+    def __init__(self, max_workers: Optional[int] = None, history_size: int = 200,
+                 cancel_grace_ms: int = 5000, preemption: bool = True,
+                 shortest_job_first: bool = False, progress_interval_ms: int = 200, parent=None):
+        """
+        Inicializa el planificador
+
+        Args:
+            max_workers: Trabajos simultáneos como máximo (por defecto, número de CPUs)
+            history_size: Cantidad de trabajos terminados que se conservan
+            cancel_grace_ms: Espera entre SIGTERM y SIGKILL al detener un trabajo
+            preemption: Pausar trabajos de menor prioridad para hacer sitio a los urgentes
+            shortest_job_first: Dentro de cada prioridad, lanzar antes los trabajos
+                                con menor "predicted_seconds"
+            progress_interval_ms: Tiempo mínimo entre dos jobProgress del mismo trabajo
+        """
+        super().__init__(parent)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.preemption = preemption
+        self.shortest_job_first = shortest_job_first
+        self.jobs = {}
+        self.queue = deque()
+        self.running = set()
+        self.suspended = set()
+        self.finished = deque()
+        self.history_size = history_size
+        self.cancel_grace_ms = cancel_grace_ms
+        self.timeouts = {}
+        self.retry_timers = {}
+        self.active_keys = {}
+        self.admission = None
+        self.shutting_down = False
+        self.drain_timer = None
+
+        # Reintento de arranque cuando el control de admisión deja trabajos esperando
+        self.admission_timer = QTimer(self)
+        self.admission_timer.setSingleShot(True)
+        self.admission_timer.timeout.connect(self._dispatch)
+
+        # Las líneas de progreso (ver automation_progress) se separan de stdout
+        self.progress = ProgressTracker(progress_interval_ms, self)
+        self.progress.jobProgress.connect(self.jobProgress)
+
+        self.executors = {}
+        self.runner = AutomationRunner(self)
+        self.add_executor("subprocess", self.runner)
+
+    def add_executor(self, name: str, executor: QObject):
+        """
+        Registra un backend de ejecución
+
+        El backend debe exponer start(job) y las señales jobStarted,
+        stdoutReceived, stderrReceived y jobFinished de AutomationRunner.
+        Opcionalmente cancel(job_id, grace_ms), suspend(job_id) y resume(job_id).
+
+        Args:
+            name: Nombre usado en la clave "executor" del trabajo
+            executor: Instancia del backend
+        """
+        executor.setParent(self)
+        executor.jobStarted.connect(self.jobStarted)
+        executor.stdoutReceived.connect(self._on_job_stdout)
+        executor.stderrReceived.connect(self.stderrReceived)
+        executor.jobFinished.connect(self._on_job_finished)
+        self.executors[name] = executor
+
+    def set_admission_control(self, controller, retry_ms: int = 1000):
+        """
+        Registra un control de admisión consultado antes de arrancar cada trabajo
+
+        El controlador expone can_start(job) -> bool (con el motivo en
+        controller.reason), job_started(job) y job_finished(job). Mientras
+        rechace al siguiente trabajo, la cola espera y se reintenta cada retry_ms.
+
+        Args:
+            controller: Control de admisión (ver AutomationResourceMonitor) o None
+            retry_ms: Intervalo de reintento mientras haya trabajos esperando
+        """
+        self.admission = controller
+        self.admission_timer.setInterval(retry_ms)
+
+    def process_id(self, job_id: str) -> Optional[int]:
+        """pid del proceso (líder de grupo) de un trabajo en ejecución, si el ejecutor lo expone"""
+        job = self.jobs.get(job_id)
+        process_id = getattr(self._executor_for(job), "process_id", None) if job else None
+        return process_id(job_id) if process_id else None
+
+    def submit(self, job: Dict) -> str:
+        """
+        Encola un trabajo y lo lanza en cuanto haya un worker libre
+
+        Si el trabajo trae "dedup_key" y ya hay uno en cola o en ejecución con
+        la misma clave, no se encola: la petición se une al existente y todos
+        los solicitantes comparten su resultado.
+
+        Args:
+            job: Diccionario del trabajo; "priority" ordena la cola (ver
+                 PRIORITIES), "max_concurrency" limita cuántos trabajos de la
+                 misma automatización corren a la vez, "timeout_seconds"
+                 detiene el trabajo si se excede y "retry" (max_attempts,
+                 backoff_seconds, max_backoff_seconds, jitter, exit_codes)
+                 lo vuelve a encolar si falla. Con "held" (motivo) el trabajo
+                 espera en la cola sin lanzarse hasta release() o reject()
+
+        Returns:
+            ID del trabajo (el existente si la petición se unió a otro)
+        """
+        job["priority"] = priority_value(job.get("priority"))
+        key = job.get("dedup_key")
+        if key and key in self.active_keys:
+            existing = self.jobs[self.active_keys[key]]
+            existing["requests"] += 1
+            # Una petición más urgente adelanta al trabajo compartido
+            existing["priority"] = min(existing["priority"], job["priority"])
+            self.jobCoalesced.emit(existing["id"])
+            return existing["id"]
+        if key:
+            self.active_keys[key] = job["id"]
+
+        job["requests"] = 1
+        job["status"] = "queued"
+        job["queued_at"] = time.time()
+        job["attempts"] = []
+        self.jobs[job["id"]] = job
+        self.queue.append(job["id"])
+        self.jobQueued.emit(job["id"])
+        self._dispatch()
+        return job["id"]
+
+    def complete(self, job: Dict, exit_code: int, output: str = "") -> str:
+        """
+        Registra un trabajo ya resuelto sin ejecutarlo (por ejemplo, desde la caché)
+
+        El trabajo puede ser nuevo o estar en cola sin haberse lanzado (retenido
+        con "held" mientras se comprobaba la caché); en ese caso sale de la cola
+        y sus solicitantes reciben el resultado. Las señales se emiten en la
+        siguiente vuelta del bucle de eventos, cuando el llamador ya conoce el
+        ID del trabajo.
+
+        Args:
+            job: Diccionario del trabajo
+            exit_code: Código de salida del resultado
+            output: Salida que se notifica por stdoutReceived
+
+        Returns:
+            ID del trabajo
+        """
+        now = time.time()
+        if job["id"] in self.queue:
+            self.queue.remove(job["id"])
+            job.pop("held", None)
+            self._release_key(job)
+        else:
+            job["queued_at"] = now
+            job["requests"] = 1
+            job["attempts"] = []
+        job["started_at"] = job["finished_at"] = now
+        job["exit_code"] = exit_code
+        job["status"] = "finished" if exit_code == 0 else "failed"
+        self.jobs[job["id"]] = job
+        self._remember(job["id"])
+
+        def notify():
+            if output:
+                self.stdoutReceived.emit(job["id"], output)
+            self.jobFinished.emit(job["id"], exit_code)
+
+        QTimer.singleShot(0, notify)
+        return job["id"]
+
+    def cancel(self, job_id: str, grace_ms: Optional[int] = None) -> bool:
+        """
+        Cancela un trabajo en cola, esperando un reintento, en ejecución o pausado
+
+        El worker queda libre en el acto: la terminación del proceso sigue en
+        segundo plano y su jobFinished posterior se ignora.
+
+        Args:
+            job_id: ID del trabajo
+            grace_ms: Milisegundos entre SIGTERM y SIGKILL (por defecto cancel_grace_ms)
+
+        Returns:
+            True si el trabajo estaba activo y se canceló
+        """
+        job = self.jobs.get(job_id)
+        if not job:
+            return False
+
+        if job_id in self.queue:
+            self.queue.remove(job_id)
+        elif job_id in self.retry_timers:
+            self._stop_retry(job_id)
+        elif job_id in self.suspended:
+            # Reanudar antes de terminar: un proceso detenido no atiende SIGTERM
+            self.suspended.discard(job_id)
+            self._executor_for(job).resume(job_id)
+            self._terminate(job, grace_ms)
+            self._record_attempt(job, None)
+            self.progress.forget(job_id)
+        elif job_id in self.running:
+            self.running.discard(job_id)
+            self._stop_timeout(job_id)
+            self._record_attempt(job, None)
+            self.progress.forget(job_id)
+            if not self._terminate(job, grace_ms):
+                self.stderrReceived.emit(
+                    job_id, "⚠️  Este ejecutor no puede interrumpir el trabajo; su resultado se descartará\n"
+                )
+        else:
+            return False
+
+        job["exit_code"] = None
+        job["finished_at"] = time.time()
+        job["status"] = "cancelled"
+        if self.admission and job.get("started_at"):
+            self.admission.job_finished(job)
+        self._release_key(job)
+        self._remember(job_id)
+
+        self.jobFinished.emit(job_id, CANCELLED_EXIT_CODE)
+        self._dispatch()
+        return True
+
+    def abort(self, job_id: str, reason: str, message: str = "") -> bool:
+        """
+        Detiene un trabajo en ejecución y lo da por fallido, aunque salga con código 0
+
+        Args:
+            job_id: ID del trabajo
+            reason: Motivo que queda en job["aborted"] ("timeout", "hang"...)
+            message: Aviso que se añade a la salida del trabajo
+
+        Returns:
+            True si el trabajo estaba en ejecución
+        """
+        job = self.jobs.get(job_id)
+        if not job or job_id not in self.running:
+            return False
+
+        job["aborted"] = reason
+        if message:
+            self.stderrReceived.emit(job_id, message)
+        if not self._terminate(job):
+            # Sin forma de interrumpirlo: se libera el worker y se descarta su resultado
+            self._on_job_finished(job_id, CANCELLED_EXIT_CODE)
+        return True
+
+    def release(self, job_id: str) -> bool:
+        """
+        Deja lanzar un trabajo en cola retenido con "held"
+
+        Returns:
+            True si el trabajo estaba retenido
+        """
+        job = self.jobs.get(job_id)
+        if not job or job_id not in self.queue or not job.get("held"):
+            return False
+        del job["held"]
+        self._dispatch()
+        return True
+
+    def reject(self, job_id: str, message: str) -> bool:
+        """
+        Da por fallido un trabajo en cola sin llegar a lanzarlo
+
+        Args:
+            job_id: ID del trabajo
+            message: Motivo, que se notifica por stderrReceived
+
+        Returns:
+            True si el trabajo estaba en cola
+        """
+        job = self.jobs.get(job_id)
+        if not job or job_id not in self.queue:
+            return False
+
+        self.queue.remove(job_id)
+        job.pop("held", None)
+        self.stderrReceived.emit(job_id, message)
+        job["exit_code"] = -1
+        job["finished_at"] = time.time()
+        job["status"] = "failed"
+        self._release_key(job)
+        self._remember(job_id)
+
+        self.jobFinished.emit(job_id, -1)
+        self._dispatch()
+        return True
+
+    def post_message(self, job_id: str, message: str):
+        """Añade un aviso de la aplicación a la salida de un trabajo activo"""
+        if job_id in self.running or job_id in self.suspended:
+            self.stderrReceived.emit(job_id, message)
+
+    def shutdown(self, policy: str = "kill", timeout_ms: int = 0):
+        """
+        Deja de lanzar trabajos y termina los activos antes de cerrar la aplicación
+
+        La cola y los reintentos pendientes se cancelan siempre. Con "drain", los trabajos en ejecución (y
+        los pausados, que se reanudan) pueden terminar; pasado timeout_ms se
+        detienen los que queden. Con "kill" se detienen en el acto. Se emite
+        drained cuando ningún ejecutor tiene trabajos vivos, o como mucho
+        cancel_grace_ms después de detenerlos.
+
+        Args:
+            policy: "drain" o "kill"
+            timeout_ms: Espera máxima de "drain" (0 = sin límite)
+        """
+        if self.shutting_down:
+            if policy == "kill":
+                self._kill_all()
+            return
+        self.shutting_down = True
+        self.admission_timer.stop()
+
+        for job_id in list(self.queue) + list(self.retry_timers):
+            self.cancel(job_id)
+
+        if policy == "drain":
+            for job_id in list(self.suspended):
+                self._resume(self.jobs[job_id])
+            if timeout_ms:
+                QTimer.singleShot(timeout_ms, self._kill_all)
+        else:
+            self._kill_all()
+
+        self.drain_timer = QTimer(self)
+        self.drain_timer.setInterval(100)
+        self.drain_timer.timeout.connect(self._check_drained)
+        self.drain_timer.start()
+        self._check_drained()
+
+    def is_busy(self) -> bool:
+        """Indica si algún ejecutor tiene trabajos vivos (incluidos los que se están deteniendo)"""
+        return any(executor.running_jobs() for executor in self.executors.values())
+
+    def set_max_workers(self, max_workers: int):
+        """Cambia el límite global de workers y lanza lo que quepa"""
+        self.max_workers = max(1, int(max_workers))
+        self._dispatch()
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Obtiene un trabajo (en cola, en ejecución o terminado)"""
+        return self.jobs.get(job_id)
+
+    def get_jobs(self, status: Optional[str] = None) -> List[Dict]:
+        """
+        Lista los trabajos conocidos en orden de llegada
+
+        Args:
+            status: Filtra por estado (queued, running, suspended, finished, failed, cancelled);
+                    los trabajos que esperan un reintento están en "queued"
+        """
+        jobs = sorted(self.jobs.values(), key=lambda job: job["queued_at"])
+        if status:
+            jobs = [job for job in jobs if job["status"] == status]
+        return jobs
+
+    def queue_position(self, job_id: str) -> int:
+        """Posición en la cola (0 = siguiente), -1 si no está en cola"""
+        ordered = sorted(self.queue, key=lambda queued_id: self._dispatch_order(self.jobs[queued_id]))
+        try:
+            return ordered.index(job_id)
+        except ValueError:
+            return -1
+
+    def running_count(self, automation_id: str) -> int:
+        """Trabajos en ejecución de una automatización"""
+        return sum(1 for job_id in self.running if self.jobs[job_id]["automation_id"] == automation_id)
+
+    def _kill_all(self):
+        for job_id in list(self.running) + list(self.suspended):
+            self.cancel(job_id)
+        # Ejecutores que no pueden interrumpir su trabajo no deben bloquear el cierre
+        QTimer.singleShot(self.cancel_grace_ms + 500, self._emit_drained)
+
+    def _check_drained(self):
+        if not self.is_busy():
+            self._emit_drained()
+
+    def _emit_drained(self):
+        if self.drain_timer is None or not self.drain_timer.isActive():
+            return
+        self.drain_timer.stop()
+        self.drained.emit()
+
+    def _dispatch(self):
+        """
+        Lanza o reanuda trabajos por prioridad respetando los límites
+
+        Sin workers libres, un trabajo puede pausar a otro en ejecución de
+        menor prioridad; los pausados se reanudan antes que los trabajos en
+        cola de su misma prioridad. Si el control de admisión rechaza al
+        siguiente trabajo, la cola espera (nadie lo adelanta) y se reintenta.
+        Los trabajos retenidos ("held") no bloquean a los demás.
+        """
+        if self.shutting_down:
+            return
+        candidates = sorted(
+            list(self.queue) + list(self.suspended),
+            key=lambda job_id: self._dispatch_order(self.jobs[job_id])
+        )
+        for job_id in candidates:
+            job = self.jobs[job_id]
+            if job.get("held"):
+                continue
+            max_concurrency = job.get("max_concurrency")
+            if max_concurrency and self.running_count(job["automation_id"]) >= max_concurrency:
+                continue
+
+            slots_full = len(self.running) >= self.max_workers
+            if slots_full and (job_id in self.suspended or not self._preemption_victims(job)):
+                break
+
+            if job_id not in self.suspended and not self._admit(job):
+                break
+
+            if slots_full and not self._preempt_for(job):
+                break
+
+            if job_id in self.suspended:
+                self._resume(job)
+            else:
+                self.queue.remove(job_id)
+                self._start(job)
+
+    def _admit(self, job: Dict) -> bool:
+        """Consulta el control de admisión; si rechaza, programa un reintento"""
+        if self.admission is None or self.admission.can_start(job):
+            job.pop("waiting_for", None)
+            return True
+        if job.get("waiting_for") != self.admission.reason:
+            job["waiting_for"] = self.admission.reason
+            print(f"⏳ {job['automation_id']} (job {job['id']}) en espera: {self.admission.reason}")
+        if not self.admission_timer.isActive():
+            self.admission_timer.start()
+        return False
+
+    def _dispatch_order(self, job: Dict) -> tuple:
+        predicted = 0.0
+        if self.shortest_job_first:
+            # El tiempo en cola descuenta la duración prevista: un trabajo largo
+            # acaba pasando por delante en vez de esperar indefinidamente
+            predicted = max(0.0, (job.get("predicted_seconds") or 0) - (time.time() - job["queued_at"]))
+        return (job["priority"], job["status"] != "suspended", predicted, job["queued_at"])
+
+    def _preemption_victims(self, job: Dict) -> List[Dict]:
+        """Trabajos en ejecución que se pueden pausar en favor de job, del mejor candidato al peor"""
+        if not self.preemption:
+            return []
+        victims = [
+            self.jobs[job_id] for job_id in self.running
+            if self.jobs[job_id]["priority"] > job["priority"]
+            and hasattr(self._executor_for(self.jobs[job_id]), "suspend")
+        ]
+        # Primero los de menor prioridad y, entre ellos, los que llevan menos tiempo
+        victims.sort(key=lambda victim: (victim["priority"], victim["started_at"]), reverse=True)
+        return victims
+
+    def _preempt_for(self, job: Dict) -> bool:
+        """Pausa el trabajo en ejecución menos prioritario para liberar un worker"""
+        return any(self._suspend(victim) for victim in self._preemption_victims(job))
+
+    def _suspend(self, job: Dict) -> bool:
+        if not self._executor_for(job).suspend(job["id"]):
+            return False
+        self.running.discard(job["id"])
+        self.suspended.add(job["id"])
+        job["status"] = "suspended"
+        job["suspended_at"] = time.time()
+        self._pause_timeout(job)
+        self.jobSuspended.emit(job["id"])
+        return True
+
+    def _resume(self, job: Dict):
+        self._executor_for(job).resume(job["id"])
+        self.suspended.discard(job["id"])
+        self.running.add(job["id"])
+        job["status"] = "running"
+        job["suspended_seconds"] = job.get("suspended_seconds", 0) + time.time() - job.pop("suspended_at")
+        self._start_timeout(job, job.pop("timeout_remaining_ms", None))
+        self.jobResumed.emit(job["id"])
+
+    def _start(self, job: Dict):
+        job["status"] = "running"
+        job["started_at"] = time.time()
+        self.running.add(job["id"])
+        self._start_timeout(job)
+        if self.admission:
+            self.admission.job_started(job)
+        self._executor_for(job).start(job)
+
+    def _executor_for(self, job: Dict) -> QObject:
+        return self.executors.get(job.get("executor")) or self.runner
+
+    def _terminate(self, job: Dict, grace_ms: Optional[int] = None) -> bool:
+        """Pide al ejecutor que termine el trabajo; False si no sabe interrumpirlo"""
+        cancel = getattr(self._executor_for(job), "cancel", None)
+        if cancel is None:
+            return False
+        return cancel(job["id"], self.cancel_grace_ms if grace_ms is None else grace_ms)
+
+    def _start_timeout(self, job: Dict, remaining_ms: Optional[int] = None):
+        timeout = job.get("timeout_seconds")
+        if not timeout:
+            return
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self._on_timeout(job["id"]))
+        timer.start(int(timeout * 1000) if remaining_ms is None else max(0, remaining_ms))
+        self.timeouts[job["id"]] = timer
+
+    def _pause_timeout(self, job: Dict):
+        """El tiempo en pausa no cuenta para timeout_seconds"""
+        timer = self.timeouts.get(job["id"])
+        if timer is not None:
+            job["timeout_remaining_ms"] = timer.remainingTime()
+            self._stop_timeout(job["id"])
+
+    def _stop_timeout(self, job_id: str):
+        timer = self.timeouts.pop(job_id, None)
+        if timer is not None:
+            timer.stop()
+            timer.deleteLater()
+
+    def _on_timeout(self, job_id: str):
+        """El trabajo excedió timeout_seconds: se detiene y se da por fallido"""
+        self._stop_timeout(job_id)
+        job = self.jobs.get(job_id)
+        if not job or job_id not in self.running:
+            return
+
+        job["timed_out"] = True
+        self.abort(job_id, "timeout", f"⏱️  Tiempo límite excedido ({job['timeout_seconds']} s), deteniendo el trabajo\n")
+
+    def _on_job_stdout(self, job_id: str, text: str):
+        job = self.jobs.get(job_id)
+        if job is not None and (job_id in self.running or job_id in self.suspended):
+            text = self.progress.feed(job, text)
+        if text:
+            self.stdoutReceived.emit(job_id, text)
+
+    def _on_job_finished(self, job_id: str, exit_code: int):
+        job = self.jobs.get(job_id)
+        if not job or (job_id not in self.running and job_id not in self.suspended):
+            return
+
+        rest = self.progress.forget(job_id)
+        if rest:
+            self.stdoutReceived.emit(job_id, rest)
+        self.running.discard(job_id)
+        self.suspended.discard(job_id)
+        self._stop_timeout(job_id)
+        job["exit_code"] = exit_code
+        job["finished_at"] = time.time()
+        self._record_attempt(job, exit_code)
+        if self.admission:
+            self.admission.job_finished(job)
+
+        if self._should_retry(job, exit_code):
+            self._schedule_retry(job)
+            self._dispatch()
+            return
+
+        self._release_key(job)
+        job["status"] = "finished" if exit_code == 0 and not job.get("aborted") else "failed"
+        self._remember(job_id)
+
+        self.jobFinished.emit(job_id, exit_code)
+        self._dispatch()
+
+    def _record_attempt(self, job: Dict, exit_code: Optional[int]):
+        """Añade el intento que acaba de terminar (o cancelarse) al historial del trabajo"""
+        job["attempts"].append({
+            "attempt": len(job["attempts"]) + 1,
+            "started_at": job["started_at"],
+            "finished_at": time.time(),
+            "exit_code": exit_code,
+            "suspended_seconds": job.get("suspended_seconds", 0),
+            "aborted": job.get("aborted")
+        })
+
+    def _should_retry(self, job: Dict, exit_code: int) -> bool:
+        """Fallo con un código reintentable y aún quedan intentos (timeout y cuelgues no se reintentan)"""
+        policy = job.get("retry")
+        if not policy or exit_code == 0 or job.get("aborted") or self.shutting_down:
+            return False
+        if len(job["attempts"]) >= policy["max_attempts"]:
+            return False
+        return not policy["exit_codes"] or exit_code in policy["exit_codes"]
+
+    def _schedule_retry(self, job: Dict):
+        """
+        Vuelve a encolar el trabajo tras el backoff
+
+        Durante la espera el trabajo no ocupa worker: queda en estado "queued"
+        fuera de la cola, con la hora prevista en "retry_at".
+        """
+        attempt = len(job["attempts"])
+        delay = retry_delay(job["retry"], attempt)
+        self.stderrReceived.emit(
+            job["id"],
+            f"🔁 Intento {attempt}/{job['retry']['max_attempts']} fallido (código {job['exit_code']}), "
+            f"se reintenta en {delay:.1f} s\n"
+        )
+        print(f"🔁 {job['automation_id']} (job {job['id']}): reintento {attempt + 1} en {delay:.1f} s")
+
+        for key in ("suspended_seconds", "timeout_remaining_ms", "hung", "progress"):
+            job.pop(key, None)
+        job["status"] = "queued"
+        job["started_at"] = job["finished_at"] = job["exit_code"] = None
+        job["retry_at"] = time.time() + delay
+
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self._requeue(job["id"]))
+        timer.start(int(delay * 1000))
+        self.retry_timers[job["id"]] = timer
+        self.jobRetrying.emit(job["id"], delay)
+
+    def _requeue(self, job_id: str):
+        self._stop_retry(job_id)
+        job = self.jobs.get(job_id)
+        if not job or job["status"] != "queued" or self.shutting_down:
+            return
+        job.pop("retry_at", None)
+        # Conserva su queued_at original: no pierde el turno frente a los que llegaron después
+        self.queue.append(job_id)
+        self._dispatch()
+
+    def _stop_retry(self, job_id: str):
+        timer = self.retry_timers.pop(job_id, None)
+        if timer is not None:
+            timer.stop()
+            timer.deleteLater()
+
+    def _release_key(self, job: Dict):
+        """A partir de aquí una petición idéntica lanza un trabajo nuevo"""
+        key = job.get("dedup_key")
+        if key and self.active_keys.get(key) == job["id"]:
+            del self.active_keys[key]
+
+    def _remember(self, job_id: str):
+        """Guarda el trabajo en el historial acotado de terminados"""
+        self.finished.append(job_id)
+        while len(self.finished) > self.history_size:
+            self.jobs.pop(self.finished.popleft(), None)
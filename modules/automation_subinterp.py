@@ -0,0 +1,284 @@
+"""
+Automation Subinterpreter Executor
+Ejecuta cada run.py en un subintérprete propio (GIL por intérprete, Python 3.12+)
+"""
+
+import os
+import sys
+import queue
+import threading
+from typing import Dict
+
+from PySide6.QtCore import QCoreApplication, Signal
+
+from .automation_launcher import SCRIPT_HELPERS_DIR
+from .automation_pipes import PipeExecutorBase
+
+
+# Módulos importados de antemano en los subintérpretes de reserva
+PRELOAD_CODE = "import runpy, pkgutil, traceback, csv, json, zipfile, pathlib, datetime"
+
+# Cuerpo de cada trabajo dentro del subintérprete. Los descriptores son del
+# proceso, así que la salida llega por pipes igual que en un proceso hijo.
+JOB_CODE = """
+import io, os, sys, runpy, traceback
+# Entorno del trabajo solo para este subintérprete: os.environ.update()
+# llamaría a putenv, que cambiaría el entorno de todo el proceso
+os.environ = dict(os.environ, **{env!r})
+sys.stdin = io.StringIO({stdin!r})
+sys.stdout = open({stdout_fd}, "w", closefd=False, buffering=1, encoding="utf-8", errors="replace")
+sys.stderr = open({stderr_fd}, "w", closefd=False, buffering=1, encoding="utf-8", errors="replace")
+sys.argv = {argv!r}
+sys.path.insert(0, {folder!r})
+sys.path.append({helpers!r})
+code = 0
+try:
+    runpy.run_path({run_file!r}, run_name="__main__")
+except SystemExit as e:
+    if e.code is None:
+        code = 0
+    elif isinstance(e.code, int):
+        code = e.code
+    else:
+        print(e.code, file=sys.stderr)
+        code = 1
+except BaseException:
+    traceback.print_exc()
+    code = 1
+finally:
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.write({status_fd}, str(code).encode())
+"""
+
+
+class InterpretersAPI:
+    """Adaptador sobre las distintas APIs de subintérpretes según la versión de Python"""
+
+    def __init__(self):
+        self.backend = None
+        if sys.version_info < (3, 12):
+            # Antes de 3.12 los subintérpretes comparten el GIL: no aportan paralelismo
+            return
+
+        try:
+            from concurrent import interpreters  # Python 3.14+
+            self.module = interpreters
+            self.backend = "concurrent"
+            return
+        except ImportError:
+            pass
+
+        for name in ("_interpreters", "_xxsubinterpreters"):  # 3.13 / 3.12
+            try:
+                self.module = __import__(name)
+                self.backend = name
+                return
+            except ImportError:
+                continue
+
+    @property
+    def available(self) -> bool:
+        return self.backend is not None
+
+    @property
+    def cross_thread(self) -> bool:
+        """En 3.12 destruir un intérprete creado en otro hilo se bloquea"""
+        return self.backend != "_xxsubinterpreters"
+
+    def create(self):
+        if self.backend == "concurrent":
+            return self.module.create()
+        if self.backend == "_xxsubinterpreters":
+            return self.module.create(isolated=True)
+        return self.module.create("isolated")
+
+    def exec(self, interp, code: str):
+        """Ejecuta código; lanza RuntimeError si termina con una excepción sin capturar"""
+        if self.backend == "concurrent":
+            try:
+                interp.exec(code)
+            except self.module.ExecutionFailed as e:
+                raise RuntimeError(str(e))
+        elif self.backend == "_interpreters":
+            excinfo = self.module.exec(interp, code)
+            if excinfo is not None:
+                raise RuntimeError(getattr(excinfo, "formatted", None) or str(excinfo))
+        else:
+            try:
+                self.module.run_string(interp, code)
+            except self.module.RunFailedError as e:
+                raise RuntimeError(str(e))
+
+    def destroy(self, interp):
+        if self.backend == "concurrent":
+            interp.close()
+        else:
+            self.module.destroy(interp)
+
+
+INTERPRETERS = InterpretersAPI()
+
+
+def is_supported() -> bool:
+    """Indica si el intérprete actual permite subintérpretes con GIL propio"""
+    return INTERPRETERS.available
+
+
+class AutomationSubinterpreterExecutor(PipeExecutorBase):
+    """
+    Ejecutor de subintérpretes: aislamiento de módulos sin lanzar procesos
+
+    Cada trabajo usa un subintérprete nuevo que se destruye al terminar. Se
+    mantienen algunos ya creados y con la biblioteca estándar importada para
+    que el arranque no quede en el camino crítico.
+
+    El estado del proceso no se toca: job["env"] solo llega al os.environ del
+    subintérprete (los procesos que lance el script heredan el de la
+    aplicación salvo que pasen env=os.environ) y run.py se ejecuta con rutas
+    absolutas. El directorio de trabajo no se puede cambiar por intérprete:
+    load_automations solo envía aquí automatizaciones con "needs_cwd": false.
+    """
+
+    _exitReported = Signal(str, int)  # job_id, exit_code (desde el hilo del trabajo)
+
+    def __init__(self, spares: int = 2, parent=None):
+        """
+        Inicializa el ejecutor
+
+        Args:
+            spares: Subintérpretes preparados de reserva
+        """
+        super().__init__(parent)
+        self.spares = spares
+        self.spare_interpreters = queue.Queue()
+        self.preparing = 0
+        self.lock = threading.Lock()
+        self.closing = False
+        self._exitReported.connect(self._set_exit_code)
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def prewarm(self):
+        """Prepara subintérpretes de reserva en segundo plano"""
+        if not INTERPRETERS.cross_thread:
+            return
+        with self.lock:
+            missing = self.spares - self.spare_interpreters.qsize() - self.preparing
+            self.preparing += max(0, missing)
+        for _ in range(missing):
+            threading.Thread(target=self._prepare_spare, daemon=True).start()
+
+    def start(self, job: Dict):
+        """
+        Lanza el trabajo en un hilo con su propio subintérprete
+
+        Args:
+            job: Diccionario del trabajo (id, run_file, argv)
+        """
+        stdout_r, stdout_w = os.pipe()
+        stderr_r, stderr_w = os.pipe()
+        self._track_job(job["id"], stdout_r, stderr_r)
+
+        threading.Thread(
+            target=self._run, args=(job, stdout_w, stderr_w), daemon=True,
+            name=f"subinterp-{job['id']}"
+        ).start()
+        self.jobStarted.emit(job["id"])
+
+    def run_blocking(self, job: Dict, output_fd: int) -> int:
+        """
+        Ejecuta el trabajo en el hilo que llama y espera a que termine
+
+        Un subintérprete no se puede interrumpir: no hay timeout, así que
+        execute_automation solo lo usa en automatizaciones sin timeout_seconds.
+
+        Args:
+            job: Diccionario del trabajo (id, run_file, argv, cwd, env, stdin_data)
+            output_fd: Descriptor donde se escriben stdout y stderr
+
+        Returns:
+            Código de salida
+        """
+        return self._execute(job, output_fd, output_fd)
+
+    def shutdown(self):
+        """Destruye los subintérpretes de reserva"""
+        self.closing = True
+        while True:
+            try:
+                interp = self.spare_interpreters.get_nowait()
+            except queue.Empty:
+                break
+            INTERPRETERS.destroy(interp)
+
+    def _prepare_spare(self):
+        interp = None
+        try:
+            interp = INTERPRETERS.create()
+            INTERPRETERS.exec(interp, PRELOAD_CODE)
+        except Exception as e:
+            print(f"⚠️  No se pudo preparar un subintérprete: {e}")
+            if interp is not None:
+                INTERPRETERS.destroy(interp)
+            interp = None
+        finally:
+            with self.lock:
+                self.preparing -= 1
+        if interp is not None:
+            self.spare_interpreters.put(interp)
+
+    def _take_interpreter(self):
+        try:
+            return self.spare_interpreters.get_nowait()
+        except queue.Empty:
+            interp = INTERPRETERS.create()
+            INTERPRETERS.exec(interp, PRELOAD_CODE)
+            return interp
+
+    def _run(self, job: Dict, stdout_w: int, stderr_w: int):
+        try:
+            code = self._execute(job, stdout_w, stderr_w)
+        finally:
+            os.close(stdout_w)
+            os.close(stderr_w)
+        self._exitReported.emit(job["id"], code)
+
+    def _execute(self, job: Dict, stdout_w: int, stderr_w: int) -> int:
+        """Ejecuta run.py en un subintérprete con el entorno del trabajo"""
+        status_r, status_w = os.pipe()
+        interp = None
+        code = 1
+        try:
+            interp = self._take_interpreter()
+            if not self.closing:
+                self.prewarm()
+
+            run_file = os.path.abspath(job["run_file"])
+            INTERPRETERS.exec(interp, JOB_CODE.format(
+                stdout_fd=stdout_w,
+                stderr_fd=stderr_w,
+                status_fd=status_w,
+                env=dict(job.get("env") or {}),
+                argv=[run_file] + list(job["argv"]),
+                folder=os.path.dirname(run_file),
+                helpers=SCRIPT_HELPERS_DIR,
+                stdin=job.get("stdin_data") or "",
+                run_file=run_file
+            ))
+            os.close(status_w)
+            status_w = None
+            status = os.read(status_r, 64)
+            code = int(status) if status else 1
+        except Exception as e:
+            os.write(stderr_w, f"❌ Error en el subintérprete: {e}\n".encode("utf-8", errors="replace"))
+            code = 1
+        finally:
+            if interp is not None:
+                INTERPRETERS.destroy(interp)
+            for fd in (status_r, status_w):
+                if fd is not None:
+                    os.close(fd)
+        return code
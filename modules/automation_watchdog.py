@@ -0,0 +1,201 @@
+"""
+Automation Watchdog
+Detección de trabajos colgados: sin CPU, sin E/S y sin salida durante un tiempo
+"""
+
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from .automation_launcher import STACK_DUMP_SIGNAL
+from .automation_resources import scan_process_groups
+
+# Acciones ante un trabajo colgado (clave "hang_action" de ui_config.json)
+HANG_ACTIONS = ("warn", "kill")
+
+# Ejecutores que corren el script dentro de la propia aplicación: no tienen un
+# grupo de procesos propio que medir, así que no se vigilan
+UNWATCHED_EXECUTORS = ("inprocess", "subinterpreter")
+
+
+def read_io_bytes(pid: int) -> Optional[int]:
+    """
+    Bytes leídos y escritos por un proceso según /proc/<pid>/io (rchar + wchar)
+
+    Incluye pipes y sockets, no solo disco. None si no se puede leer.
+    """
+    try:
+        with open(f"/proc/{pid}/io", "r") as f:
+            counters = dict(line.split(":", 1) for line in f if ":" in line)
+        return int(counters["rchar"]) + int(counters["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def scan_activity(pids: List[int]) -> Dict[int, Tuple[int, int]]:
+    """
+    Actividad acumulada de los grupos de procesos indicados
+
+    Args:
+        pids: Líderes de los grupos
+
+    Returns:
+        Diccionario {pid: (ticks de CPU, bytes de E/S)} de los grupos que siguen vivos
+    """
+    groups = scan_process_groups()
+    activity = {}
+    for pid in pids:
+        if pid not in groups:
+            continue
+        io_bytes = [read_io_bytes(member) for member in groups[pid]["pids"]]
+        activity[pid] = (groups[pid]["cpu_ticks"], sum(value for value in io_bytes if value is not None))
+    return activity
+
+
+class AutomationWatchdog(QObject):
+    """
+    Vigila los trabajos en ejecución que declaran "hang_seconds"
+
+    En cada muestreo suma el tiempo de CPU (/proc/<pid>/stat) y los bytes de
+    E/S (/proc/<pid>/io) de todo el grupo de procesos del trabajo; cualquier
+    cambio, o salida nueva por stdout/stderr, cuenta como actividad. Si no hay
+    actividad durante hang_seconds, el trabajo se marca como colgado y, con
+    "hang_action": "kill", se le pide un volcado de pila y se detiene.
+    Los trabajos pausados por el planificador no se vigilan, ni los de los
+    ejecutores inprocess y subinterpreter (UNWATCHED_EXECUTORS). El recorrido
+    de /proc se hace en un hilo del scanner, no en el de la interfaz.
+    """
+
+    jobHung = Signal(str)  # job_id
+
+    def __init__(self, scheduler, scanner, interval_ms: int = 5000, stack_dump_wait_ms: int = 2000, parent=None):
+        """
+        Inicializa el watchdog
+
+        Args:
+            scheduler: AutomationScheduler cuyos trabajos se vigilan
+            scanner: InputInspector en el que se recorre /proc
+            interval_ms: Intervalo de muestreo
+            stack_dump_wait_ms: Espera entre pedir el volcado de pila y detener el trabajo
+        """
+        super().__init__(parent)
+        self.scheduler = scheduler
+        self.scanner = scanner
+        self.stack_dump_wait_ms = stack_dump_wait_ms
+        self.watched = {}
+        self.posting = False
+        self.scan_targets = None  # {job_id: pid} de la medición en curso
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.sample)
+
+        scheduler.jobStarted.connect(self._watch)
+        scheduler.jobResumed.connect(self._watch)
+        scheduler.jobSuspended.connect(self._forget)
+        scheduler.jobRetrying.connect(self._forget)
+        scheduler.jobFinished.connect(self._forget)
+        scheduler.stdoutReceived.connect(self._on_output)
+        scheduler.stderrReceived.connect(self._on_output)
+        scheduler.jobProgress.connect(self._on_output)
+
+    def sample(self):
+        """Mide en segundo plano la actividad de cada trabajo vigilado"""
+        if self.scan_targets is not None:
+            return
+        targets = {}
+        for job_id in self.watched:
+            pid = self.scheduler.process_id(job_id)
+            if pid:
+                targets[job_id] = pid
+        if not targets:
+            return
+        self.scan_targets = targets
+        self.scanner.submit(scan_activity, (list(targets.values()),), self._on_scan)
+
+    def _on_scan(self, activity: Optional[Dict[int, Tuple[int, int]]], error: Optional[Exception]):
+        targets, self.scan_targets = self.scan_targets, None
+        if error is not None:
+            return
+        now = time.monotonic()
+        for job_id, pid in targets.items():
+            state = self.watched.get(job_id)
+            job = self.scheduler.get_job(job_id)
+            # Si el trabajo terminó o cambió de proceso durante la medición, no vale
+            if state is None or not job or pid not in activity or self.scheduler.process_id(job_id) != pid:
+                continue
+
+            counters = activity[pid]
+            if counters != state["counters"]:
+                state["counters"] = counters
+                self._mark_active(job, state, now)
+            elif now - state["last_activity"] >= job["hang_seconds"] and not state["hung"]:
+                self._on_hang(job, state, pid)
+
+    def _watch(self, job_id: str):
+        job = self.scheduler.get_job(job_id)
+        if not job or not job.get("hang_seconds") or job.get("executor") in UNWATCHED_EXECUTORS:
+            return
+        self.watched[job_id] = {"counters": None, "last_activity": time.monotonic(), "hung": False, "killing": False}
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def _forget(self, job_id: str, *args):
+        self.watched.pop(job_id, None)
+        if not self.watched:
+            self.timer.stop()
+
+    def _on_output(self, job_id: str, text: str = ""):
+        state = self.watched.get(job_id)
+        if state is not None and not self.posting:
+            self._mark_active(self.scheduler.get_job(job_id), state, time.monotonic())
+
+    def _mark_active(self, job: Dict, state: Dict, now: float):
+        # El volcado de pila previo a detenerlo no cuenta como actividad
+        if state["killing"]:
+            return
+        state["last_activity"] = now
+        if state["hung"]:
+            state["hung"] = False
+            job["hung"] = False
+            self._post(job["id"], "▶️  El trabajo vuelve a mostrar actividad\n")
+
+    def _post(self, job_id: str, message: str):
+        """Aviso en la salida del trabajo que no cuenta como actividad suya"""
+        self.posting = True
+        try:
+            self.scheduler.post_message(job_id, message)
+        finally:
+            self.posting = False
+
+    def _on_hang(self, job: Dict, state: Dict, pid: int):
+        state["hung"] = True
+        job["hung"] = True
+        self._post(
+            job["id"], f"🧊 Sin CPU, E/S ni salida desde hace {job['hang_seconds']} s: el trabajo parece colgado\n"
+        )
+        print(f"🧊 {job['automation_id']} (job {job['id']}) parece colgado")
+        self.jobHung.emit(job["id"])
+
+        if job.get("hang_action") != "kill":
+            return
+        state["killing"] = True
+        if job.get("stack_dump") and STACK_DUMP_SIGNAL is not None:
+            # Solo al líder: los procesos que lance el script morirían con SIGUSR1
+            self._post(job["id"], "📋 Volcado de pila antes de detenerlo:\n")
+            try:
+                os.kill(pid, STACK_DUMP_SIGNAL)
+            except OSError:
+                pass
+            QTimer.singleShot(self.stack_dump_wait_ms, lambda: self._kill(job["id"]))
+        else:
+            self._kill(job["id"])
+
+    def _kill(self, job_id: str):
+        job = self.scheduler.get_job(job_id)
+        if job_id in self.watched and job:
+            self.scheduler.abort(
+                job_id, "hang", f"🧊 Deteniendo el trabajo colgado ({job['hang_seconds']} s sin actividad)\n"
+            )
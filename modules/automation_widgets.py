@@ -3,13 +3,30 @@ Automation Widgets
 Widgets personalizados para la interfaz de automatizaciones
 """
 
-from PySide6.QtCore import Qt, Signal
+import os
+import re
+import glob
+
+from PySide6.QtCore import Qt, Signal, QTimer
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
     QLineEdit, QFrame, QScrollArea, QTextEdit, QSizePolicy,
-    QFileDialog, QMessageBox
+    QFileDialog, QMessageBox, QMenu, QInputDialog, QProgressBar
 )
-from PySide6.QtGui import QFont
+from PySide6.QtGui import QColor, QFont, QTextCharFormat, QTextCursor
+
+from .automation_ansi import CARRIAGE_RETURN, AnsiParser
+
+
+def format_duration(seconds):
+    """Duración legible: 45 s, 3 min 20 s, 1 h 05 min"""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds} s"
+    if seconds < 3600:
+        return f"{seconds // 60} min {seconds % 60:02d} s"
+    return f"{seconds // 3600} h {seconds % 3600 // 60:02d} min"
+
 
 class AutomationInputWidget(QFrame):
     """Widget para un input específico de automatización"""
@@ -20,6 +37,7 @@ class AutomationInputWidget(QFrame):
         super().__init__(parent)
         self.input_config = input_config
         self.current_path = ""
+        self.batch_paths = []
         self.setup_ui()
     
     def setup_ui(self):
@@ -99,6 +117,16 @@ class AutomationInputWidget(QFrame):
         self.browse_btn.clicked.connect(self.browse_path)
         input_layout.addWidget(self.browse_btn)
         
+        # Botón de lote: ejecutar la automatización una vez por archivo
+        if self.supports_batch():
+            self.batch_btn = QPushButton("Lote")
+            self.batch_btn.setStyleSheet(self.browse_btn.styleSheet())
+            batch_menu = QMenu(self.batch_btn)
+            batch_menu.addAction("Varios archivos...", self.browse_batch_files)
+            batch_menu.addAction("Carpeta y patrón...", self.browse_batch_pattern)
+            self.batch_btn.setMenu(batch_menu)
+            input_layout.addWidget(self.batch_btn)
+        
         layout.addLayout(input_layout)
         
         # Información adicional del tipo
@@ -139,9 +167,67 @@ class AutomationInputWidget(QFrame):
         if path:
             self.set_path(path)
     
+    def supports_batch(self):
+        """Los inputs de archivo que no son de salida admiten lotes"""
+        return self.input_config.get('type', 'file') == 'file' and self.input_config.get('role') != 'output'
+    
+    def browse_batch_files(self):
+        """Selecciona varios archivos para ejecutar un lote"""
+        paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            f"Seleccionar archivos - {self.input_config['label']}",
+            self.current_path,
+            self.input_config.get('filters', 'All Files (*)')
+        )
+        if paths:
+            self.set_batch_paths(paths)
+    
+    def browse_batch_pattern(self):
+        """Selecciona una carpeta y un patrón glob para ejecutar un lote"""
+        folder = QFileDialog.getExistingDirectory(
+            self,
+            f"Seleccionar carpeta - {self.input_config['label']}",
+            self.current_path
+        )
+        if not folder:
+            return
+        
+        pattern, ok = QInputDialog.getText(
+            self, "Patrón de archivos", "Patrón (use ** para incluir subcarpetas):",
+            text=self.default_pattern()
+        )
+        if not ok or not pattern.strip():
+            return
+        
+        paths = sorted(
+            path for path in glob.glob(os.path.join(folder, pattern.strip()), recursive=True)
+            if os.path.isfile(path)
+        )
+        if not paths:
+            QMessageBox.warning(self, "Lote vacío", f"Ningún archivo coincide con {pattern} en {folder}")
+            return
+        self.set_batch_paths(paths)
+    
+    def default_pattern(self):
+        """Primer patrón de los filtros del input (p. ej. *.csv)"""
+        match = re.search(r"\((\S+?)[ )]", self.input_config.get('filters', ''))
+        return match.group(1) if match else "*"
+    
+    def set_batch_paths(self, paths):
+        """Establece la lista de archivos del lote"""
+        self.batch_paths = list(paths)
+        self.current_path = self.batch_paths[0]
+        self.path_edit.setText(f"{len(self.batch_paths)} archivos (lote) - {os.path.dirname(self.current_path)}")
+        self.pathChanged.emit(self.input_config['id'], self.current_path)
+    
+    def get_batch_paths(self):
+        """Retorna los archivos del lote (vacío si no es un lote)"""
+        return self.batch_paths if len(self.batch_paths) > 1 else []
+    
     def set_path(self, path):
         """Establece la ruta seleccionada"""
         self.current_path = path
+        self.batch_paths = []
         self.path_edit.setText(path)
         self.pathChanged.emit(self.input_config['id'], path)
     
@@ -160,12 +246,28 @@ class AutomationDetailsWidget(QWidget):
     """Widget principal para mostrar detalles de una automatización"""
     
     executeRequested = Signal(dict)  # inputs dict
+    batchRequested = Signal(dict, str, list)  # inputs dict, input_id del lote, archivos
+    stopRequested = Signal()
+    
+    # Intervalo de volcado de la salida en streaming a la consola
+    OUTPUT_FLUSH_INTERVAL_MS = 50
+    # Líneas que conserva la consola; la salida completa queda en el registro del trabajo
+    OUTPUT_MAX_LINES = 5000
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_automation = None
         self.input_widgets = {}
+        self.pending_output = []
+        self.ansi = AnsiParser()
+        self.carriage_return = False
+        self.output_formats = {}
         self.setup_ui()
+        
+        # Los fragmentos recibidos se acumulan y se pintan juntos en cada tick
+        self.output_flush_timer = QTimer(self)
+        self.output_flush_timer.setInterval(self.OUTPUT_FLUSH_INTERVAL_MS)
+        self.output_flush_timer.timeout.connect(self.flush_output)
     
     def setup_ui(self):
         """Configura la interfaz principal"""
@@ -293,11 +395,38 @@ class AutomationDetailsWidget(QWidget):
         self.execute_btn.clicked.connect(self.execute_automation)
         buttons_layout.addWidget(self.execute_btn)
         
+        # Botón de detener
+        self.stop_btn = QPushButton("Detener")
+        self.stop_btn.setStyleSheet("""
+            QPushButton {
+                background-color: rgb(255, 85, 85);
+                border: none;
+                border-radius: 5px;
+                padding: 12px 20px;
+                color: rgb(255, 255, 255);
+                font-weight: bold;
+                font-size: 12px;
+            }
+            QPushButton:hover {
+                background-color: rgb(255, 100, 100);
+            }
+            QPushButton:pressed {
+                background-color: rgb(235, 70, 70);
+            }
+            QPushButton:disabled {
+                background-color: rgb(60, 65, 75);
+                color: rgb(150, 150, 150);
+            }
+        """)
+        self.stop_btn.clicked.connect(self.stopRequested)
+        buttons_layout.addWidget(self.stop_btn)
+        
         self.content_layout.addLayout(buttons_layout)
         
         # Inicialmente deshabilitar botones
         self.validate_btn.setEnabled(False)
         self.execute_btn.setEnabled(False)
+        self.stop_btn.setEnabled(False)
     
     def create_output_area(self):
         """Crea el área de salida para logs"""
@@ -312,9 +441,31 @@ class AutomationDetailsWidget(QWidget):
         """)
         self.content_layout.addWidget(output_label)
         
+        # Progreso agregado (lotes); oculto mientras no se use
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setStyleSheet("""
+            QProgressBar {
+                background-color: rgb(33, 37, 43);
+                border: 1px solid rgb(60, 65, 75);
+                border-radius: 5px;
+                color: rgb(255, 255, 255);
+                font-size: 11px;
+                text-align: center;
+                height: 20px;
+            }
+            QProgressBar::chunk {
+                background-color: rgb(80, 250, 123);
+                border-radius: 4px;
+            }
+        """)
+        self.progress_bar.hide()
+        self.content_layout.addWidget(self.progress_bar)
+        
         self.output_text = QTextEdit()
         self.output_text.setMaximumHeight(200)
         self.output_text.setReadOnly(True)
+        self.output_text.setUndoRedoEnabled(False)
+        self.output_text.document().setMaximumBlockCount(self.OUTPUT_MAX_LINES)
         self.output_text.setStyleSheet("""
             QTextEdit {
                 background-color: rgb(20, 22, 26);
@@ -345,7 +496,9 @@ class AutomationDetailsWidget(QWidget):
         self.execute_btn.setEnabled(True)
         
         # Limpiar salida
+        self.discard_pending_output()
         self.output_text.clear()
+        self.hide_progress()
     
     def create_input_widgets(self, inputs_config):
         """Crea los widgets para los inputs de la automatización"""
@@ -424,13 +577,163 @@ class AutomationDetailsWidget(QWidget):
             self.validate_inputs()
             return
         
-        self.output_text.setPlainText("🚀 Ejecutando automatización...\n")
+        # Un input con varios archivos convierte la ejecución en un lote
+        for input_id, input_widget in self.input_widgets.items():
+            batch_paths = input_widget.get_batch_paths()
+            if batch_paths:
+                self.set_output(f"🚀 Ejecutando lote de {len(batch_paths)} archivos...\n")
+                self.batchRequested.emit(inputs, input_id, batch_paths)
+                return
+        
+        self.set_output("🚀 Ejecutando automatización...\n")
         self.executeRequested.emit(inputs)
     
     def append_output(self, text):
         """Agrega texto al área de salida"""
+        self.flush_output()
+        # Los mensajes propios no heredan el color que dejara abierto el script
+        self.output_text.setCurrentCharFormat(QTextCharFormat())
         self.output_text.append(text)
+        self.carriage_return = False
     
     def set_output(self, text):
         """Establece el texto completo del área de salida"""
-        self.output_text.setPlainText(text)
\ No newline at end of file
+        self.discard_pending_output()
+        self.ansi = AnsiParser()
+        self.carriage_return = False
+        self.output_text.clear()
+        self.insert_output(text)
+    
+    def write_output(self, text):
+        """Encola un fragmento de salida en streaming; se pinta en el siguiente tick"""
+        self.pending_output.append(text)
+        if not self.output_flush_timer.isActive():
+            self.output_flush_timer.start()
+    
+    def flush_output(self):
+        """Inserta de una sola vez toda la salida pendiente en la consola"""
+        self.output_flush_timer.stop()
+        if not self.pending_output:
+            return
+        
+        text = "".join(self.pending_output)
+        self.pending_output.clear()
+        self.insert_output(text)
+    
+    def finish_output(self):
+        """Pinta la salida pendiente al terminar el trabajo, incluido lo que retenía el intérprete ANSI"""
+        self.flush_output()
+        self.insert_segments(self.ansi.flush())
+    
+    def insert_output(self, text):
+        """Inserta texto al final de la consola, con los colores ANSI que traiga"""
+        self.insert_segments(self.ansi.feed(text))
+    
+    def insert_segments(self, segments):
+        """Inserta al final de la consola tramos (texto, estilo) del intérprete ANSI"""
+        if not segments:
+            return
+        cursor = self.output_text.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        for segment, style in segments:
+            if segment == CARRIAGE_RETURN:
+                self.carriage_return = True
+                continue
+            if self.carriage_return:
+                # Tras un "\r" (barras de progreso), el texto nuevo reemplaza la línea
+                self.carriage_return = False
+                if not segment.startswith("\n"):
+                    cursor.movePosition(QTextCursor.StartOfBlock, QTextCursor.KeepAnchor)
+                    cursor.removeSelectedText()
+            cursor.insertText(segment, self.output_format(style))
+        self.output_text.setTextCursor(cursor)
+        self.output_text.ensureCursorVisible()
+    
+    def output_format(self, style):
+        """Formato de texto para un estilo ANSI (se reutiliza entre inserciones)"""
+        text_format = self.output_formats.get(style)
+        if text_format is None:
+            foreground, background, bold, italic, underline = style
+            text_format = QTextCharFormat()
+            if foreground is not None:
+                text_format.setForeground(QColor(*foreground))
+            if background is not None:
+                text_format.setBackground(QColor(*background))
+            if bold:
+                text_format.setFontWeight(QFont.Bold)
+            text_format.setFontItalic(italic)
+            text_format.setFontUnderline(underline)
+            self.output_formats[style] = text_format
+        return text_format
+    
+    def discard_pending_output(self):
+        """Descarta la salida pendiente sin pintarla"""
+        self.output_flush_timer.stop()
+        self.pending_output.clear()
+    
+    def set_progress(self, value, total, text=""):
+        """
+        Muestra la barra de progreso
+        
+        Args:
+            value: Unidades completadas
+            total: Unidades totales (0 = indeterminado)
+            text: Texto sobre la barra (por defecto, porcentaje)
+        """
+        self.progress_bar.setRange(0, max(0, int(total)))
+        self.progress_bar.setValue(min(int(value), int(total)) if total else 0)
+        self.progress_bar.setFormat(text or "%p%")
+        self.progress_bar.show()
+    
+    def set_eta(self, elapsed, predicted):
+        """
+        Muestra el avance estimado de un trabajo según su duración prevista
+        
+        Args:
+            elapsed: Segundos de ejecución
+            predicted: Duración prevista en segundos
+        """
+        if elapsed < predicted:
+            text = f"⏱️ ~{format_duration(predicted - elapsed)} restantes (estimado)"
+        else:
+            text = f"⏱️ Superando la duración estimada ({format_duration(predicted)})"
+        # Nunca 100% mientras el trabajo siga en marcha
+        self.set_progress(min(elapsed / predicted, 0.99) * 1000 if predicted else 0, 1000, text)
+    
+    def set_job_progress(self, progress):
+        """
+        Muestra el progreso que informa el propio trabajo (líneas "@@progress")
+
+        Args:
+            progress: job["progress"] (progress, total, stage, message, rate, eta)
+        """
+        value = progress.get('progress')
+        total = progress.get('total')
+        parts = [progress['stage']] if progress.get('stage') else []
+        if value is not None:
+            parts.append(f"{value:g}/{total:g}" if total else f"{value:g}")
+        if progress.get('rate'):
+            parts.append(f"{progress['rate']:.1f}/s")
+        if progress.get('eta') is not None:
+            parts.append(f"⏱️ ~{format_duration(progress['eta'])} restantes")
+        if progress.get('message'):
+            message = progress['message']
+            parts.append(message if len(message) <= 60 else "…" + message[-59:])
+
+        if total and value is not None:
+            self.set_progress(value / total * 1000, 1000, " · ".join(parts))
+        else:
+            # Sin total conocido: barra indeterminada
+            self.set_progress(0, 0, " · ".join(parts))
+
+    def hide_progress(self):
+        """Oculta la barra de progreso"""
+        self.progress_bar.hide()
+    
+    def set_active_jobs(self, count):
+        """Muestra en el botón cuántos trabajos de la automatización están en curso"""
+        if count:
+            self.execute_btn.setText(f"Ejecutar Automatización ({count} en curso)")
+        else:
+            self.execute_btn.setText("Ejecutar Automatización")
+        self.stop_btn.setEnabled(bool(count))
@@ -0,0 +1,176 @@
+"""
+Automation Worker
+Proceso persistente del pool: ejecuta run.py sucesivos sin reiniciar el intérprete
+
+Se lanza como script (no como parte del paquete modules) y solo usa la
+biblioteca estándar (más automation_launcher, su vecino). Protocolo, una línea
+JSON por mensaje:
+    stdin  <- {"job": id, "run_file": ..., "argv": [...], "cwd": ..., "stdin": texto, "env": {...}}
+    stdout -> {"event": "ready", "pid": ...}
+              {"job": id, "event": "stdout" | "stderr", "data": texto}
+              {"job": id, "event": "exit", "code": n, "rss_mb": x}
+"""
+
+import io
+import os
+import sys
+import json
+import runpy
+import traceback
+
+# Módulos precargados: los run.py de ejemplo los importan en cada ejecución
+import csv
+import datetime
+import pathlib
+import pkgutil  # runpy.run_path lo importa en su primera llamada
+import shutil
+import zipfile
+
+from automation_launcher import SCRIPT_HELPERS_DIR, enable_stack_dump, tie_to_parent
+
+
+class JobStream:
+    """Reemplazo de sys.stdout/sys.stderr que reenvía la salida de un trabajo"""
+
+    def __init__(self, channel, job_id, event):
+        self.channel = channel
+        self.job_id = job_id
+        self.event = event
+        self.buffer = []
+        self.encoding = "utf-8"
+        self.errors = "replace"
+
+    def write(self, text):
+        self.buffer.append(text)
+        if "\n" in text:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if not self.buffer:
+            return
+        data = "".join(self.buffer)
+        self.buffer.clear()
+        send(self.channel, {"job": self.job_id, "event": self.event, "data": data})
+
+    def isatty(self):
+        return False
+
+    def writable(self):
+        return True
+
+    def fileno(self):
+        raise OSError("JobStream no tiene descriptor de archivo")
+
+
+def send(channel, message):
+    """Escribe un mensaje del protocolo"""
+    channel.write(json.dumps(message) + "\n")
+    channel.flush()
+
+
+def current_rss_mb():
+    """Memoria residente actual del worker en MB"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        try:
+            import resource
+            # ru_maxrss es el pico (KB en Linux); sirve como cota superior
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        except ImportError:
+            return 0.0
+
+
+def run_job(channel, request):
+    """
+    Ejecuta un run.py con semántica __main__ y retorna su código de salida
+
+    Args:
+        channel: Canal del protocolo
+        request: Petición recibida por stdin
+    """
+    job_id = request["job"]
+    run_file = request["run_file"]
+
+    saved_argv = sys.argv
+    saved_path = list(sys.path)
+    saved_cwd = os.getcwd()
+    saved_modules = set(sys.modules)
+    saved_streams = sys.stdin, sys.stdout, sys.stderr
+    saved_environ = dict(os.environ)
+
+    stdout = JobStream(channel, job_id, "stdout")
+    stderr = JobStream(channel, job_id, "stderr")
+    sys.stdin, sys.stdout, sys.stderr = io.StringIO(request.get("stdin", "")), stdout, stderr
+
+    code = 0
+    try:
+        # Antes que nada, la carpeta del trabajo: run.py abre rutas relativas a ella
+        os.chdir(request["cwd"])
+        # La salida del propio trabajo ya se envía por líneas; env alcanza a los procesos que lance
+        os.environ.update(request.get("env") or {})
+        sys.argv = [run_file] + list(request["argv"])
+        sys.path[0] = os.path.dirname(os.path.abspath(run_file))
+        sys.path.append(SCRIPT_HELPERS_DIR)
+        runpy.run_path(run_file, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        stdout.flush()
+        stderr.flush()
+        sys.stdin, sys.stdout, sys.stderr = saved_streams
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_environ)
+
+        # Olvidar los módulos que importó el trabajo para no arrastrar estado
+        for name in set(sys.modules) - saved_modules:
+            del sys.modules[name]
+
+    return code
+
+
+def main():
+    # El canal del protocolo es una copia del stdout original; lo que se
+    # escriba directamente al descriptor 1 acaba en stderr y no lo corrompe
+    channel = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)
+
+    requests = sys.stdin
+
+    # El volcado va al descriptor 2, que el pool reenvía al trabajo en curso
+    enable_stack_dump()
+    # El worker no sobrevive a la aplicación aunque esta termine de golpe
+    tie_to_parent(os.getppid())
+
+    send(channel, {"event": "ready", "pid": os.getpid()})
+
+    for line in requests:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        code = run_job(channel, request)
+        send(channel, {
+            "job": request["job"],
+            "event": "exit",
+            "code": code,
+            "rss_mb": round(current_rss_mb(), 1)
+        })
+
+
+if __name__ == "__main__":
+    main()
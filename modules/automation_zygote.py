@@ -0,0 +1,221 @@
+"""
+Automation Zygote
+Fork-server para Linux: un proceso con los módulos ya importados que hace fork() por trabajo
+
+Se lanza como script y solo usa la biblioteca estándar, de modo que el
+benchmark y el ejecutor Qt (automation_forkserver.py) comparten el protocolo.
+El canal de control es un socketpair AF_UNIX/SOCK_SEQPACKET (un paquete por mensaje):
+    petición  -> JSON {"job", "run_file", "argv", "cwd", "limits"} + 2 descriptores (stdout, stderr)
+                 y opcionalmente un tercero, el stdin del trabajo
+    respuesta <- {"event": "started", "job", "pid"} | {"event": "exit", "job", "code"}
+"""
+
+import os
+import sys
+import json
+import runpy
+import select
+import signal
+import socket
+import subprocess
+import traceback
+
+# Módulos precargados: quedan compartidos (copy-on-write) por todos los hijos
+import csv
+import datetime
+import pathlib
+import pkgutil  # runpy.run_path lo importa en su primera llamada
+import shutil
+import zipfile
+
+ZYGOTE_SCRIPT = os.path.abspath(__file__)
+MAX_MESSAGE = 65536
+
+
+def is_supported() -> bool:
+    """Indica si la plataforma permite fork y paso de descriptores por socket"""
+    return hasattr(os, "fork") and hasattr(socket, "send_fds") and hasattr(socket, "AF_UNIX")
+
+
+def spawn_zygote(preload=None):
+    """
+    Arranca el proceso zygote
+
+    Args:
+        preload: Módulos adicionales a importar antes de aceptar trabajos
+
+    Returns:
+        Tupla (proceso Popen, socket de control del lado cliente)
+    """
+    parent_sock, child_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    args = [sys.executable, ZYGOTE_SCRIPT, str(child_sock.fileno())]
+    if preload:
+        args.append(",".join(preload))
+
+    process = subprocess.Popen(args, pass_fds=[child_sock.fileno()], close_fds=True)
+    child_sock.close()
+    return process, parent_sock
+
+
+def request_fork(sock, job_id, run_file, argv, cwd, stdout_fd, stderr_fd, limits=None, stack_dump=False,
+                 stdin_fd=None, env=None):
+    """
+    Pide al zygote que lance un trabajo
+
+    Los descriptores se duplican en el zygote al enviarse, así que el
+    llamador debe cerrar sus copias de escritura después. Los límites
+    (automation_launcher.LIMIT_KEYS) se aplican en el hijo tras el fork y,
+    con stack_dump, el hijo vuelca su pila al recibir STACK_DUMP_SIGNAL.
+    Sin stdin_fd, el hijo lee de /dev/null. env son variables de entorno extra.
+    """
+    request = {
+        "job": job_id, "run_file": run_file, "argv": list(argv), "cwd": cwd,
+        "limits": limits or {}, "stack_dump": stack_dump, "env": env or {}
+    }
+    fds = [stdout_fd, stderr_fd] + ([stdin_fd] if stdin_fd is not None else [])
+    socket.send_fds(sock, [json.dumps(request).encode("utf-8")], fds)
+
+
+def read_message(sock):
+    """Lee un mensaje del zygote; None si el zygote cerró el canal"""
+    data = sock.recv(MAX_MESSAGE)
+    if not data:
+        return None
+    return json.loads(data)
+
+
+def run_child(request, stdout_fd, stderr_fd, stdin_fd, zygote_pid):
+    """Cuerpo del proceso hijo tras el fork; nunca retorna"""
+    code = 1
+    try:
+        # Grupo de procesos propio para poder señalizar al trabajo completo
+        os.setsid()
+
+        # Muere con el zygote, que a su vez muere con la aplicación
+        from automation_launcher import SCRIPT_HELPERS_DIR, tie_to_parent
+        tie_to_parent(zygote_pid)
+
+        os.dup2(stdout_fd, 1)
+        os.dup2(stderr_fd, 2)
+        if stdin_fd is None:
+            stdin_fd = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(stdin_fd, 0)
+        for fd in (stdout_fd, stderr_fd, stdin_fd):
+            if fd > 2:
+                os.close(fd)
+        sys.stdin = open(0, "r", encoding="utf-8", closefd=False)
+
+        # El intérprete ya arrancó: PYTHONUNBUFFERED solo llega a los procesos que lance el script
+        os.environ.update(request.get("env") or {})
+        if os.environ.get("PYTHONUNBUFFERED"):
+            # Los flujos ya existen (los heredó del zygote): se vuelcan en cada línea
+            sys.stdout.reconfigure(line_buffering=True)
+            sys.stderr.reconfigure(line_buffering=True)
+
+        if request.get("limits"):
+            from automation_launcher import apply_limits
+            apply_limits(request["limits"])
+        if request.get("stack_dump"):
+            from automation_launcher import enable_stack_dump
+            enable_stack_dump()
+
+        run_file = request["run_file"]
+        os.chdir(request["cwd"])
+        sys.argv = [run_file] + list(request["argv"])
+        sys.path[0] = os.path.dirname(os.path.abspath(run_file))
+        sys.path.append(SCRIPT_HELPERS_DIR)
+
+        code = 0
+        runpy.run_path(run_file, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def serve(control_fd, preload=None):
+    """Bucle principal del zygote"""
+    # Los hijos lo usan para aplicar sus límites y volcar su pila (el zygote corre como script)
+    import automation_launcher
+
+    # Si la aplicación muere sin cerrar el canal, el zygote (y con él sus hijos) también
+    automation_launcher.tie_to_parent(os.getppid())
+    zygote_pid = os.getpid()
+
+    for name in preload or []:
+        try:
+            __import__(name)
+        except ImportError as e:
+            print(f"⚠️  Zygote: no se pudo precargar {name}: {e}", file=sys.stderr)
+
+    sock = socket.socket(fileno=control_fd)
+
+    # SIGCHLD despierta al select a través del wakeup fd
+    wakeup_r, wakeup_w = os.pipe()
+    os.set_blocking(wakeup_w, False)
+    signal.set_wakeup_fd(wakeup_w)
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+
+    children = {}
+
+    while True:
+        try:
+            readable, _, _ = select.select([sock, wakeup_r], [], [])
+        except InterruptedError:
+            continue
+
+        if wakeup_r in readable:
+            os.read(wakeup_r, 4096)
+            while children:
+                try:
+                    pid, status = os.waitpid(-1, os.WNOHANG)
+                except ChildProcessError:
+                    break
+                if pid == 0:
+                    break
+                job_id = children.pop(pid, None)
+                if job_id is not None:
+                    code = os.waitstatus_to_exitcode(status)
+                    sock.send(json.dumps({"event": "exit", "job": job_id, "code": code}).encode("utf-8"))
+
+        if sock in readable:
+            data, fds, _, _ = socket.recv_fds(sock, MAX_MESSAGE, 3)
+            if not data:
+                # El cliente cerró el canal: la aplicación terminó
+                break
+
+            request = json.loads(data)
+            stdout_fd, stderr_fd = fds[:2]
+            stdin_fd = fds[2] if len(fds) > 2 else None
+
+            pid = os.fork()
+            if pid == 0:
+                signal.set_wakeup_fd(-1)
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                sock.close()
+                os.close(wakeup_r)
+                os.close(wakeup_w)
+                run_child(request, stdout_fd, stderr_fd, stdin_fd, zygote_pid)
+
+            for fd in fds:
+                os.close(fd)
+            children[pid] = request["job"]
+            sock.send(json.dumps({"event": "started", "job": request["job"], "pid": pid}).encode("utf-8"))
+
+
+if __name__ == "__main__":
+    preload = sys.argv[2].split(",") if len(sys.argv) > 2 and sys.argv[2] else []
+    serve(int(sys.argv[1]), preload)
@@ -0,0 +1,73 @@
+"""
+Automation Inputs
+Lectura desde run.py de los inputs con nombre que envía la aplicación
+
+Con "arguments": "json" en ui_config.json, run.py no recibe argumentos
+posicionales: la aplicación le pasa por stdin un documento JSON
+    {"automation": "<id>", "job": "<id>", "inputs": {"<input_id>": "<valor>", ...}}
+Los ejecutores ponen esta carpeta en sys.path, así que basta con:
+    from automation_inputs import read_inputs
+    inputs = read_inputs()
+
+Solo usa la biblioteca estándar. Fuera de la aplicación la carpeta no está en
+sys.path: para ejecutar el script a mano desde la raíz del proyecto,
+    PYTHONPATH=modules/script_helpers python Automatizaciones/<automatización>/run.py < inputs.json
+"""
+
+import sys
+import json
+from typing import Dict, Optional
+
+_document = None
+
+
+def read_document(stream=None) -> Dict:
+    """
+    Lee (una sola vez) el documento JSON que la aplicación envía al trabajo
+
+    Args:
+        stream: Origen del documento (por defecto, sys.stdin)
+
+    Returns:
+        Documento completo (automation, job, inputs)
+    """
+    global _document
+    if _document is not None and stream is None:
+        return _document
+
+    stream = sys.stdin if stream is None else stream
+    if stream is None or (hasattr(stream, "isatty") and stream.isatty()):
+        raise SystemExit("Este script espera sus inputs en JSON por stdin: python run.py < inputs.json")
+
+    text = stream.read()
+    if not text.strip():
+        raise SystemExit("Este script espera sus inputs en JSON por stdin y no recibió nada: python run.py < inputs.json")
+    try:
+        document = json.loads(text)
+    except ValueError as e:
+        raise SystemExit(f"Inputs JSON no válidos: {e}")
+    if not isinstance(document, dict):
+        raise SystemExit("Inputs JSON no válidos: se esperaba un objeto")
+    # Un documento plano {"input_id": valor} también vale
+    if not isinstance(document.get("inputs"), dict):
+        document = {"inputs": document}
+
+    _document = document
+    return document
+
+
+def read_inputs(stream=None) -> Dict[str, str]:
+    """
+    Retorna los inputs del trabajo como {input_id: valor}
+
+    Los inputs opcionales que se dejaron vacíos no aparecen: usar inputs.get().
+
+    Args:
+        stream: Origen del documento (por defecto, sys.stdin)
+    """
+    return dict(read_document(stream)["inputs"])
+
+
+def job_id() -> Optional[str]:
+    """ID del trabajo en la aplicación (None si se ejecuta a mano)"""
+    return read_document().get("job")
@@ -0,0 +1,117 @@
+"""
+Fixtures comunes de las pruebas: aplicación Qt sin pantalla y un ejecutor falso
+que no lanza procesos, para probar el planificador de forma determinista
+"""
+
+import os
+import sys
+import time
+import uuid
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QCoreApplication, QObject, Signal  # noqa: E402
+
+
+class FakeExecutor(QObject):
+    """Ejecutor que solo anota lo que se le pide; la prueba decide cuándo termina cada trabajo"""
+
+    jobStarted = Signal(str)
+    stdoutReceived = Signal(str, str)
+    stderrReceived = Signal(str, str)
+    jobFinished = Signal(str, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.started = []
+        self.live = set()
+        self.suspended = set()
+        self.cancelled = []
+
+    def start(self, job):
+        self.started.append(job["id"])
+        self.live.add(job["id"])
+        self.jobStarted.emit(job["id"])
+
+    def finish(self, job_id, exit_code=0, output=""):
+        """Simula el final del proceso del trabajo"""
+        if output:
+            self.stdoutReceived.emit(job_id, output)
+        self.live.discard(job_id)
+        self.suspended.discard(job_id)
+        self.jobFinished.emit(job_id, exit_code)
+
+    def cancel(self, job_id, grace_ms):
+        self.cancelled.append(job_id)
+        self.live.discard(job_id)
+        return True
+
+    def suspend(self, job_id):
+        self.suspended.add(job_id)
+        return True
+
+    def resume(self, job_id):
+        self.suspended.discard(job_id)
+
+    def running_jobs(self):
+        return list(self.live)
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def process_events(qapp):
+    """Procesa eventos de Qt (temporizadores incluidos) hasta que se cumpla la condición"""
+    def run(condition=lambda: False, timeout=1.0):
+        deadline = time.monotonic() + timeout
+        while True:
+            qapp.processEvents()
+            if condition() or time.monotonic() >= deadline:
+                return condition()
+            time.sleep(0.005)
+    return run
+
+
+@pytest.fixture
+def executor():
+    return FakeExecutor()
+
+
+@pytest.fixture
+def scheduler(qapp, executor):
+    from modules.automation_scheduler import AutomationScheduler
+
+    scheduler = AutomationScheduler(max_workers=2, cancel_grace_ms=0, progress_interval_ms=10)
+    scheduler.add_executor("fake", executor)
+    yield scheduler
+    scheduler.admission_timer.stop()
+    for timer in list(scheduler.retry_timers.values()):
+        timer.stop()
+    scheduler.deleteLater()
+
+
+@pytest.fixture
+def make_job():
+    """Crea el diccionario mínimo de un trabajo para el ejecutor falso"""
+    def make(automation_id="auto", **fields):
+        job = {
+            "id": uuid.uuid4().hex[:12],
+            "automation_id": automation_id,
+            "executor": "fake",
+            "priority": "interactive",
+            "max_concurrency": None,
+            "timeout_seconds": None,
+            "retry": None,
+            "exit_code": None,
+            "started_at": None,
+            "finished_at": None,
+        }
+        job.update(fields)
+        return job
+    return make
@@ -0,0 +1,96 @@
+"""
+Pruebas del intérprete de secuencias ANSI de la consola
+"""
+
+from modules.automation_ansi import CARRIAGE_RETURN, DEFAULT_STYLE, PALETTE, AnsiParser, color_256
+
+RED = (PALETTE[1], None, False, False, False)
+
+
+def feed_all(parser, chunks):
+    segments = []
+    for chunk in chunks:
+        segments += parser.feed(chunk)
+    return segments + parser.flush()
+
+
+def plain(segments):
+    return "".join(text for text, _ in segments)
+
+
+def test_plain_text_is_a_single_segment():
+    assert AnsiParser().feed("hola\n") == [("hola\n", DEFAULT_STYLE)]
+    assert AnsiParser().feed("") == []
+
+
+def test_sgr_colors_and_reset():
+    segments = AnsiParser().feed("a\x1b[31mb\x1b[0mc")
+    assert segments == [("a", DEFAULT_STYLE), ("b", RED), ("c", DEFAULT_STYLE)]
+
+
+def test_style_attributes_accumulate_and_clear():
+    parser = AnsiParser()
+    parser.feed("\x1b[1;3;4;44m")
+    assert parser.style == (None, PALETTE[4], True, True, True)
+    parser.feed("\x1b[22;23;24;49m")
+    assert parser.style == DEFAULT_STYLE
+    parser.feed("\x1b[92;103m")
+    assert parser.style == (PALETTE[10], PALETTE[11], False, False, False)
+    parser.feed("\x1b[m")
+    assert parser.style == DEFAULT_STYLE
+
+
+def test_extended_colors():
+    parser = AnsiParser()
+    parser.feed("\x1b[38;5;196;48;2;10;20;300m")
+    assert parser.style[:2] == (color_256(196), (10, 20, 255))
+    assert color_256(3) == PALETTE[3]
+    assert color_256(16) == (0, 0, 0)
+    assert color_256(231) == (255, 255, 255)
+    assert color_256(232) == (8, 8, 8)
+    assert color_256(256) is None
+
+
+def test_style_persists_across_chunks():
+    parser = AnsiParser()
+    parser.feed("\x1b[31m")
+    assert parser.feed("rojo") == [("rojo", RED)]
+
+
+def test_escape_split_across_chunks():
+    parser = AnsiParser()
+    assert parser.feed("a\x1b[3") == [("a", DEFAULT_STYLE)]
+    assert parser.feed("1mb") == [("b", RED)]
+
+
+def test_non_sgr_sequences_are_dropped():
+    text = "a\x1b[2Kb\x1b]0;título\x07c\x1b]8;;http://x\x1b\\d\x1b7e\x1b(Bf"
+    assert plain(AnsiParser().feed(text)) == "abcdef"
+
+
+def test_osc_split_across_chunks():
+    assert plain(feed_all(AnsiParser(), ["x\x1b]0;tí", "tulo\x07y"])) == "xy"
+
+
+def test_invalid_escape_does_not_swallow_text():
+    parser = AnsiParser()
+    assert plain(parser.feed("a\x1b\x1b[31mb")) == "ab"
+    assert plain(feed_all(AnsiParser(), ["a\x1b", "\x01b"])) == "a\x01b"
+
+
+def test_flush_releases_an_incomplete_sequence_as_text():
+    parser = AnsiParser()
+    assert parser.feed("fin\x1b[3") == [("fin", DEFAULT_STYLE)]
+    assert plain(parser.flush()) == "[3"
+    assert parser.flush() == []
+
+
+def test_carriage_returns():
+    segments = feed_all(AnsiParser(), ["10%\r20%\r", "\n", "fin\r"])
+    assert [text for text, _ in segments] == ["10%", CARRIAGE_RETURN, "20%", "\n", "fin", CARRIAGE_RETURN]
+
+
+def test_crlf_is_a_normal_line_break():
+    parser = AnsiParser()
+    assert parser.feed("a\r") == [("a", DEFAULT_STYLE)]
+    assert parser.feed("\nb\r\n") == [("\nb\n", DEFAULT_STYLE)]
@@ -0,0 +1,200 @@
+"""
+Pruebas de las expresiones cron y del programador de ejecuciones recurrentes
+"""
+
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+from modules import automation_cron
+from modules.automation_cron import AutomationCronScheduler, CronExpression
+
+# Lunes
+START = datetime(2024, 1, 1, 10, 30, 15)
+
+
+def fires(expression, moment=START, count=3):
+    cron = CronExpression(expression)
+    result = []
+    for _ in range(count):
+        moment = cron.next_after(moment)
+        result.append(moment)
+    return result
+
+
+def test_next_after_is_strictly_later():
+    assert fires("*/15 * * * *") == [
+        datetime(2024, 1, 1, 10, 45), datetime(2024, 1, 1, 11, 0), datetime(2024, 1, 1, 11, 15)
+    ]
+    assert CronExpression("30 10 * * *").next_after(datetime(2024, 1, 1, 10, 30)) == datetime(2024, 1, 2, 10, 30)
+
+
+def test_ranges_lists_and_steps():
+    assert fires("0 9-17/4 * * *") == [
+        datetime(2024, 1, 1, 13, 0), datetime(2024, 1, 1, 17, 0), datetime(2024, 1, 2, 9, 0)
+    ]
+    assert fires("5,10 0 * * *", count=2) == [datetime(2024, 1, 2, 0, 5), datetime(2024, 1, 2, 0, 10)]
+    # a/paso sin rango llega hasta el máximo del campo
+    assert fires("50/5 10 * * *", count=2) == [datetime(2024, 1, 1, 10, 50), datetime(2024, 1, 1, 10, 55)]
+
+
+def test_names_and_macros():
+    assert fires("0 0 1 feb *", count=1) == [datetime(2024, 2, 1)]
+    assert fires("0 8 * * SAT,sun", count=2) == [datetime(2024, 1, 6, 8), datetime(2024, 1, 7, 8)]
+    assert fires("@daily", count=1) == [datetime(2024, 1, 2)]
+    assert fires("@weekly", count=1) == [datetime(2024, 1, 7)]
+    assert fires("@yearly", count=1) == [datetime(2025, 1, 1)]
+
+
+def test_sunday_is_zero_and_seven():
+    assert fires("0 0 * * 7", count=1) == fires("0 0 * * 0", count=1) == [datetime(2024, 1, 7)]
+
+
+def test_day_of_month_or_day_of_week():
+    # Restringidos los dos, basta con que coincida uno: el día 15 o cualquier viernes
+    assert fires("0 0 15 * fri", count=3) == [datetime(2024, 1, 5), datetime(2024, 1, 12), datetime(2024, 1, 15)]
+    # Con uno de los dos en *, manda el otro
+    assert fires("0 0 15 * *", count=1) == [datetime(2024, 1, 15)]
+
+
+def test_leap_day_and_month_ends():
+    assert fires("0 0 29 2 *", count=2) == [datetime(2024, 2, 29), datetime(2028, 2, 29)]
+    assert fires("0 0 31 * *", count=2) == [datetime(2024, 1, 31), datetime(2024, 3, 31)]
+
+
+@pytest.mark.parametrize("expression", [
+    "* * * *", "* * * * * *", "60 * * * *", "* 24 * * *", "* * 0 * *", "* * * 13 *",
+    "*/0 * * * *", "5-1 * * * *", "* * * foo *", "0 0 30 2 *",
+])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronExpression(expression)
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock(datetime(2024, 1, 1, 10, 30).timestamp())
+    monkeypatch.setattr(automation_cron.time, "time", clock)
+    return clock
+
+
+def make_scheduler(tmp_path, schedules=None, **options):
+    path = tmp_path / "schedules.json"
+    if schedules is not None:
+        path.write_text(json.dumps(schedules), encoding="utf-8")
+    scheduler = AutomationCronScheduler(str(path), **options)
+    scheduler.due = []
+    scheduler.scheduleDue.connect(lambda schedule_id, late: scheduler.due.append((schedule_id, late)))
+    return scheduler
+
+
+def stored(schedule_id, cron, last_fire, misfire=None):
+    return {"id": schedule_id, "automation_id": "backup", "cron": cron, "inputs": {},
+            "enabled": True, "misfire": misfire, "jitter_seconds": None, "last_fire": last_fire}
+
+
+def test_fires_on_time_and_plans_the_next_run(qapp, tmp_path, clock):
+    cron = make_scheduler(tmp_path)
+    schedule_id = cron.add_schedule("backup", "0 * * * *", {"origen": "/datos"})
+    assert cron.next_fire(schedule_id) == datetime(2024, 1, 1, 11, 0).timestamp()
+
+    clock.now = datetime(2024, 1, 1, 11, 0, 2).timestamp()
+    cron._on_timer()
+    assert cron.due == [(schedule_id, False)]
+    assert cron.get_schedule(schedule_id)["last_fire"] == datetime(2024, 1, 1, 11, 0).timestamp()
+    assert cron.next_fire(schedule_id) == datetime(2024, 1, 1, 12, 0).timestamp()
+    cron.timer.stop()
+
+
+def test_missed_runs_catch_up_once(qapp, tmp_path, clock):
+    last_fire = datetime(2023, 12, 29, 8, 0).timestamp()
+    cron = make_scheduler(tmp_path, [stored("s1", "0 * * * *", last_fire, "catch_up")])
+    cron._on_timer()
+
+    assert cron.due == [("s1", True)]
+    assert cron.get_schedule("s1")["last_fire"] == clock.now
+    assert cron.next_fire("s1") == datetime(2024, 1, 1, 11, 0).timestamp()
+    cron._on_timer()
+    assert cron.due == [("s1", True)]
+    cron.timer.stop()
+
+
+def test_missed_runs_are_skipped(qapp, tmp_path, clock):
+    last_fire = datetime(2023, 12, 29, 8, 0).timestamp()
+    cron = make_scheduler(tmp_path, [stored("s1", "0 * * * *", last_fire)], misfire="skip")
+    cron._on_timer()
+
+    assert cron.due == []
+    assert cron.next_fire("s1") == datetime(2024, 1, 1, 11, 0).timestamp()
+    with open(tmp_path / "schedules.json", encoding="utf-8") as f:
+        assert json.load(f)[0]["last_fire"] == clock.now
+    cron.timer.stop()
+
+
+def test_small_delays_are_not_misfires(qapp, tmp_path, clock):
+    last_fire = datetime(2024, 1, 1, 9, 28).timestamp()
+    cron = make_scheduler(tmp_path, [stored("s1", "28 * * * *", last_fire)], misfire="skip")
+    cron._on_timer()
+    # Las 10:28 fueron hace 2 minutos, dentro del margen
+    assert cron.due == [("s1", False)]
+    cron.timer.stop()
+
+
+def test_jitter_delays_within_bounds(qapp, tmp_path, clock):
+    cron = make_scheduler(tmp_path, jitter_seconds=30)
+    nominal = datetime(2024, 1, 1, 11, 0).timestamp()
+    for _ in range(20):
+        schedule_id = cron.add_schedule("backup", "0 * * * *")
+        assert nominal <= cron.next_fire(schedule_id) <= nominal + 30
+    cron.timer.stop()
+
+
+def test_disabled_schedules_do_not_fire(qapp, tmp_path, clock):
+    cron = make_scheduler(tmp_path)
+    schedule_id = cron.add_schedule("backup", "0 * * * *")
+    assert cron.set_enabled(schedule_id, False)
+    assert cron.next_fire(schedule_id) is None
+
+    clock.now = datetime(2024, 1, 1, 11, 0, 2).timestamp()
+    cron._on_timer()
+    assert cron.due == []
+
+    # Al reactivarla, lo que tocó mientras estaba pausada no se recupera
+    assert cron.set_enabled(schedule_id, True)
+    assert cron.next_fire(schedule_id) == datetime(2024, 1, 1, 12, 0).timestamp()
+    assert cron.remove_schedule(schedule_id)
+    assert not cron.remove_schedule(schedule_id)
+    cron.timer.stop()
+
+
+def test_schedules_persist_and_invalid_entries_are_kept(qapp, tmp_path, clock):
+    invalid = stored("roto", "99 * * * *", None)
+    cron = make_scheduler(tmp_path, [invalid])
+    assert cron.get_schedules() == []
+    schedule_id = cron.add_schedule("backup", "@hourly", {"origen": "/datos"})
+    cron.timer.stop()
+
+    reloaded = make_scheduler(tmp_path)
+    assert [schedule["id"] for schedule in reloaded.get_schedules("backup")] == [schedule_id]
+    assert reloaded.get_schedule(schedule_id)["inputs"] == {"origen": "/datos"}
+    assert reloaded.invalid == [invalid]
+    reloaded.timer.stop()
+
+
+def test_add_schedule_validates_its_arguments(qapp, tmp_path, clock):
+    cron = make_scheduler(tmp_path)
+    with pytest.raises(ValueError):
+        cron.add_schedule("backup", "no es cron")
+    with pytest.raises(ValueError):
+        cron.add_schedule("backup", "@daily", misfire="never")
+    assert cron.get_schedules() == []
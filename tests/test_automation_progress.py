@@ -0,0 +1,166 @@
+"""
+Pruebas del protocolo de progreso: separación de las líneas @@progress y
+cálculo de velocidad y tiempo restante
+"""
+
+import json
+
+import pytest
+
+from modules import automation_progress
+from modules.automation_progress import PROGRESS_PREFIX, ProgressParser, ProgressTracker, parse_progress
+
+
+def line(**fields):
+    return PROGRESS_PREFIX + json.dumps(fields) + "\n"
+
+
+def test_parse_progress_keeps_known_fields():
+    update = parse_progress(PROGRESS_PREFIX + '{"progress": 3, "total": 10.5, "stage": 1, "otro": "x"}')
+    assert update == {"progress": 3, "total": 10.5, "stage": "1"}
+
+
+@pytest.mark.parametrize("payload", ['no json', '[1, 2]', '{"progress": true}', '{}'])
+def test_parse_progress_rejects_invalid_lines(payload):
+    assert parse_progress(PROGRESS_PREFIX + payload) is None
+
+
+def test_progress_lines_are_removed_from_the_output():
+    parser = ProgressParser()
+    output, updates = parser.feed("hola\n" + line(progress=1, total=4) + "adiós\n")
+    assert output == "hola\nadiós\n"
+    assert updates == [{"progress": 1, "total": 4}]
+
+
+def test_progress_line_split_across_chunks():
+    parser = ProgressParser()
+    text = "antes\n" + line(progress=2, stage="Copiando") + "después\n"
+    output = ""
+    updates = []
+    for start in range(0, len(text), 3):
+        chunk_output, chunk_updates = parser.feed(text[start:start + 3])
+        output += chunk_output
+        updates += chunk_updates
+    assert output == "antes\ndespués\n"
+    assert updates == [{"progress": 2, "stage": "Copiando"}]
+
+
+def test_prefix_in_the_middle_of_a_line_is_output():
+    parser = ProgressParser()
+    output, updates = parser.feed("texto " + line(progress=1))
+    assert updates == []
+    assert output == "texto " + line(progress=1)
+
+
+def test_invalid_progress_line_is_kept_as_output():
+    parser = ProgressParser()
+    output, updates = parser.feed(PROGRESS_PREFIX + "roto\n")
+    assert output == PROGRESS_PREFIX + "roto\n"
+    assert updates == []
+
+
+def test_only_a_possible_prefix_is_held_back():
+    parser = ProgressParser()
+    assert parser.feed("línea\n@@pro") == ("línea\n", [])
+    assert parser.feed("blema\n") == ("@@problema\n", [])
+    assert parser.feed("sin salto") == ("sin salto", [])
+    # A mitad de línea una arroba no puede empezar una línea de progreso
+    assert parser.feed(" @") == (" @", [])
+
+
+def test_flush_returns_the_held_text():
+    parser = ProgressParser()
+    assert parser.feed("@@progress {\"progr") == ("", [])
+    assert parser.flush() == "@@progress {\"progr"
+    assert parser.flush() == ""
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(automation_progress.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def tracker(qapp):
+    tracker = ProgressTracker(interval_ms=60000)
+    tracker.emitted = []
+    tracker.jobProgress.connect(tracker.emitted.append)
+    yield tracker
+    tracker.timer.stop()
+
+
+def test_tracker_throttles_notifications(tracker, clock):
+    job = {"id": "a"}
+    assert tracker.feed(job, line(progress=1, total=10)) == ""
+    assert tracker.emitted == ["a"]
+    tracker.feed(job, line(progress=2) + line(progress=3))
+    # Dentro del intervalo solo se actualiza el trabajo
+    assert tracker.emitted == ["a"]
+    assert job["progress"]["progress"] == 3
+
+    tracker._flush()
+    assert tracker.emitted == ["a", "a"]
+    tracker._flush()
+    assert not tracker.timer.isActive()
+
+
+def test_tracker_computes_rate_and_eta(tracker, clock):
+    job = {"id": "a"}
+    tracker.feed(job, line(progress=0, total=100))
+    clock.now += 2
+    tracker.feed(job, line(progress=20))
+    tracker._flush()
+    assert job["progress"]["rate"] == pytest.approx(10.0)
+    assert job["progress"]["eta"] == pytest.approx(8.0)
+
+    clock.now += 1
+    tracker.feed(job, line(progress=40))
+    tracker._flush()
+    smoothed = automation_progress.RATE_SMOOTHING * 20 + (1 - automation_progress.RATE_SMOOTHING) * 10
+    assert job["progress"]["rate"] == pytest.approx(smoothed)
+    assert job["progress"]["eta"] == pytest.approx(60 / smoothed)
+
+
+def test_new_stage_resets_rate(tracker, clock):
+    job = {"id": "a"}
+    tracker.feed(job, line(progress=0, total=10, stage="Leyendo"))
+    clock.now += 1
+    tracker.feed(job, line(progress=5))
+    tracker._flush()
+    assert job["progress"]["rate"] is not None
+
+    tracker.feed(job, line(progress=0, total=3, stage="Escribiendo"))
+    assert job["progress"]["rate"] is None
+    assert job["progress"]["eta"] is None
+    assert job["progress"]["stage"] == "Escribiendo"
+
+
+def test_forget_notifies_pending_progress_and_returns_held_text(tracker, clock):
+    job = {"id": "a"}
+    tracker.feed(job, line(progress=1))
+    tracker.feed(job, line(progress=2) + "@@")
+    assert tracker.forget("a") == "@@"
+    assert tracker.emitted == ["a", "a"]
+    assert tracker.forget("a") == ""
+
+
+def test_scheduler_strips_progress_from_job_output(scheduler, executor, make_job):
+    job = make_job()
+    output = []
+    scheduler.stdoutReceived.connect(lambda job_id, text: output.append(text))
+    scheduler.submit(job)
+    executor.stdoutReceived.emit(job["id"], "hola\n" + line(progress=5, total=10) + "@@")
+    executor.finish(job["id"])
+
+    assert "".join(output) == "hola\n@@"
+    assert job["progress"]["progress"] == 5
@@ -0,0 +1,182 @@
+"""
+Pruebas del control de admisión: el planificador con un controlador falso y
+AutomationResourceMonitor con la memoria disponible simulada
+"""
+
+import json
+
+import pytest
+
+from modules import automation_resources
+from modules.automation_resources import PEAK_HISTORY, AutomationResourceMonitor
+
+MB = 1024 * 1024
+
+
+class Gate:
+    """Controlador de admisión que la prueba abre y cierra"""
+
+    def __init__(self):
+        self.open = True
+        self.reason = ""
+        self.started = []
+        self.finished = []
+
+    def can_start(self, job):
+        self.reason = "" if self.open else "cerrado"
+        return self.open
+
+    def job_started(self, job):
+        self.started.append(job["id"])
+
+    def job_finished(self, job):
+        self.finished.append(job["id"])
+
+
+class Scanner:
+    """Scanner que guarda el callback; la prueba entrega el resultado de /proc"""
+
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, function, args, callback):
+        self.calls.append(callback)
+
+    def deliver(self, groups):
+        self.calls.pop(0)(groups, None)
+
+
+def test_rejected_job_blocks_the_queue_until_admitted(scheduler, executor, make_job, process_events):
+    gate = Gate()
+    scheduler.set_admission_control(gate, retry_ms=10)
+    first = make_job()
+    scheduler.submit(first)
+    gate.open = False
+    second, third = make_job(), make_job()
+    scheduler.submit(second)
+    scheduler.submit(third)
+
+    assert executor.started == [first["id"]]
+    assert second["waiting_for"] == "cerrado"
+    assert scheduler.admission_timer.isActive()
+
+    gate.open = True
+    assert process_events(lambda: len(executor.started) == 2)
+    assert executor.started[-1] == second["id"]
+    assert "waiting_for" not in second
+    assert gate.started == [first["id"], second["id"]]
+
+    executor.finish(first["id"])
+    assert gate.finished == [first["id"]]
+    assert executor.started[-1] == third["id"]
+
+
+def test_held_jobs_are_not_sent_to_admission(scheduler, executor, make_job):
+    gate = Gate()
+    gate.open = False
+    scheduler.set_admission_control(gate)
+    held = make_job(held="caché")
+    scheduler.submit(held)
+    assert "waiting_for" not in held
+
+
+@pytest.fixture
+def monitor(qapp, tmp_path):
+    pids = {}
+    monitor = AutomationResourceMonitor(
+        str(tmp_path / "memory.json"), pids.get, Scanner(), headroom_mb=100, sample_ms=60000
+    )
+    monitor.pids = pids
+    yield monitor
+    monitor.timer.stop()
+
+
+def available(monkeypatch, megabytes):
+    monkeypatch.setattr(automation_resources, "read_available_memory", lambda: megabytes * MB)
+
+
+def test_monitor_always_admits_when_nothing_runs(monitor, monkeypatch):
+    available(monkeypatch, 10)
+    assert monitor.can_start({"id": "a", "automation_id": "enorme", "expected_memory_mb": 4000})
+    assert monitor.reason == ""
+
+
+def test_monitor_reserves_what_running_jobs_can_still_grow(monitor, monkeypatch):
+    available(monkeypatch, 1000)
+    monitor.job_started({"id": "a", "automation_id": "grande", "expected_memory_mb": 600})
+
+    assert monitor.can_start({"id": "b", "automation_id": "x", "expected_memory_mb": 250})
+    assert not monitor.can_start({"id": "c", "automation_id": "x", "expected_memory_mb": 350})
+    assert "memoria" in monitor.reason
+
+    # Con el trabajo en marcha ya en su pico, lo reservado baja
+    monitor.running["a"]["rss"] = 600 * MB
+    assert monitor.can_start({"id": "c", "automation_id": "x", "expected_memory_mb": 350})
+
+
+def test_monitor_admits_when_memory_is_unknown(monitor, monkeypatch):
+    monkeypatch.setattr(automation_resources, "read_available_memory", lambda: None)
+    monitor.job_started({"id": "a", "automation_id": "x"})
+    assert monitor.can_start({"id": "b", "automation_id": "x", "expected_memory_mb": 10 ** 6})
+
+
+def test_monitor_rejects_on_cpu_load(monitor, monkeypatch):
+    available(monkeypatch, 10 ** 6)
+    monkeypatch.setattr(automation_resources, "load_per_cpu", lambda: 3.0)
+    monitor.max_load_per_cpu = 2.0
+    monitor.job_started({"id": "a", "automation_id": "x"})
+    assert not monitor.can_start({"id": "b", "automation_id": "x"})
+    assert "carga" in monitor.reason
+
+
+def test_monitor_learns_the_measured_peak(monitor, tmp_path):
+    job = {"id": "a", "automation_id": "csv", "status": "finished"}
+    monitor.pids["a"] = 1234
+    monitor.job_started(job)
+    monitor.sample()
+    monitor.scanner.deliver({1234: {"rss": 80 * MB}})
+    monitor.sample()
+    monitor.scanner.deliver({1234: {"rss": 50 * MB}})
+    monitor.job_finished(job)
+
+    assert monitor.peaks == {"csv": [80 * MB]}
+    assert monitor.expected_memory({"automation_id": "csv"}) == 80 * MB
+    with open(tmp_path / "memory.json", encoding="utf-8") as f:
+        assert json.load(f) == {"csv": [80 * MB]}
+
+
+def test_monitor_learns_a_job_that_finished_during_a_scan(monitor):
+    job = {"id": "a", "automation_id": "csv", "status": "finished"}
+    monitor.pids["a"] = 1234
+    monitor.job_started(job)
+    monitor.sample()
+    monitor.job_finished(job)
+    assert monitor.peaks == {}
+
+    monitor.scanner.deliver({1234: {"rss": 30 * MB}})
+    assert monitor.peaks == {"csv": [30 * MB]}
+    assert monitor.finishing == {}
+
+
+def test_monitor_ignores_cancelled_jobs_and_keeps_few_peaks(monitor):
+    monitor.pids["a"] = 1
+    for peak in range(PEAK_HISTORY + 2):
+        job = {"id": "a", "automation_id": "csv", "status": "finished"}
+        monitor.job_started(job)
+        monitor.sample()
+        monitor.scanner.deliver({1: {"rss": (peak + 1) * MB}})
+        monitor.job_finished(job)
+    assert monitor.peaks["csv"] == [(peak + 1) * MB for peak in range(2, PEAK_HISTORY + 2)]
+
+    job = {"id": "a", "automation_id": "csv", "status": "cancelled"}
+    monitor.job_started(job)
+    monitor.sample()
+    monitor.scanner.deliver({1: {"rss": 999 * MB}})
+    monitor.job_finished(job)
+    assert 999 * MB not in monitor.peaks["csv"]
+
+
+def test_declared_memory_wins_over_history(monitor):
+    monitor.peaks = {"csv": [80 * MB]}
+    assert monitor.expected_memory({"automation_id": "csv", "expected_memory_mb": 10}) == 10 * MB
+    assert monitor.expected_memory({"automation_id": "nueva"}) == 0
@@ -0,0 +1,127 @@
+"""
+Pruebas de la predicción de duraciones y del orden "primero el más corto"
+"""
+
+import time
+
+import pytest
+
+from modules.automation_runtime import DECAY, RuntimePredictor, batch_input_sizes, input_size, path_size
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def predictor(tmp_path):
+    return RuntimePredictor(str(tmp_path / "runtime.json"))
+
+
+def test_unknown_automation_has_no_prediction(predictor):
+    assert not predictor.has_model("csv")
+    assert predictor.predict("csv", 0, 0) is None
+
+
+def test_few_runs_predict_the_decayed_mean(predictor):
+    predictor.observe("csv", 1 * MB, 1, 10.0)
+    assert predictor.has_model("csv")
+    assert predictor.predict("csv", 500 * MB, 1) == pytest.approx(10.0)
+
+    predictor.observe("csv", 1 * MB, 1, 20.0)
+    expected = (10.0 * DECAY + 20.0) / (DECAY + 1)
+    assert predictor.predict("csv", 1 * MB, 1) == pytest.approx(expected)
+
+
+def test_regression_follows_input_size(predictor):
+    # 2 s fijos + 1 s por MB
+    for megabytes in (1, 5, 10, 20, 40):
+        predictor.observe("csv", megabytes * MB, 1, 2.0 + megabytes)
+
+    assert predictor.predict("csv", 30 * MB, 1) == pytest.approx(32.0, rel=0.05)
+    assert predictor.predict("csv", 3 * MB, 1) == pytest.approx(5.0, rel=0.1)
+
+
+def test_prediction_is_clamped_to_the_observed_range(predictor):
+    for megabytes in (1, 2, 3, 4):
+        predictor.observe("csv", megabytes * MB, 1, float(megabytes))
+
+    assert predictor.predict("csv", 10000 * MB, 1) == pytest.approx(8.0)
+    assert predictor.predict("csv", 0, 1) >= 0.5
+
+
+def test_models_persist_between_instances(predictor, tmp_path):
+    predictor.observe("csv", MB, 1, 3.0)
+    reloaded = RuntimePredictor(str(tmp_path / "runtime.json"))
+    assert reloaded.predict("csv", MB, 1) == pytest.approx(3.0)
+
+
+def test_corrupt_history_starts_empty(tmp_path):
+    history = tmp_path / "runtime.json"
+    history.write_text("{no es json", encoding="utf-8")
+    assert RuntimePredictor(str(history)).models == {}
+
+
+def test_input_sizes_skip_outputs_and_walk_folders(tmp_path):
+    folder = tmp_path / "datos"
+    (folder / "sub").mkdir(parents=True)
+    (folder / "a.csv").write_bytes(b"x" * 100)
+    (folder / "sub" / "b.csv").write_bytes(b"x" * 50)
+    single = tmp_path / "c.csv"
+    single.write_bytes(b"x" * 10)
+    automation = {"inputs": [{"id": "carpeta"}, {"id": "archivo"}, {"id": "salida", "role": "output"}]}
+
+    assert path_size(str(folder)) == (150, 2)
+    assert path_size(str(tmp_path / "no existe")) == (0, 0)
+    inputs = {"carpeta": str(folder), "archivo": str(single), "salida": str(folder)}
+    assert input_size(automation, inputs) == (160, 3)
+
+    other = tmp_path / "d.csv"
+    other.write_bytes(b"x" * 20)
+    sizes = batch_input_sizes(automation, inputs, "archivo", [str(single), str(other)])
+    assert sizes == [(160, 3), (170, 3)]
+
+
+def test_shortest_job_first_orders_the_queue(scheduler, executor, make_job):
+    scheduler.shortest_job_first = True
+    scheduler.set_max_workers(1)
+    scheduler.submit(make_job())
+    slow = make_job(predicted_seconds=600)
+    unknown = make_job()
+    fast = make_job(predicted_seconds=5)
+    for job in (slow, unknown, fast):
+        scheduler.submit(job)
+
+    # Sin predicción cuenta como 0; dentro de una prioridad manda la duración prevista
+    assert scheduler.queue_position(unknown["id"]) == 0
+    assert scheduler.queue_position(slow["id"]) == 2
+    for job in (unknown, fast, slow):
+        executor.finish(executor.started[-1])
+        assert executor.started[-1] == job["id"]
+
+
+def test_waiting_time_ages_long_jobs_forward(scheduler, executor, make_job):
+    scheduler.shortest_job_first = True
+    scheduler.set_max_workers(1)
+    scheduler.submit(make_job())
+    slow = make_job(predicted_seconds=60)
+    fast = make_job(predicted_seconds=30)
+    scheduler.submit(slow)
+    scheduler.submit(fast)
+    # El trabajo largo lleva esperando más de lo que dura
+    slow["queued_at"] = time.time() - 120
+
+    executor.finish(executor.started[-1])
+    assert executor.started[-1] == slow["id"]
+
+
+def test_priority_still_wins_over_duration(scheduler, executor, make_job):
+    scheduler.shortest_job_first = True
+    scheduler.preemption = False
+    scheduler.set_max_workers(1)
+    scheduler.submit(make_job())
+    fast_batch = make_job(priority="batch", predicted_seconds=1)
+    slow_interactive = make_job(priority="interactive", predicted_seconds=600)
+    scheduler.submit(fast_batch)
+    scheduler.submit(slow_interactive)
+
+    executor.finish(executor.started[-1])
+    assert executor.started[-1] == slow_interactive["id"]
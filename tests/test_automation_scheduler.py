@@ -0,0 +1,413 @@
+"""
+Pruebas del planificador: límites de workers, cola, retenciones, cancelación,
+duplicados, prioridades y reintentos
+"""
+
+import pytest
+
+from modules import automation_scheduler
+from modules.automation_scheduler import CANCELLED_EXIT_CODE, priority_value, retry_delay
+
+
+def test_priority_value_accepts_names_and_integers():
+    assert priority_value("interactive") == 0
+    assert priority_value("BATCH") == 1
+    assert priority_value(5) == 5
+    assert priority_value("desconocida", default=2) == 2
+    assert priority_value(None) == 0
+
+
+def test_respects_the_global_worker_limit(scheduler, executor, make_job):
+    jobs = [make_job() for _ in range(3)]
+    for job in jobs:
+        scheduler.submit(job)
+
+    assert executor.started == [jobs[0]["id"], jobs[1]["id"]]
+    assert jobs[2]["status"] == "queued"
+
+    executor.finish(jobs[0]["id"])
+    assert jobs[0]["status"] == "finished"
+    assert executor.started[-1] == jobs[2]["id"]
+    assert jobs[2]["status"] == "running"
+
+
+def test_per_automation_cap_does_not_block_other_automations(scheduler, executor, make_job):
+    first = make_job("csv", max_concurrency=1)
+    second = make_job("csv", max_concurrency=1)
+    other = make_job("backup")
+    for job in (first, second, other):
+        scheduler.submit(job)
+
+    assert executor.started == [first["id"], other["id"]]
+    assert scheduler.running_count("csv") == 1
+
+    executor.finish(first["id"])
+    assert second["status"] == "running"
+
+
+def test_queue_is_fifo_within_a_priority(scheduler, executor, make_job):
+    scheduler.set_max_workers(1)
+    jobs = [make_job() for _ in range(3)]
+    for job in jobs:
+        scheduler.submit(job)
+
+    assert scheduler.queue_position(jobs[1]["id"]) == 0
+    assert scheduler.queue_position(jobs[2]["id"]) == 1
+    assert scheduler.queue_position(jobs[0]["id"]) == -1
+
+
+def test_set_max_workers_launches_what_fits(scheduler, executor, make_job):
+    scheduler.set_max_workers(1)
+    jobs = [make_job() for _ in range(3)]
+    for job in jobs:
+        scheduler.submit(job)
+    assert len(executor.started) == 1
+
+    scheduler.set_max_workers(3)
+    assert len(executor.started) == 3
+
+
+def test_held_job_waits_without_blocking_the_queue(scheduler, executor, make_job):
+    scheduler.set_max_workers(1)
+    held = make_job(held="caché")
+    free = make_job()
+    scheduler.submit(held)
+    scheduler.submit(free)
+
+    assert executor.started == [free["id"]]
+    assert held["status"] == "queued"
+
+    executor.finish(free["id"])
+    assert scheduler.release(held["id"])
+    assert executor.started[-1] == held["id"]
+    assert not scheduler.release(held["id"])
+
+
+def test_reject_fails_a_queued_job(scheduler, executor, make_job):
+    job = make_job(held="entorno virtual")
+    finished = []
+    messages = []
+    scheduler.jobFinished.connect(lambda job_id, code: finished.append((job_id, code)))
+    scheduler.stderrReceived.connect(lambda job_id, text: messages.append(text))
+    scheduler.submit(job)
+
+    assert scheduler.reject(job["id"], "sin entorno\n")
+    assert job["status"] == "failed"
+    assert finished == [(job["id"], -1)]
+    assert messages == ["sin entorno\n"]
+    assert job["id"] not in scheduler.queue
+
+
+def test_complete_settles_a_held_job_from_the_queue(scheduler, executor, make_job, process_events):
+    job = make_job(held="caché")
+    finished = []
+    output = []
+    scheduler.jobFinished.connect(lambda job_id, code: finished.append((job_id, code)))
+    scheduler.stdoutReceived.connect(lambda job_id, text: output.append(text))
+    scheduler.submit(job)
+
+    scheduler.complete(job, 0, "desde la caché\n")
+    assert job["id"] not in scheduler.queue
+    assert job["status"] == "finished"
+    assert "held" not in job
+    # Las señales llegan en la siguiente vuelta del bucle de eventos
+    assert finished == []
+    process_events(lambda: finished)
+    assert finished == [(job["id"], 0)]
+    assert output == ["desde la caché\n"]
+    assert executor.started == []
+
+
+def test_cancel_queued_and_running_jobs(scheduler, executor, make_job):
+    scheduler.set_max_workers(1)
+    running = make_job()
+    queued = make_job()
+    finished = []
+    scheduler.jobFinished.connect(lambda job_id, code: finished.append((job_id, code)))
+    scheduler.submit(running)
+    scheduler.submit(queued)
+
+    assert scheduler.cancel(queued["id"])
+    assert queued["status"] == "cancelled"
+    assert executor.started == [running["id"]]
+
+    assert scheduler.cancel(running["id"])
+    assert executor.cancelled == [running["id"]]
+    assert running["status"] == "cancelled"
+    assert finished == [(queued["id"], CANCELLED_EXIT_CODE), (running["id"], CANCELLED_EXIT_CODE)]
+    assert not scheduler.cancel(running["id"])
+
+    # El jobFinished tardío del proceso cancelado se ignora
+    executor.finish(running["id"], 0)
+    assert running["status"] == "cancelled"
+
+
+def test_history_is_bounded(qapp, executor, make_job):
+    from modules.automation_scheduler import AutomationScheduler
+
+    scheduler = AutomationScheduler(max_workers=1, history_size=2)
+    scheduler.add_executor("fake", executor)
+    jobs = [make_job() for _ in range(3)]
+    for job in jobs:
+        scheduler.submit(job)
+        executor.finish(job["id"])
+
+    assert scheduler.get_job(jobs[0]["id"]) is None
+    assert [job["id"] for job in scheduler.get_jobs()] == [jobs[1]["id"], jobs[2]["id"]]
+
+
+def test_duplicate_request_joins_the_queued_job(scheduler, executor, make_job):
+    scheduler.set_max_workers(1)
+    scheduler.submit(make_job("otra"))
+    first = make_job(dedup_key="csv:abc", priority="batch")
+    coalesced = []
+    scheduler.jobCoalesced.connect(coalesced.append)
+
+    assert scheduler.submit(first) == first["id"]
+    duplicate = make_job(dedup_key="csv:abc", priority="interactive")
+    assert scheduler.submit(duplicate) == first["id"]
+
+    assert coalesced == [first["id"]]
+    assert first["requests"] == 2
+    # La petición más urgente adelanta al trabajo compartido
+    assert first["priority"] == 0
+    assert scheduler.get_job(duplicate["id"]) is None
+    assert list(scheduler.queue) == [first["id"]]
+
+
+def test_duplicate_request_joins_the_running_job(scheduler, executor, make_job):
+    first = make_job(dedup_key="csv:abc")
+    scheduler.submit(first)
+    assert scheduler.submit(make_job(dedup_key="csv:abc")) == first["id"]
+    assert executor.started == [first["id"]]
+
+
+def test_finished_job_releases_its_dedup_key(scheduler, executor, make_job):
+    first = make_job(dedup_key="csv:abc")
+    scheduler.submit(first)
+    executor.finish(first["id"])
+
+    second = make_job(dedup_key="csv:abc")
+    assert scheduler.submit(second) == second["id"]
+    assert executor.started == [first["id"], second["id"]]
+
+
+def test_cancelled_job_releases_its_dedup_key(scheduler, executor, make_job):
+    first = make_job(dedup_key="csv:abc", held="caché")
+    scheduler.submit(first)
+    scheduler.cancel(first["id"])
+
+    second = make_job(dedup_key="csv:abc")
+    assert scheduler.submit(second) == second["id"]
+
+
+def test_jobs_without_dedup_key_never_coalesce(scheduler, executor, make_job):
+    first, second = make_job(), make_job()
+    assert scheduler.submit(first) != scheduler.submit(second)
+    assert first["requests"] == second["requests"] == 1
+
+
+def test_higher_priority_jobs_leave_the_queue_first(scheduler, executor, make_job):
+    scheduler.preemption = False
+    scheduler.set_max_workers(1)
+    scheduler.submit(make_job())
+    scheduled = make_job(priority="scheduled")
+    batch = make_job(priority="batch")
+    interactive = make_job(priority="interactive")
+    for job in (scheduled, batch, interactive):
+        scheduler.submit(job)
+
+    for job in (interactive, batch, scheduled):
+        executor.finish(executor.started[-1])
+        assert executor.started[-1] == job["id"]
+
+
+def test_urgent_job_suspends_a_lower_priority_one(scheduler, executor, make_job):
+    scheduler.set_max_workers(1)
+    batch = make_job(priority="batch")
+    urgent = make_job(priority="interactive")
+    suspended, resumed = [], []
+    scheduler.jobSuspended.connect(suspended.append)
+    scheduler.jobResumed.connect(resumed.append)
+
+    scheduler.submit(batch)
+    scheduler.submit(urgent)
+    assert suspended == [batch["id"]]
+    assert batch["status"] == "suspended"
+    assert urgent["status"] == "running"
+    assert executor.suspended == {batch["id"]}
+
+    executor.finish(urgent["id"])
+    assert resumed == [batch["id"]]
+    assert batch["status"] == "running"
+    assert batch["suspended_seconds"] >= 0
+    assert "suspended_at" not in batch
+    assert executor.suspended == set()
+
+
+def test_suspended_job_resumes_before_queued_jobs_of_its_priority(scheduler, executor, make_job):
+    scheduler.set_max_workers(1)
+    batch = make_job(priority="batch")
+    later = make_job(priority="batch")
+    urgent = make_job(priority="interactive")
+    scheduler.submit(batch)
+    scheduler.submit(later)
+    scheduler.submit(urgent)
+
+    executor.finish(urgent["id"])
+    assert batch["status"] == "running"
+    assert later["status"] == "queued"
+
+
+def test_same_priority_never_preempts(scheduler, executor, make_job):
+    scheduler.set_max_workers(1)
+    first = make_job(priority="batch")
+    second = make_job(priority="batch")
+    scheduler.submit(first)
+    scheduler.submit(second)
+    assert executor.suspended == set()
+    assert second["status"] == "queued"
+
+
+def test_preemption_can_be_disabled(scheduler, executor, make_job):
+    scheduler.preemption = False
+    scheduler.set_max_workers(1)
+    batch = make_job(priority="scheduled")
+    urgent = make_job(priority="interactive")
+    scheduler.submit(batch)
+    scheduler.submit(urgent)
+    assert batch["status"] == "running"
+    assert urgent["status"] == "queued"
+
+
+def test_executor_without_suspend_is_not_preempted(scheduler, make_job):
+    from PySide6.QtCore import QObject, Signal
+
+    class Runner(QObject):
+        """Ejecutor mínimo: sin suspend() no se puede pausar"""
+        jobStarted = Signal(str)
+        stdoutReceived = Signal(str, str)
+        stderrReceived = Signal(str, str)
+        jobFinished = Signal(str, int)
+
+        def start(self, job):
+            self.jobStarted.emit(job["id"])
+
+    runner = Runner()
+    scheduler.add_executor("minimal", runner)
+    scheduler.set_max_workers(1)
+    batch = make_job(priority="batch", executor="minimal")
+    urgent = make_job(priority="interactive")
+    scheduler.submit(batch)
+    scheduler.submit(urgent)
+    assert batch["status"] == "running"
+    assert urgent["status"] == "queued"
+
+
+def test_cancel_a_suspended_job(scheduler, executor, make_job):
+    scheduler.set_max_workers(1)
+    batch = make_job(priority="batch")
+    urgent = make_job(priority="interactive")
+    scheduler.submit(batch)
+    scheduler.submit(urgent)
+
+    assert scheduler.cancel(batch["id"])
+    assert batch["status"] == "cancelled"
+    assert batch["id"] not in scheduler.suspended
+    executor.finish(urgent["id"])
+    assert batch["status"] == "cancelled"
+
+
+def retry_policy(**fields):
+    policy = {"max_attempts": 3, "backoff_seconds": 0.01, "max_backoff_seconds": 0.05,
+              "jitter": 0.0, "exit_codes": []}
+    policy.update(fields)
+    return policy
+
+
+def test_retry_delay_grows_exponentially_up_to_the_cap():
+    policy = retry_policy(backoff_seconds=2, max_backoff_seconds=10)
+    assert [retry_delay(policy, attempt) for attempt in range(1, 6)] == [2, 4, 8, 10, 10]
+
+
+def test_retry_delay_jitter_only_shortens_the_wait(monkeypatch):
+    policy = retry_policy(backoff_seconds=8, max_backoff_seconds=60, jitter=0.25)
+    monkeypatch.setattr(automation_scheduler.random, "random", lambda: 0.0)
+    assert retry_delay(policy, 1) == 8
+    monkeypatch.setattr(automation_scheduler.random, "random", lambda: 0.999999)
+    assert retry_delay(policy, 1) == pytest.approx(6.0)
+    monkeypatch.undo()
+    assert all(6.0 <= retry_delay(policy, 1) <= 8.0 for _ in range(200))
+
+
+def test_failed_job_is_retried_until_it_succeeds(scheduler, executor, make_job, process_events):
+    job = make_job(retry=retry_policy())
+    retrying, finished = [], []
+    scheduler.jobRetrying.connect(lambda job_id, delay: retrying.append(delay))
+    scheduler.jobFinished.connect(lambda job_id, code: finished.append(code))
+    scheduler.submit(job)
+    queued_at = job["queued_at"]
+
+    executor.finish(job["id"], 1)
+    assert job["status"] == "queued"
+    assert "retry_at" in job
+    assert retrying == [pytest.approx(0.01)]
+    assert finished == []
+    # Esperando el reintento no ocupa worker
+    assert scheduler.running == set()
+
+    assert process_events(lambda: len(executor.started) == 2)
+    assert "retry_at" not in job
+    assert job["queued_at"] == queued_at
+    executor.finish(job["id"], 0)
+
+    assert job["status"] == "finished"
+    assert finished == [0]
+    assert [attempt["exit_code"] for attempt in job["attempts"]] == [1, 0]
+
+
+def test_retries_stop_after_max_attempts(scheduler, executor, make_job, process_events):
+    job = make_job(retry=retry_policy(max_attempts=2))
+    finished = []
+    scheduler.jobFinished.connect(lambda job_id, code: finished.append(code))
+    scheduler.submit(job)
+
+    executor.finish(job["id"], 1)
+    assert process_events(lambda: len(executor.started) == 2)
+    executor.finish(job["id"], 1)
+    assert job["status"] == "failed"
+    assert finished == [1]
+    assert len(job["attempts"]) == 2
+
+
+def test_only_listed_exit_codes_are_retried(scheduler, executor, make_job):
+    job = make_job(retry=retry_policy(exit_codes=[75]))
+    scheduler.submit(job)
+    executor.finish(job["id"], 1)
+    assert job["status"] == "failed"
+
+    job = make_job(retry=retry_policy(exit_codes=[75]))
+    scheduler.submit(job)
+    executor.finish(job["id"], 75)
+    assert job["status"] == "queued"
+
+
+def test_aborted_jobs_are_not_retried(scheduler, executor, make_job):
+    job = make_job(retry=retry_policy())
+    scheduler.submit(job)
+    assert scheduler.abort(job["id"], "timeout")
+    executor.finish(job["id"], -9)
+    assert job["status"] == "failed"
+    assert len(job["attempts"]) == 1
+
+
+def test_cancel_while_waiting_for_a_retry(scheduler, executor, make_job, process_events):
+    job = make_job(retry=retry_policy(backoff_seconds=0.02))
+    scheduler.submit(job)
+    executor.finish(job["id"], 1)
+
+    assert scheduler.cancel(job["id"])
+    assert job["status"] == "cancelled"
+    assert scheduler.retry_timers == {}
+    process_events(timeout=0.05)
+    assert executor.started == [job["id"]]